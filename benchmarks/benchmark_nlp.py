@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for NLPProcessor intent classification and entity extraction.
+
+Compares the single-pass matchers against the previous per-pattern
+re.search / re.findall loops over a corpus of typical utterances.
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Add src to path
+sys.path.insert(0, str(ROOT / "src"))
+
+from core.nlp_processor import NLPProcessor
+
+CORPUS = [
+    "hey assistant",
+    "hello how are you",
+    "what time is it",
+    "what's the date today",
+    "calculate 25 * 4",
+    "what is the square root of 144",
+    "what's 15 percent of 80",
+    "open the file report.txt in documents",
+    "create a new folder on the desktop",
+    "delete ~/downloads/old_notes.txt",
+    "show me cpu usage and memory status",
+    "how's the weather today",
+    "is it going to rain tomorrow",
+    "tell me a joke please",
+    "can you explain how black holes form",
+    "what can you do",
+    "open firefox",
+    "I really like this song, it is great",
+    "thanks, that was helpful",
+    "goodbye",
+    "see you later",
+    "could you please stop the music",
+    "remind me what we talked about yesterday",
+    "who wrote pride and prejudice",
+    "add 3.5 and two",
+    "open report2.txt in documents",
+]
+
+
+def legacy_classify(intent_patterns, text):
+    """The previous first-hit loop."""
+    text_lower = text.lower()
+    for intent, patterns in intent_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, text_lower):
+                return intent
+    return None
+
+
+def legacy_all_intents(intent_patterns, text):
+    """Per-pattern loop producing the same scores as the single-pass matcher."""
+    text_lower = text.lower()
+    scores = {}
+    for intent, patterns in intent_patterns.items():
+        hits = sum(1 for pattern in patterns if re.search(pattern, text_lower))
+        if hits:
+            scores[intent] = hits / len(patterns)
+    return scores
+
+
+def legacy_entities(entity_patterns, text):
+    """The previous per-pattern findall loop."""
+    entities = {}
+    for entity_type, patterns in entity_patterns.items():
+        entities[entity_type] = []
+        for pattern in patterns:
+            entities[entity_type].extend(re.findall(pattern, text, re.IGNORECASE))
+    return {entity_type: list(set(values)) for entity_type, values in entities.items()}
+
+
+def same_entities(left, right):
+    """Entity dicts are equal up to the order of each type's values."""
+    return ({k: sorted(v) for k, v in left.items()} ==
+            {k: sorted(v) for k, v in right.items()})
+
+
+def per_utterance_us(func, number):
+    seconds = timeit.timeit(lambda: [func(text) for text in CORPUS], number=number)
+    return seconds / number / len(CORPUS) * 1e6
+
+
+def main(number: int = 2000):
+    nlp = NLPProcessor(str(ROOT / "configs" / "config.json"))
+    intents = nlp.intent_patterns
+    entities = nlp.entity_patterns
+    
+    print(f"📊 {len(CORPUS)} utterances x {number} runs\n")
+    
+    # The single-pass matcher must agree with running every pattern
+    mismatches = [text for text in CORPUS
+                  if dict(nlp.classify_intents(text)) != legacy_all_intents(intents, text)]
+    print(f"✓ Scores identical to per-pattern search: {len(mismatches) == 0}")
+    for text in mismatches:
+        print(f"  ✗ {text}")
+    
+    changed = sum(1 for text in CORPUS if legacy_classify(intents, text) != nlp._classify_intent(text)
+                  and legacy_classify(intents, text) is not None)
+    print(f"  Top intent differs from first-hit order on {changed}/{len(CORPUS)} utterances")
+    
+    # Precompiled entity patterns must find exactly what re.findall did
+    mismatches = [text for text in CORPUS
+                  if not same_entities(nlp._extract_custom_entities(text), legacy_entities(entities, text))]
+    print(f"✓ Entities identical to per-pattern findall: {len(mismatches) == 0}\n")
+    for text in mismatches:
+        print(f"  ✗ {text}")
+    
+    rows = [
+        ("Intent: first-hit loop (old)", per_utterance_us(lambda t: legacy_classify(intents, t), number)),
+        ("Intent: all intents, per-pattern", per_utterance_us(lambda t: legacy_all_intents(intents, t), number)),
+        ("Intent: all intents, single pass", per_utterance_us(nlp.classify_intents, number)),
+        ("Entities: per-pattern findall (old)", per_utterance_us(lambda t: legacy_entities(entities, t), number)),
+        ("Entities: precompiled patterns", per_utterance_us(nlp._extract_custom_entities, number)),
+    ]
+    
+    for name, us in rows:
+        print(f"{name:<40} {us:8.2f} µs/utterance")
+    
+    print(f"\nIntent speedup (all intents):  {rows[1][1] / rows[2][1]:.1f}x")
+    print(f"Entity speedup:                {rows[3][1] / rows[4][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -10,18 +10,21 @@ import logging
 from typing import Tuple, List, Optional
 from datetime import datetime
 
-import pygame
 import numpy as np
 from collections import deque
 
 from utils.config_loader import ConfigLoader
+from utils.audio_utils import VoicedSyllableTracker
+from utils.lazy_import import lazy_import
+
+pygame = lazy_import("pygame")
 
 
 class AudioVisualizer:
     """Real-time audio visualization with transparent blob animation."""
     
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.viz_config = self.config.get("visualization", {})
         
         # Initialize logging
@@ -45,6 +48,10 @@ class AudioVisualizer:
         self.current_volume = 0.0
         self.peak_volume = 0.0
         
+        # Syllable pulses, only while voice activity is detected
+        self.syllable_tracker = VoicedSyllableTracker.from_config(self.config)
+        self.voice_active = False
+        
         # Blob animation
         self.blob_center = (self.window_size[0] // 2, self.window_size[1] // 2)
         self.base_radius = min(self.window_size) // 6
@@ -299,7 +306,7 @@ class AudioVisualizer:
         # Blit to main surface
         self.screen.blit(blob_surface, (0, 0))
     
-    def _add_glow_effect(self, surface: pygame.Surface, points: List[Tuple[float, float]]):
+    def _add_glow_effect(self, surface: "pygame.Surface", points: List[Tuple[float, float]]):
         """Add glow effect around the blob."""
         if not points:
             return
@@ -390,13 +397,11 @@ class AudioVisualizer:
                 # Add to history
                 self.volume_history.append(self.current_volume)
                 
-                # Detect syllables (simple peak detection)
-                if len(self.volume_history) >= 3:
-                    recent_volumes = list(self.volume_history)[-3:]
-                    if (recent_volumes[1] > recent_volumes[0] and 
-                        recent_volumes[1] > recent_volumes[2] and
-                        recent_volumes[1] > 0.3):
-                        self.add_syllable_pulse(recent_volumes[1])
+                # Detect syllables on the live stream, chunk by chunk
+                syllables = self.syllable_tracker.process(audio_data)
+                self.voice_active = self.syllable_tracker.voice_active
+                for _ in range(syllables):
+                    self.add_syllable_pulse(max(self.current_volume, 0.3))
         
         except Exception as e:
             self.logger.error(f"Audio data update error: {e}")
@@ -463,6 +468,7 @@ class AudioVisualizer:
             "peak_volume": self.peak_volume,
             "is_speaking": self.is_speaking,
             "is_listening": self.is_listening,
+            "voice_active": self.voice_active,
             "active_pulses": len(self.syllable_pulses),
             "animation_phase": self.animation_phase
         }
@@ -498,7 +504,7 @@ class AudioVisualizerManager:
     """Manager for multiple visualization modes."""
     
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.logger = logging.getLogger(__name__)
         
         # Import web visualizer
@@ -509,22 +515,31 @@ class AudioVisualizerManager:
             self.logger.warning(f"Web visualizer not available: {e}")
             web_viz_available = False
         
-        # Available visualizers
-        self.visualizers = {
-            "blob": AudioVisualizer(config_path),
+        # Available visualizers, constructed on first use so the blob
+        # visualizer only imports pygame and opens a window when selected
+        self._factories = {
+            "blob": lambda: AudioVisualizer(config_path),
         }
         
         # Add web visualizer if available
         if web_viz_available:
-            self.visualizers["web"] = WebAudioVisualizer(config_path)
+            self._factories["web"] = lambda: WebAudioVisualizer(config_path)
+        
+        self.visualizers = {}
         
         # Choose default visualizer (prefer web for better compatibility)
         self.current_visualizer = "web" if web_viz_available else "blob"
-        self.active_visualizer = self.visualizers[self.current_visualizer]
+        self.active_visualizer = self._get_visualizer(self.current_visualizer)
         
-        self.logger.info(f"Available visualizers: {list(self.visualizers.keys())}")
+        self.logger.info(f"Available visualizers: {list(self._factories.keys())}")
         self.logger.info(f"Active visualizer: {self.current_visualizer}")
     
+    def _get_visualizer(self, visualizer_type: str):
+        """Get a visualizer, constructing it the first time it is used."""
+        if visualizer_type not in self.visualizers:
+            self.visualizers[visualizer_type] = self._factories[visualizer_type]()
+        return self.visualizers[visualizer_type]
+    
     def start(self):
         """Start the active visualizer."""
         if self.active_visualizer:
@@ -537,7 +552,7 @@ class AudioVisualizerManager:
     
     def switch_visualizer(self, visualizer_type: str) -> bool:
         """Switch to a different visualizer type."""
-        if visualizer_type not in self.visualizers:
+        if visualizer_type not in self._factories:
             self.logger.error(f"Unknown visualizer type: {visualizer_type}")
             return False
         
@@ -547,7 +562,7 @@ class AudioVisualizerManager:
         
         # Switch to new visualizer
         self.current_visualizer = visualizer_type
-        self.active_visualizer = self.visualizers[visualizer_type]
+        self.active_visualizer = self._get_visualizer(visualizer_type)
         self.active_visualizer.start()
         
         self.logger.info(f"Switched to visualizer: {visualizer_type}")
@@ -572,6 +587,6 @@ class AudioVisualizerManager:
         """Get statistics for all visualizers."""
         return {
             "current_visualizer": self.current_visualizer,
-            "available_visualizers": list(self.visualizers.keys()),
+            "available_visualizers": list(self._factories.keys()),
             "active_stats": self.active_visualizer.get_stats() if self.active_visualizer else None
         }
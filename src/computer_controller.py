@@ -3,33 +3,43 @@ Computer Use Controller
 Handles safe computer automation with configurable safety levels.
 """
 
+import codecs
+import itertools
 import os
 import json
 import logging
+import mmap
+import signal
 import subprocess
 import threading
 import time
-import psutil
 import shutil
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
 
 from utils.config_loader import ConfigLoader
+from utils.file_listing import DirectoryLister
 from utils.safety_utils import SafetyValidator
+from utils.system_metrics import SystemMetricsSampler
 
 
 class ComputerController:
     """Safe computer automation with three-tier safety system."""
     
+    # How long, in total, output readers may keep draining after a command
+    # exits; background children of the shell can hold its pipes open
+    OUTPUT_GRACE_SECONDS = 0.2
+    
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.computer_config = self.config.get("computer_use", {})
         
         # Initialize logging
         self.logger = logging.getLogger(__name__)
         
-        # Thread safety
+        # Thread safety (guards shared state only, never a running command)
         self._lock = threading.RLock()
         
         # Safety configuration
@@ -55,79 +65,314 @@ class ComputerController:
             self.user_home / "Videos"
         ]
         
+        # Commands run on a bounded worker pool so a slow one never blocks other actions
+        self.command_timeout = self.computer_config.get("command_timeout", 30)
+        self.max_output_bytes = self.computer_config.get("max_output_bytes", 65536)
+        self._command_pool = ThreadPoolExecutor(
+            max_workers=self.computer_config.get("max_concurrent_commands", 4),
+            thread_name_prefix="command"
+        )
+        self._commands: Dict[str, Dict[str, Any]] = {}
+        self._command_ids = itertools.count(1)
+        
+        # File reads are bounded; files larger than the requested window (or
+        # than mmap_threshold) are memory-mapped rather than loaded
+        self.max_read_bytes = self.computer_config.get("max_read_bytes", 1024 * 1024)
+        self.mmap_threshold = self.computer_config.get("mmap_threshold", 4 * 1024 * 1024)
+        
+        # Directory listings, cached per directory until it changes
+        self.directory_lister = DirectoryLister.shared()
+        
+        # Background system metrics, so get_system_info doesn't block to measure CPU
+        self.metrics = SystemMetricsSampler.shared(
+            self.computer_config.get("metrics_interval", 2.0),
+            self.computer_config.get("metrics_top_processes", 10)
+        )
+        
         self.logger.info(f"Computer controller initialized with safety level: {self.safety_level}")
     
-    def execute_command(self, command: str, description: str = None) -> Dict[str, Any]:
-        """Execute a system command with safety checks."""
-        with self._lock:
-            try:
-                # Validate safety level
-                if self.safety_level == "off":
-                    return {
-                        "success": False,
-                        "error": "Computer use is disabled",
-                        "safety_level": self.safety_level
-                    }
-                
-                # Validate command safety
-                if not self.safety_validator.is_command_safe(command, self.safety_level):
-                    return {
-                        "success": False,
-                        "error": f"Command blocked by safety rules: {command}",
-                        "safety_level": self.safety_level
-                    }
-                
-                # Request confirmation if required
-                if self.require_confirmation:
-                    if not self._request_confirmation(command, description):
-                        return {
-                            "success": False,
-                            "error": "User denied permission",
-                            "command": command
-                        }
-                
-                # Log the action
-                self._log_action("command", command, description)
-                
-                # Execute command
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                response = {
-                    "success": result.returncode == 0,
-                    "command": command,
-                    "returncode": result.returncode,
-                    "stdout": result.stdout,
-                    "stderr": result.stderr,
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                if not response["success"]:
-                    self.logger.warning(f"Command failed: {command} - {result.stderr}")
-                
-                return response
-                
-            except subprocess.TimeoutExpired:
+    def execute_command(self, command: str, description: str = None, timeout: Optional[float] = None,
+                        on_output: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Execute a system command with safety checks and wait for it to finish."""
+        submitted = self.submit_command(command, description, timeout, on_output)
+        if not submitted["success"]:
+            return submitted
+        
+        return self.get_command_result(submitted["action_id"])
+    
+    def submit_command(self, command: str, description: str = None, timeout: Optional[float] = None,
+                       on_output: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Start a system command on the worker pool after safety checks.
+        
+        Returns at once with an action_id for get_command_result() and
+        cancel_command(). Output is passed to on_output(stream, text) as it
+        arrives; at most max_output_bytes of each stream is kept.
+        """
+        try:
+            # Validate safety level
+            if self.safety_level == "off":
                 return {
                     "success": False,
-                    "error": "Command timed out",
-                    "command": command
+                    "error": "Computer use is disabled",
+                    "safety_level": self.safety_level
                 }
-            except Exception as e:
-                self.logger.error(f"Failed to execute command: {e}")
+            
+            # Validate command safety
+            if not self.safety_validator.is_command_safe(command, self.safety_level):
                 return {
                     "success": False,
-                    "error": str(e),
-                    "command": command
+                    "error": f"Command blocked by safety rules: {command}",
+                    "safety_level": self.safety_level
                 }
+            
+            # Request confirmation if required
+            if self.require_confirmation:
+                if not self._request_confirmation(command, description):
+                    return {
+                        "success": False,
+                        "error": "User denied permission",
+                        "command": command
+                    }
+            
+            # Log the action
+            self._log_action("command", command, description)
+            
+            action_id = f"cmd-{next(self._command_ids)}"
+            run = {
+                "command": command,
+                "process": None,
+                "cancelled": False,
+                "future": None
+            }
+            
+            with self._lock:
+                self._prune_commands()
+                self._commands[action_id] = run
+                run["future"] = self._command_pool.submit(
+                    self._run_command, action_id, run, timeout or self.command_timeout, on_output
+                )
+            
+            return {
+                "success": True,
+                "action_id": action_id,
+                "command": command,
+                "status": "queued"
+            }
+        
+        except Exception as e:
+            self.logger.error(f"Failed to execute command: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "command": command
+            }
+    
+    def get_command_result(self, action_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a submitted command and collect its result."""
+        with self._lock:
+            run = self._commands.get(action_id)
+        
+        if run is None:
+            return {
+                "success": False,
+                "error": f"Unknown command: {action_id}",
+                "action_id": action_id
+            }
+        
+        try:
+            result = run["future"].result(timeout)
+        except FutureTimeoutError:
+            return {
+                "success": False,
+                "error": "Command still running",
+                "action_id": action_id,
+                "command": run["command"],
+                "status": "running"
+            }
+        except CancelledError:
+            result = self._cancelled_result(action_id, run["command"])
+        
+        with self._lock:
+            self._commands.pop(action_id, None)
+        
+        return result
+    
+    def cancel_command(self, action_id: str) -> bool:
+        """Cancel a queued or running command."""
+        with self._lock:
+            run = self._commands.get(action_id)
+            if run is None:
+                return False
+            run["cancelled"] = True
+            process = run["process"]
+        
+        if run["future"].cancel():
+            return True
+        
+        if process and process.poll() is None:
+            self._kill_process(process)
+        
+        self._log_action("command_cancel", run["command"])
+        return True
+    
+    def _run_command(self, action_id: str, run: Dict[str, Any], timeout: float,
+                     on_output: Optional[Callable[[str, str], None]]) -> Dict[str, Any]:
+        """Run one command on a pool worker, streaming its output."""
+        command = run["command"]
+        started = time.time()
+        
+        try:
+            process = subprocess.Popen(
+                command,
+                shell=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                # Own process group, so a timeout or cancel also stops the shell's children
+                start_new_session=(os.name == "posix")
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to execute command: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "command": command,
+                "action_id": action_id
+            }
+        
+        with self._lock:
+            run["process"] = process
+            cancelled = run["cancelled"]
+        if cancelled:
+            self._kill_process(process)
+        
+        captures = {}
+        capture_lock = threading.Lock()
+        readers = []
+        for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr)):
+            captures[name] = {"data": bytearray(), "bytes": 0, "detached": False}
+            reader = threading.Thread(
+                target=self._stream_output, args=(pipe, name, captures[name], capture_lock, on_output),
+                name=f"{action_id}-{name}", daemon=True
+            )
+            reader.start()
+            readers.append(reader)
+        
+        timed_out = False
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            self._kill_process(process)
+            process.wait()
+        
+        # Background children of the shell may hold the pipes open, so the
+        # readers share one short deadline and are then detached from the result
+        deadline = time.time() + self.OUTPUT_GRACE_SECONDS
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.time()))
+        
+        with capture_lock:
+            for capture in captures.values():
+                capture["detached"] = True
+            stdout, stderr = (captures[name]["data"].decode("utf-8", errors="replace")
+                              for name in ("stdout", "stderr"))
+            output_bytes = {name: capture["bytes"] for name, capture in captures.items()}
+        
+        response = {
+            "success": process.returncode == 0 and not timed_out and not run["cancelled"],
+            "command": command,
+            "action_id": action_id,
+            "returncode": process.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "output_bytes": output_bytes,
+            "truncated": any(count > self.max_output_bytes for count in output_bytes.values()),
+            "duration": time.time() - started,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        if run["cancelled"]:
+            response["error"] = "Command cancelled"
+        elif timed_out:
+            response["error"] = "Command timed out"
+        elif not response["success"]:
+            self.logger.warning(f"Command failed: {command} - {stderr}")
+        
+        return response
+    
+    def _stream_output(self, pipe, name: str, capture: Dict[str, Any], lock: threading.Lock,
+                       on_output: Optional[Callable[[str, str], None]]):
+        """Read a pipe until EOF, keeping at most max_output_bytes of it.
+        
+        Once the capture is detached the pipe is still drained, so a
+        background writer never blocks, but nothing more is recorded.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        
+        try:
+            while True:
+                chunk = pipe.read1(4096)
+                if not chunk:
+                    break
+                
+                with lock:
+                    if capture["detached"]:
+                        continue
+                    room = self.max_output_bytes - capture["bytes"]
+                    if room > 0:
+                        capture["data"] += chunk[:room]
+                    capture["bytes"] += len(chunk)
+                
+                if on_output:
+                    text = decoder.decode(chunk)
+                    if text:
+                        try:
+                            on_output(name, text)
+                        except Exception as e:
+                            self.logger.error(f"Command output callback failed: {e}")
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+    
+    def _kill_process(self, process: subprocess.Popen):
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+    
+    def _cancelled_result(self, action_id: str, command: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": "Command cancelled",
+            "command": command,
+            "action_id": action_id
+        }
     
-    def read_file(self, file_path: str) -> Dict[str, Any]:
-        """Read a file with safety checks."""
+    def _prune_commands(self, keep: int = 100):
+        """Forget finished commands whose results were never collected."""
+        if len(self._commands) < keep:
+            return
+        
+        for action_id, run in list(self._commands.items()):
+            if run["future"] and run["future"].done():
+                del self._commands[action_id]
+    
+    def read_file(self, file_path: str, offset: int = 0, length: Optional[int] = None,
+                  head_lines: Optional[int] = None, tail_lines: Optional[int] = None,
+                  max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Read part of a file with safety checks.
+        
+        Reads length bytes from offset (the rest of the file by default), or
+        the first head_lines / last tail_lines lines. At most max_bytes
+        (max_read_bytes by default) are returned, with truncated set if the
+        requested range was cut short. Binary files are reported without
+        content.
+        """
         try:
             path = Path(file_path).resolve()
             
@@ -165,15 +410,51 @@ class ComputerController:
             # Log the action
             self._log_action("file_read", str(path))
             
-            # Read file
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            max_bytes = min(max_bytes or self.max_read_bytes, self.max_read_bytes)
+            file_size = path.stat().st_size
+            
+            # Most bytes a request can return; a file that fits is simply read whole
+            window = max_bytes
+            if length is not None and not (head_lines or tail_lines):
+                window = min(max(0, length), max_bytes)
+            
+            with open(path, 'rb') as f:
+                # Otherwise it's mapped, so only the pages actually touched are read
+                if file_size > window or file_size >= self.mmap_threshold:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = f.read()
+                
+                try:
+                    if self._is_binary(data):
+                        return {
+                            "success": True,
+                            "binary": True,
+                            "content": None,
+                            "path": str(path),
+                            "size": 0,
+                            "file_size": file_size,
+                            "timestamp": datetime.now().isoformat()
+                        }
+                    
+                    start, end, truncated = self._read_range(
+                        data, len(data), offset, length, head_lines, tail_lines, max_bytes
+                    )
+                    content = data[start:end].decode('utf-8', errors='ignore')
+                finally:
+                    if isinstance(data, mmap.mmap):
+                        data.close()
             
             return {
                 "success": True,
+                "binary": False,
                 "content": content,
                 "path": str(path),
                 "size": len(content),
+                "file_size": file_size,
+                "offset": start,
+                "bytes_read": end - start,
+                "truncated": truncated,
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -185,6 +466,48 @@ class ComputerController:
                 "path": file_path
             }
     
+    @staticmethod
+    def _is_binary(data) -> bool:
+        """A NUL byte near the start marks a binary file (the same check git uses)."""
+        return b"\0" in data[:8000]
+    
+    @staticmethod
+    def _read_range(data, size: int, offset: int, length: Optional[int],
+                    head_lines: Optional[int], tail_lines: Optional[int],
+                    max_bytes: int) -> Tuple[int, int, bool]:
+        """Byte range (start, end, truncated) to return from a file's data."""
+        offset = min(max(0, offset), size)
+        
+        if head_lines:
+            limit = min(size, offset + max_bytes)
+            end = offset
+            for _ in range(head_lines):
+                newline = data.find(b"\n", end, limit)
+                if newline < 0:
+                    end = limit
+                    break
+                end = newline + 1
+            truncated = end == limit < size and data[end - 1:end] != b"\n"
+            return offset, end, truncated
+        
+        if tail_lines:
+            lower = max(0, size - max_bytes)
+            start = size
+            # A trailing newline ends the last line rather than starting an empty one
+            search_end = size - 1 if data[size - 1:size] == b"\n" else size
+            for _ in range(tail_lines):
+                newline = data.rfind(b"\n", lower, search_end)
+                if newline < 0:
+                    start = lower
+                    break
+                start, search_end = newline + 1, newline
+            truncated = start == lower > 0 and data[lower - 1:lower] != b"\n"
+            return start, size, truncated
+        
+        requested_end = size if length is None else min(size, offset + max(0, length))
+        end = min(requested_end, offset + max_bytes)
+        return offset, end, end < requested_end
+    
     def write_file(self, file_path: str, content: str, append: bool = False) -> Dict[str, Any]:
         """Write to a file with safety checks."""
         try:
@@ -235,8 +558,13 @@ class ComputerController:
                 "path": file_path
             }
     
-    def list_directory(self, directory_path: str) -> Dict[str, Any]:
-        """List directory contents with safety checks."""
+    def list_directory(self, directory_path: str, pattern: Optional[str] = None, sort: str = "name",
+                       reverse: bool = False, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """List directory contents with safety checks.
+        
+        pattern is a glob on entry names; sort is name, size, modified or
+        type. offset and limit select one page of the sorted listing.
+        """
         try:
             path = Path(directory_path).resolve()
             
@@ -266,27 +594,18 @@ class ComputerController:
             self._log_action("directory_list", str(path))
             
             # List contents
-            items = []
-            for item in path.iterdir():
-                try:
-                    stat = item.stat()
-                    items.append({
-                        "name": item.name,
-                        "path": str(item),
-                        "type": "directory" if item.is_dir() else "file",
-                        "size": stat.st_size if item.is_file() else None,
-                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "permissions": oct(stat.st_mode)[-3:]
-                    })
-                except (OSError, PermissionError):
-                    # Skip items we can't access
-                    continue
+            listing = self.directory_lister.list_entries(
+                str(path), pattern=pattern, sort=sort, reverse=reverse, offset=offset, limit=limit
+            )
             
             return {
                 "success": True,
                 "path": str(path),
-                "items": items,
-                "count": len(items),
+                "items": listing["items"],
+                "count": len(listing["items"]),
+                "total": listing["total"],
+                "offset": listing["offset"],
+                "limit": listing["limit"],
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -304,14 +623,16 @@ class ComputerController:
             # Log the action
             self._log_action("system_info", "get_system_info")
             
-            # Get system information
+            # Get system information from the latest background sample
+            metrics = self.metrics.get_snapshot()
+            
             cpu_info = {
-                "count": psutil.cpu_count(),
-                "usage": psutil.cpu_percent(interval=1),
-                "frequency": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
+                "count": metrics["cpu_count"],
+                "usage": metrics["cpu_percent"],
+                "frequency": metrics["cpu_freq"]._asdict() if metrics["cpu_freq"] else None
             }
             
-            memory = psutil.virtual_memory()
+            memory = metrics["memory"]
             memory_info = {
                 "total": memory.total,
                 "available": memory.available,
@@ -319,32 +640,17 @@ class ComputerController:
                 "percentage": memory.percent
             }
             
-            disk_info = []
-            for partition in psutil.disk_partitions():
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    disk_info.append({
-                        "device": partition.device,
-                        "mountpoint": partition.mountpoint,
-                        "fstype": partition.fstype,
-                        "total": usage.total,
-                        "used": usage.used,
-                        "free": usage.free,
-                        "percentage": (usage.used / usage.total) * 100
-                    })
-                except PermissionError:
-                    continue
-            
             return {
                 "success": True,
                 "system": {
                     "platform": os.name,
                     "cpu": cpu_info,
                     "memory": memory_info,
-                    "disk": disk_info,
-                    "uptime": time.time() - psutil.boot_time()
+                    "disk": metrics["partitions"],
+                    "uptime": time.time() - metrics["boot_time"]
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now().isoformat(),
+                "sampled_at": datetime.fromtimestamp(metrics["timestamp"]).isoformat()
             }
             
         except Exception as e:
@@ -367,20 +673,14 @@ class ComputerController:
             # Log the action
             self._log_action("process_list", "get_running_processes")
             
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    processes.append(proc.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
+            # The background sampler keeps the process tracker fresh
+            self.metrics.get_snapshot()
+            processes = self.metrics.processes
             
             return {
                 "success": True,
-                "processes": processes[:50],  # Top 50 processes
-                "total_count": len(processes),
+                "processes": processes.top(50),  # Top 50 processes
+                "total_count": processes.count(),
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -576,17 +876,19 @@ class ComputerController:
             "safety_level": self.safety_level
         }
         
-        self.action_log.append(log_entry)
-        
-        # Keep log size manageable
-        if len(self.action_log) > self.max_log_entries:
-            self.action_log = self.action_log[-self.max_log_entries:]
+        with self._lock:
+            self.action_log.append(log_entry)
+            
+            # Keep log size manageable
+            if len(self.action_log) > self.max_log_entries:
+                self.action_log = self.action_log[-self.max_log_entries:]
         
         self.logger.info(f"ACTION: {action_type} - {details}")
     
     def get_action_log(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent action log entries."""
-        return self.action_log[-limit:] if self.action_log else []
+        with self._lock:
+            return self.action_log[-limit:] if self.action_log else []
     
     def set_safety_level(self, level: str) -> bool:
         """Change the safety level."""
@@ -604,13 +906,28 @@ class ComputerController:
         
         return True
     
+    def close(self):
+        """Cancel outstanding commands and stop the worker pool."""
+        with self._lock:
+            action_ids = list(self._commands)
+        
+        for action_id in action_ids:
+            self.cancel_command(action_id)
+        
+        self._command_pool.shutdown(wait=False)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current controller status."""
+        with self._lock:
+            running_commands = sum(1 for run in self._commands.values()
+                                   if run["future"] and not run["future"].done())
+        
         return {
             "safety_level": self.safety_level,
             "require_confirmation": self.require_confirmation,
             "log_actions": self.log_actions,
             "action_log_entries": len(self.action_log),
+            "running_commands": running_commands,
             "safe_directories": [str(d) for d in self.safe_directories],
             "user_home": str(self.user_home)
         }
@@ -11,7 +11,7 @@ import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Optional, List
 
 from   utils.config_loader import ConfigLoader
 
@@ -19,13 +19,31 @@ from   utils.config_loader import ConfigLoader
 class CommandHandler:
     """Handle various user commands and generate appropriate responses."""
     
+    DEFAULT_GREETINGS = [
+        "Hello! How can I help you today?",
+        "Hi there! What can I do for you?",
+        "Good day! I'm ready to assist you."
+    ]
+    
+    TIME_GREETINGS = ["Good morning!", "Good afternoon!", "Good evening!", "Good night!"]
+    
+    GOODBYES = [
+        "Goodbye! Have a great day!",
+        "See you later! Take care!",
+        "Farewell! It was nice talking with you.",
+        "Bye! Feel free to ask me anything anytime."
+    ]
+    
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.logger = logging.getLogger(__name__)
         
         # Load knowledge base
         self.knowledge_base = self._load_knowledge_base()
         
+        # Completes fast-path NLP results that skipped the spaCy parse
+        self.parse_callback = None
+        
         # Command statistics
         self.command_stats = {
             "total_commands": 0,
@@ -101,24 +119,30 @@ class CommandHandler:
                 "error": str(e)
             }
     
+    def set_parse_callback(self, callback: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """Set callback that fills in the full parse of a fast-path NLP result."""
+        self.parse_callback = callback
+    
+    def _parsed(self, nlp_result: Dict[str, Any]) -> Dict[str, Any]:
+        """The NLP result with keywords and sentiment, parsing it now if it was deferred."""
+        if nlp_result.get("parsed", True) or not self.parse_callback:
+            return nlp_result
+        return self.parse_callback(nlp_result)
+    
     def _handle_greeting(self, text: str) -> Dict[str, Any]:
         """Handle greeting commands."""
-        greetings = self.knowledge_base.get("general_knowledge", {}).get("greetings", [
-            "Hello! How can I help you today?",
-            "Hi there! What can I do for you?",
-            "Good day! I'm ready to assist you."
-        ])
+        greetings = self._greetings()
         
         # Time-based greetings
         current_hour = datetime.now().hour
         if 5 <= current_hour < 12:
-            time_greeting = "Good morning!"
+            time_greeting = self.TIME_GREETINGS[0]
         elif 12 <= current_hour < 17:
-            time_greeting = "Good afternoon!"
+            time_greeting = self.TIME_GREETINGS[1]
         elif 17 <= current_hour < 21:
-            time_greeting = "Good evening!"
+            time_greeting = self.TIME_GREETINGS[2]
         else:
-            time_greeting = "Good night!"
+            time_greeting = self.TIME_GREETINGS[3]
         
         import random
         response = f"{time_greeting} {random.choice(greetings)}"
@@ -129,18 +153,22 @@ class CommandHandler:
             "action": "greeting"
         }
     
+    def _greetings(self) -> List[str]:
+        """Greetings from the knowledge base, or the built-in defaults."""
+        return self.knowledge_base.get("general_knowledge", {}).get("greetings", self.DEFAULT_GREETINGS)
+    
+    def get_fixed_phrases(self) -> List[str]:
+        """Every fixed response text, for pre-synthesizing speech."""
+        phrases = [f"{time_greeting} {greeting}"
+                   for time_greeting in self.TIME_GREETINGS
+                   for greeting in self._greetings()]
+        return phrases + list(self.GOODBYES)
+    
     def _handle_goodbye(self, text: str) -> Dict[str, Any]:
         """Handle goodbye commands."""
-        goodbyes = [
-            "Goodbye! Have a great day!",
-            "See you later! Take care!",
-            "Farewell! It was nice talking with you.",
-            "Bye! Feel free to ask me anything anytime."
-        ]
-        
         import random
         return {
-            "response": random.choice(goodbyes),
+            "response": random.choice(self.GOODBYES),
             "success": True,
             "action": "goodbye"
         }
@@ -205,23 +233,30 @@ class CommandHandler:
     def _handle_system_info(self, text: str) -> Dict[str, Any]:
         """Handle system information queries."""
         try:
-            import psutil
+            from utils.system_metrics import SystemMetricsSampler
+            
+            # Sampled in the background, so this doesn't block to measure CPU
+            computer_config = self.config.get("computer_use", {})
+            metrics = SystemMetricsSampler.shared(
+                computer_config.get("metrics_interval"),
+                computer_config.get("metrics_top_processes")
+            ).get_snapshot()
             
             if "memory" in text.lower() or "ram" in text.lower():
-                memory = psutil.virtual_memory()
+                memory = metrics["memory"]
                 response = f"Memory usage: {memory.percent}% ({memory.used // (1024**3)} GB used of {memory.total // (1024**3)} GB total)"
             elif "cpu" in text.lower() or "processor" in text.lower():
-                cpu_percent = psutil.cpu_percent(interval=1)
-                cpu_count = psutil.cpu_count()
+                cpu_percent = metrics["cpu_percent"]
+                cpu_count = metrics["cpu_count"]
                 response = f"CPU usage: {cpu_percent}% ({cpu_count} cores)"
             elif "disk" in text.lower() or "storage" in text.lower():
-                disk = psutil.disk_usage('/')
+                disk = metrics["disk"]
                 response = f"Disk usage: {disk.percent}% ({disk.used // (1024**3)} GB used of {disk.total // (1024**3)} GB total)"
             else:
                 # General system info
-                memory = psutil.virtual_memory()
-                cpu_percent = psutil.cpu_percent(interval=1)
-                disk = psutil.disk_usage('/')
+                memory = metrics["memory"]
+                cpu_percent = metrics["cpu_percent"]
+                disk = metrics["disk"]
                 
                 response = (f"System Status:\n"
                            f"CPU: {cpu_percent}%\n"
@@ -253,20 +288,22 @@ class CommandHandler:
         
         if "list" in text.lower() or "show" in text.lower():
             try:
+                from utils.file_listing import DirectoryLister
+                
                 current_dir = os.getcwd()
-                files = os.listdir(current_dir)
-                file_list = "\n".join(files[:10])  # Show first 10 files
+                listing = DirectoryLister.shared().list_entries(current_dir, limit=10)  # Show first 10 files
+                file_list = "\n".join(item["name"] for item in listing["items"])
                 
                 response = f"Files in current directory ({current_dir}):\n{file_list}"
-                if len(files) > 10:
-                    response += f"\n... and {len(files) - 10} more files"
+                if listing["total"] > 10:
+                    response += f"\n... and {listing['total'] - 10} more files"
                 
                 return {
                     "response": response,
                     "success": True,
                     "action": "file_list",
                     "directory": current_dir,
-                    "file_count": len(files)
+                    "file_count": listing["total"]
                 }
             except Exception as e:
                 return {
@@ -316,7 +353,7 @@ class CommandHandler:
     
     def _handle_question(self, text: str, nlp_result: Dict[str, Any]) -> Dict[str, Any]:
         """Handle general questions."""
-        keywords = nlp_result.get("keywords", [])
+        keywords = self._parsed(nlp_result).get("keywords", [])
         
         # Try to find relevant information in knowledge base
         response = self._search_knowledge_base(keywords)
@@ -338,7 +375,7 @@ class CommandHandler:
     
     def _handle_general(self, text: str, nlp_result: Dict[str, Any]) -> Dict[str, Any]:
         """Handle general statements and conversation."""
-        sentiment = nlp_result.get("sentiment", {})
+        sentiment = self._parsed(nlp_result).get("sentiment", {})
         polarity = sentiment.get("polarity", 0)
         
         # Respond based on sentiment
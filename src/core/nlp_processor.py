@@ -3,23 +3,228 @@
 Natural Language Processing module using spaCy.
 """
 
+import copy
 import logging
 import re
-from typing import Dict, Any, List, Tuple, Optional
-
-import spacy
-from spacy.matcher import Matcher
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Tuple, Optional
 
 from   utils.config_loader import ConfigLoader
+from   utils.lazy_import import lazy_import
+from   utils.metrics import LatencyHistogram
+
+spacy = lazy_import("spacy")
+spacy_matcher = lazy_import("spacy.matcher")
+
+# "(a|b|c)" or "^(a|b|c)" where every alternative is a plain literal
+_LITERAL_ALTERNATION = re.compile(r"^(\^?)\(([^()]*)\)$")
+_REGEX_METACHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+# spaCy components left out of each pipeline profile. process_text only
+# reads tokens, lemmas, POS tags and entities, so the dependency parser
+# is never needed; "minimal" also drops NER.
+PIPELINE_PROFILES = {
+    "full": [],
+    "fast": ["parser"],
+    "minimal": ["parser", "ner"]
+}
+
+
+class IntentMatcher:
+    """Single-pass matcher that scores every intent in a pattern table.
+    
+    Literal keyword patterns are merged into one alternation and scanned
+    once with a lookahead, so overlapping keywords are all seen; patterns
+    anchored with ^ are checked with one match at the start of the text.
+    Anything that is not a plain literal alternation is compiled and
+    searched on its own. An intent scores the fraction of its patterns
+    that matched.
+    """
+    
+    def __init__(self, intent_patterns: Dict[str, List[str]]):
+        self._order = {intent: i for i, intent in enumerate(intent_patterns)}
+        self._pattern_counts = {intent: len(patterns) for intent, patterns in intent_patterns.items()}
+        self._complex = []
+        
+        keywords: Dict[str, set] = {}
+        anchored: Dict[str, set] = {}
+        
+        for intent, patterns in intent_patterns.items():
+            for index, pattern in enumerate(patterns):
+                parsed = self._literal_alternatives(pattern)
+                if parsed is None:
+                    self._complex.append((intent, index, re.compile(pattern)))
+                    continue
+                
+                is_anchored, words = parsed
+                table = anchored if is_anchored else keywords
+                for word in words:
+                    table.setdefault(word, set()).add((intent, index))
+        
+        self._keyword_hits = self._close_over_prefixes(keywords)
+        self._anchored_hits = self._close_over_prefixes(anchored)
+        self._keyword_regex = self._compile(keywords, "(?=({}))")
+        self._anchored_regex = self._compile(anchored, "(?:{})")
+    
+    @staticmethod
+    def _literal_alternatives(pattern: str) -> Optional[Tuple[bool, List[str]]]:
+        match = _LITERAL_ALTERNATION.match(pattern)
+        if not match:
+            return None
+        
+        words = match.group(2).split("|")
+        if any(not word or _REGEX_METACHARACTERS.search(word) for word in words):
+            return None
+        
+        return bool(match.group(1)), words
+    
+    @staticmethod
+    def _close_over_prefixes(table: Dict[str, set]) -> Dict[str, frozenset]:
+        """The regex reports only the longest keyword at a position; every
+        shorter keyword that is its prefix matched there too."""
+        return {
+            word: frozenset().union(*(hits for other, hits in table.items() if word.startswith(other)))
+            for word in table
+        }
+    
+    @classmethod
+    def _compile(cls, table: Dict[str, set], template: str):
+        if not table:
+            return None
+        
+        trie = {}
+        for word in table:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = True
+        
+        return re.compile(template.format(cls._trie_pattern(trie)))
+    
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, Any]) -> str:
+        """Regex for a keyword trie; shared prefixes are tested once and the
+        greedy optional tails make the longest keyword win."""
+        branches = [re.escape(char) + cls._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        
+        if not branches:
+            return ""
+        
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+    
+    def match(self, text: str) -> List[Tuple[str, float]]:
+        """Score every matching intent for lower-cased text, best first."""
+        hits = set()
+        
+        if self._anchored_regex:
+            match = self._anchored_regex.match(text)
+            if match:
+                hits |= self._anchored_hits[match.group(0)]
+        
+        if self._keyword_regex:
+            for match in self._keyword_regex.finditer(text):
+                hits |= self._keyword_hits[match.group(1)]
+        
+        for intent, index, pattern in self._complex:
+            if pattern.search(text):
+                hits.add((intent, index))
+        
+        counts = {}
+        for intent, _ in hits:
+            counts[intent] = counts.get(intent, 0) + 1
+        
+        scores = [(intent, count / self._pattern_counts[intent]) for intent, count in counts.items()]
+        scores.sort(key=lambda item: (-item[1], self._order[item[0]]))
+        return scores
+
+
+class ResultCache:
+    """Thread-safe LRU cache of process_text results keyed by normalized text.
+    
+    Results are copied in and out so callers can't alter cached entries.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max(0, max_size)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(text: str) -> str:
+        """Case- and whitespace-insensitive key for a text."""
+        return " ".join(text.split()).casefold()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        return copy.deepcopy(result)
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        if self.max_size == 0:
+            return
+        
+        result = copy.deepcopy(result)
+        
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
 
 
 class NLPProcessor:
     """Natural language processing for intent recognition and entity extraction."""
     
+    # Intents CommandHandler answers from the text alone, without POS tags,
+    # keywords or sentiment
+    FAST_PATH_INTENTS = ["math", "time_date", "greeting", "goodbye"]
+    
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
+        self.nlp_config = self.config.get("nlp", {})
         self.logger = logging.getLogger(__name__)
         
+        # Pipeline profile and result memoization
+        self.model_name = self.nlp_config.get("model", "en_core_web_sm")
+        self.pipeline_profile = self.nlp_config.get("pipeline_profile", "fast")
+        self.batch_size = self.nlp_config.get("batch_size", 64)
+        self.result_cache = ResultCache(self.nlp_config.get("cache_size", 256))
+        
+        # Regex-only routing for high-confidence commands
+        self.fast_path_enabled = self.nlp_config.get("fast_path", True)
+        self.fast_path_intents = set(self.nlp_config.get("fast_path_intents", self.FAST_PATH_INTENTS))
+        self.fast_path_min_score = self.nlp_config.get("fast_path_min_score", 0.5)
+        self.latency = {path: LatencyHistogram() for path in ("fast", "cached", "full", "deferred")}
+        
         # Load spaCy model
         self.nlp = None
         self.matcher = None
@@ -27,19 +232,30 @@ class NLPProcessor:
         
         # Intent patterns
         self.intent_patterns = self._define_intent_patterns()
+        self.intent_matcher = IntentMatcher(self.intent_patterns)
         
-        # Entity patterns
+        # Entity patterns, compiled once
         self.entity_patterns = self._define_entity_patterns()
+        self._entity_regexes = self._compile_entity_patterns(self.entity_patterns)
+    
+    def _excluded_components(self) -> List[str]:
+        """Pipeline components to leave out for the configured profile."""
+        excluded = PIPELINE_PROFILES.get(self.pipeline_profile)
+        if excluded is None:
+            self.logger.warning(f"Unknown NLP pipeline profile '{self.pipeline_profile}', using 'fast'")
+            excluded = PIPELINE_PROFILES["fast"]
+        
+        return list(dict.fromkeys(excluded + self.nlp_config.get("disable", [])))
     
     def _load_spacy_model(self):
         """Load spaCy language model."""
         try:
-            self.nlp = spacy.load("en_core_web_sm")
-            self.matcher = Matcher(self.nlp.vocab)
+            self.nlp = spacy.load(self.model_name, exclude=self._excluded_components())
+            self.matcher = spacy_matcher.Matcher(self.nlp.vocab)
             self._setup_patterns()
-            self.logger.info("spaCy model loaded successfully")
+            self.logger.info(f"spaCy model loaded successfully (pipeline: {', '.join(self.nlp.pipe_names)})")
         except OSError:
-            self.logger.error("spaCy model 'en_core_web_sm' not found. Please install it.")
+            self.logger.error(f"spaCy model '{self.model_name}' not found. Please install it.")
         except Exception as e:
             self.logger.error(f"Failed to load spaCy model: {e}")
     
@@ -111,6 +327,19 @@ class NLPProcessor:
             ]
         }
     
+    @staticmethod
+    def _compile_entity_patterns(entity_patterns: Dict[str, List[str]]) -> Dict[str, List[re.Pattern]]:
+        """Compile each entity pattern case-insensitively.
+        
+        Patterns are kept separate rather than merged into one alternation,
+        so spans that match several entity types (a number inside a file
+        name, a location inside a path) are reported for each of them.
+        """
+        return {
+            entity_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for entity_type, patterns in entity_patterns.items()
+        }
+    
     def _setup_patterns(self):
         """Setup spaCy matcher patterns."""
         if not self.matcher:
@@ -147,34 +376,20 @@ class NLPProcessor:
             if not self.nlp:
                 return self._fallback_processing(text)
             
-            # Process with spaCy
-            doc = self.nlp(text)
-            
-            # Extract basic information
-            result = {
-                "original_text": text,
-                "processed_text": text.lower().strip(),
-                "tokens": [token.text for token in doc],
-                "lemmas": [token.lemma_ for token in doc],
-                "pos_tags": [(token.text, token.pos_) for token in doc],
-                "entities": [(ent.text, ent.label_) for ent in doc.ents],
-                "intent": self._classify_intent(text),
-                "confidence": 0.0,
-                "extracted_entities": {},
-                "sentiment": self._analyze_sentiment(doc),
-                "keywords": self._extract_keywords(doc)
-            }
-            
-            # Extract custom entities
-            result["extracted_entities"] = self._extract_custom_entities(text)
+            started = time.perf_counter()
             
-            # Use spaCy matcher
-            matches = self.matcher(doc)
-            result["matches"] = [(self.nlp.vocab.strings[match_id], start, end) 
-                               for match_id, start, end in matches]
+            # Repeated utterances (wake-word chatter, common commands) skip the parse
+            key = self.result_cache.make_key(text)
+            result = self.result_cache.get(key)
+            if result is not None:
+                result["original_text"] = text
+                self.latency["cached"].record(time.perf_counter() - started)
+                return result
             
-            # Calculate confidence based on pattern matches
-            result["confidence"] = self._calculate_confidence(result)
+            # Process with spaCy
+            result = self._build_result(text, self.nlp(text))
+            self.result_cache.put(key, result)
+            self.latency["full"].record(time.perf_counter() - started)
             
             return result
             
@@ -182,17 +397,119 @@ class NLPProcessor:
             self.logger.error(f"NLP processing failed: {e}")
             return self._fallback_processing(text)
     
+    def process_text_fast(self, text: str) -> Dict[str, Any]:
+        """Process text, skipping spaCy when a fast-path intent clearly wins.
+        
+        The lightweight result has "parsed": False and no POS tags, entities,
+        keywords or sentiment; ensure_parsed() fills them in if they turn out
+        to be needed. Everything else goes through process_text.
+        """
+        if self.fast_path_enabled:
+            started = time.perf_counter()
+            scores = self.classify_intents(text)
+            
+            if self._is_fast_path(scores):
+                result = self._fallback_processing(text, scores)
+                result["confidence"] = self._calculate_confidence(result)
+                result["parsed"] = False
+                self.latency["fast"].record(time.perf_counter() - started)
+                return result
+        
+        return self.process_text(text)
+    
+    def ensure_parsed(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete a fast-path result with the full spaCy parse, in place."""
+        if result.get("parsed", True):
+            return result
+        
+        started = time.perf_counter()
+        result.update(self.process_text(result["original_text"]))
+        result["parsed"] = True
+        self.latency["deferred"].record(time.perf_counter() - started)
+        
+        return result
+    
+    def _is_fast_path(self, scores: List[Tuple[str, float]]) -> bool:
+        """A fast-path intent that scores well and beats every other intent."""
+        if not scores:
+            return False
+        
+        intent, score = scores[0]
+        if intent not in self.fast_path_intents or score < self.fast_path_min_score:
+            return False
+        
+        return len(scores) == 1 or score > scores[1][1]
+    
+    def process_batch(self, texts: Iterable[str], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process many texts at once with nlp.pipe.
+        
+        Meant for offline corpora such as memory re-indexing or evaluation,
+        so results bypass the result cache.
+        """
+        texts = list(texts)
+        
+        try:
+            if not self.nlp:
+                return [self._fallback_processing(text) for text in texts]
+            
+            docs = self.nlp.pipe(texts, batch_size=batch_size or self.batch_size)
+            return [self._build_result(text, doc) for text, doc in zip(texts, docs)]
+        
+        except Exception as e:
+            self.logger.error(f"NLP batch processing failed: {e}")
+            return [self._fallback_processing(text) for text in texts]
+    
+    def _build_result(self, text: str, doc) -> Dict[str, Any]:
+        """Build the processing result for text from its spaCy doc."""
+        # Extract basic information
+        result = {
+            "original_text": text,
+            "processed_text": text.lower().strip(),
+            "tokens": [token.text for token in doc],
+            "lemmas": [token.lemma_ for token in doc],
+            "pos_tags": [(token.text, token.pos_) for token in doc],
+            "entities": [(ent.text, ent.label_) for ent in doc.ents],
+            "intent": None,
+            "intent_scores": {},
+            "confidence": 0.0,
+            "extracted_entities": {},
+            "sentiment": self._analyze_sentiment(doc),
+            "keywords": self._extract_keywords(doc)
+        }
+        
+        # Classify intent and extract custom entities
+        result["intent"], result["intent_scores"] = self._classify(text)
+        result["extracted_entities"] = self._extract_custom_entities(text)
+        
+        # Use spaCy matcher
+        matches = self.matcher(doc)
+        result["matches"] = [(self.nlp.vocab.strings[match_id], start, end) 
+                           for match_id, start, end in matches]
+        
+        # Calculate confidence based on pattern matches
+        result["confidence"] = self._calculate_confidence(result)
+        
+        return result
+    
+    def classify_intents(self, text: str) -> List[Tuple[str, float]]:
+        """Score every intent whose patterns match the text, best first."""
+        return self.intent_matcher.match(text.lower())
+    
+    def _classify(self, text: str) -> Tuple[str, Dict[str, float]]:
+        """Best intent plus the scores of all matching intents."""
+        scores = self.classify_intents(text)
+        if scores:
+            return scores[0][0], dict(scores)
+        return self._default_intent(text), {}
+    
     def _classify_intent(self, text: str) -> str:
         """Classify the intent of the text."""
+        return self._classify(text)[0]
+    
+    def _default_intent(self, text: str) -> str:
+        """Intent for text that matches no pattern."""
         text_lower = text.lower()
         
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    return intent
-        
-        # Default intent
         if "?" in text:
             return "question"
         elif any(word in text_lower for word in ["please", "can you", "could you"]):
@@ -204,12 +521,11 @@ class NLPProcessor:
         """Extract custom entities using regex patterns."""
         entities = {}
         
-        for entity_type, patterns in self.entity_patterns.items():
+        for entity_type, regexes in self._entity_regexes.items():
             entities[entity_type] = []
             
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                entities[entity_type].extend(matches)
+            for regex in regexes:
+                entities[entity_type].extend(regex.findall(text))
         
         # Remove duplicates
         for entity_type in entities:
@@ -275,8 +591,14 @@ class NLPProcessor:
         
         return min(confidence, 1.0)
     
-    def _fallback_processing(self, text: str) -> Dict[str, Any]:
+    def _fallback_processing(self, text: str,
+                             scores: Optional[List[Tuple[str, float]]] = None) -> Dict[str, Any]:
         """Fallback processing when spaCy is not available."""
+        if scores:
+            intent, intent_scores = scores[0][0], dict(scores)
+        else:
+            intent, intent_scores = self._classify(text)
+        
         return {
             "original_text": text,
             "processed_text": text.lower().strip(),
@@ -284,7 +606,8 @@ class NLPProcessor:
             "lemmas": text.lower().split(),
             "pos_tags": [],
             "entities": [],
-            "intent": self._classify_intent(text),
+            "intent": intent,
+            "intent_scores": intent_scores,
             "confidence": 0.3,
             "extracted_entities": self._extract_custom_entities(text),
             "sentiment": {"polarity": 0.0, "subjectivity": 0.0},
@@ -349,5 +672,10 @@ class NLPProcessor:
             "matcher_available": self.matcher is not None,
             "intent_patterns": len(self.intent_patterns),
             "entity_patterns": len(self.entity_patterns),
-            "model_name": "en_core_web_sm" if self.nlp else None
+            "model_name": self.model_name if self.nlp else None,
+            "pipeline_profile": self.pipeline_profile,
+            "pipeline": list(self.nlp.pipe_names) if self.nlp else [],
+            "result_cache": self.result_cache.get_stats(),
+            "fast_path": self.fast_path_enabled,
+            "latency": {path: histogram.get_stats() for path, histogram in self.latency.items()}
         }
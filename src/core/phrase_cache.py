@@ -0,0 +1,137 @@
+"""
+Pre-synthesized audio for phrases the assistant speaks repeatedly.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import wave
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# (pcm bytes, sample rate, channels, sample width in bytes)
+CachedAudio = Tuple[bytes, int, int, int]
+
+
+class PhraseCache:
+    """PCM cache for a registered set of fixed phrases.
+    
+    Each phrase is rendered once through the TTS engine's save_to_file and
+    stored as a WAV file keyed by (text, voice, rate, volume), so it survives
+    restarts and is invalidated by any change to the voice settings.
+    """
+    
+    def __init__(self, cache_dir: str = "./cache/tts", max_entries: int = 256):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        
+        self.phrases = set()
+        self._entries: Dict[str, CachedAudio] = {}
+        self._failed = set()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "renders": 0,
+            "render_failures": 0
+        }
+    
+    @staticmethod
+    def make_key(text: str, voice: Any, rate: Any, volume: Any) -> str:
+        """Key a phrase by its text and the voice settings it was rendered with."""
+        payload = json.dumps([text, str(voice), rate, volume])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def register(self, phrases: Iterable[str]):
+        """Mark phrases as worth caching."""
+        self.phrases.update(p.strip() for p in phrases if p and p.strip())
+    
+    def is_cacheable(self, text: str) -> bool:
+        """Check whether text is one of the registered phrases."""
+        return text.strip() in self.phrases
+    
+    def get(self, key: str) -> Optional[CachedAudio]:
+        """Look up rendered audio in memory, then on disk."""
+        audio = self._entries.get(key)
+        
+        if audio is None:
+            path = self.cache_dir / f"{key}.wav"
+            if path.exists():
+                audio = self._load(path)
+                if audio:
+                    self._remember(key, audio)
+        
+        if audio is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        
+        return audio
+    
+    def render(self, engine, text: str, key: str) -> Optional[CachedAudio]:
+        """Render a phrase to disk with the TTS engine and load it.
+        
+        Must be called from the thread that drives the engine. Phrases the
+        engine cannot render to WAV are not retried.
+        """
+        if key in self._failed:
+            return None
+        
+        path = self.cache_dir / f"{key}.wav"
+        tmp_path = self.cache_dir / f"{key}.tmp.wav"
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            engine.save_to_file(text, str(tmp_path))
+            engine.runAndWait()
+            
+            audio = self._load(tmp_path)
+            if audio is None:
+                raise ValueError("engine did not produce a readable WAV file")
+            
+            os.replace(tmp_path, path)
+            self._remember(key, audio)
+            self.stats["renders"] += 1
+            return audio
+        
+        except Exception as e:
+            self.logger.debug(f"Failed to render phrase '{text[:50]}': {e}")
+            self._failed.add(key)
+            self.stats["render_failures"] += 1
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return None
+    
+    def clear(self):
+        """Drop cached audio from memory and disk."""
+        self._entries.clear()
+        self._failed.clear()
+        
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.wav"):
+                path.unlink()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.stats,
+            "phrases": len(self.phrases),
+            "entries": len(self._entries)
+        }
+    
+    def _remember(self, key: str, audio: CachedAudio):
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = audio
+    
+    def _load(self, path: Path) -> Optional[CachedAudio]:
+        try:
+            with wave.open(str(path), "rb") as wav:
+                pcm = wav.readframes(wav.getnframes())
+                if not pcm:
+                    return None
+                return pcm, wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        except (wave.Error, EOFError, OSError) as e:
+            self.logger.debug(f"Unreadable cached phrase {path}: {e}")
+            return None
@@ -8,23 +8,41 @@ import logging
 import threading
 import time
 import queue
+import heapq
+from collections import deque
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Iterable
 
-import vosk
-import pyaudio
-import pyttsx3
 import numpy as np
 
-from   utils.config_loader import ConfigLoader
-from   utils.audio_utils import AudioProcessor
+from   utils.config_loader import ConfigLoader, ConfigSection
+from   utils.lazy_import import lazy_import
+from   utils.audio_utils import AudioProcessor, AudioChunk, StreamingResampler
+from   core.phrase_cache import PhraseCache, CachedAudio
+
+vosk = lazy_import("vosk")
+pyaudio = lazy_import("pyaudio")
+pyttsx3 = lazy_import("pyttsx3")
 
 
 class SpeechEngine:
     """Real-time speech recognition and text-to-speech engine."""
     
+    # Speech queue priorities (lower is spoken first)
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+    
+    # Barge-in echo estimate: chunks of playback heard before it is trusted,
+    # and how fast it follows louder and quieter mic levels
+    ECHO_WARMUP_CHUNKS = 5
+    ECHO_RISE = 0.5
+    ECHO_FALL = 0.05
+    
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config_loader = ConfigLoader.shared(config_path)
+        self.config = self.config_loader.get_config()
+        self._config_unsubscribers = []
         self.audio_config = self.config.get("audio", {})
         self.tts_config = self.config.get("tts", {})
         
@@ -37,14 +55,73 @@ class SpeechEngine:
         self.channels = self.audio_config.get("channels", 1)
         self.device_index = self.audio_config.get("device_index")
         
+        # Capture rate: null = sample_rate, "native" = device default, or a number.
+        # Audio captured at another rate is resampled to sample_rate for Vosk.
+        self.capture_rate_setting = self.audio_config.get("capture_rate")
+        self.capture_rate = self.sample_rate
+        self.resampler = None
+        
         # Speech recognition
         self.vosk_model = None
         self.recognizer = None
-        self.audio_processor = AudioProcessor()
+        self.audio_processor = AudioProcessor(
+            sample_rate=self.sample_rate,
+            chunk_size=self.chunk_size,
+            vad_config=self.audio_config.get("vad", {})
+        )
+        
+        # VAD gating: skip decoding silent chunks, keep a pre-roll for onsets
+        self.vad_gating = self.audio_config.get("vad_gating", False)
+        pre_roll_seconds = self.audio_config.get("pre_roll_seconds", 0.5)
+        pre_roll_chunks = int(np.ceil(pre_roll_seconds * self.sample_rate / self.chunk_size))
+        self._pre_roll = deque(maxlen=max(1, pre_roll_chunks))
+        self._gate_open = False
+        self.gate_stats = {
+            "chunks_total": 0,
+            "chunks_skipped": 0
+        }
         
         # Text-to-speech
         self.tts_engine = None
         self.available_voices = []
+        self._voice_ids = []
+        
+        # TTS worker: one thread owns the engine and drains a bounded priority
+        # queue; short utterances queued back to back are spoken as one
+        self.max_speech_queue = self.tts_config.get("max_queue", 32)
+        self.coalesce_chars = self.tts_config.get("coalesce_chars", 120)
+        # Barge-in has no echo cancellation: the mic must be this far above the
+        # assistant's own voice as heard by the mic, so it needs headphones or
+        # an AEC-capable device
+        self.barge_in = self.tts_config.get("barge_in", False)
+        self.barge_in_margin_db = self.tts_config.get("barge_in_margin_db", 10.0)
+        self._echo_db = None
+        self._echo_chunks = 0
+        self._speech_heap = []
+        self._speech_seq = 0
+        self._speech_generation = 0
+        self._speech_busy = False
+        self._speech_stop = False
+        # Engine property changes waiting for the worker, applied between utterances
+        self._pending_settings = {}
+        self._speech_condition = threading.Condition()
+        self._speech_thread = None
+        self._queue_waits = deque(maxlen=50)
+        self._synthesis_times = deque(maxlen=50)
+        self.tts_stats = {
+            "utterances": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "cancelled": 0
+        }
+        
+        # Fixed phrases are played from pre-rendered PCM instead of synthesized
+        self.phrase_cache = None
+        if self.tts_config.get("phrase_cache", True):
+            self.phrase_cache = PhraseCache(self.tts_config.get("phrase_cache_dir", "./cache/tts"))
+        self._pending_renders = deque()
+        self._output_stream = None
+        self._output_format = None
         
         # Audio streaming
         self.audio_stream = None
@@ -55,6 +132,8 @@ class SpeechEngine:
         # Callbacks
         self.speech_callback = None
         self.audio_callback = None
+        self.partial_callback = None
+        self._last_partial = ""
         
         # Threading
         self._lock = threading.RLock()
@@ -65,6 +144,41 @@ class SpeechEngine:
         self._initialize_vosk()
         self._initialize_tts()
         self._initialize_audio()
+        
+        # Re-tune VAD and TTS in place when the config file changes
+        self._config_unsubscribers = [
+            self.config_loader.subscribe("audio", self._apply_audio_config),
+            self.config_loader.subscribe("tts", self._apply_tts_config)
+        ]
+    
+    def _apply_audio_config(self, section: ConfigSection):
+        """Apply VAD settings from a reloaded audio config section."""
+        self.audio_config = section.to_dict()
+        vad = section.get_section("vad")
+        
+        self.audio_processor.set_vad_sensitivity(
+            vad.get_float("onset_db", self.audio_processor.vad.onset_db),
+            vad.get_float("offset_db", self.audio_processor.vad.offset_db),
+            hangover_ms=vad.get_float("hangover_ms")
+        )
+        self.vad_gating = section.get_bool("vad_gating", self.vad_gating)
+    
+    def _apply_tts_config(self, section: ConfigSection):
+        """Apply voice and queue settings from a reloaded tts config section."""
+        self.tts_config = section.to_dict()
+        
+        rate = section.get_int("rate")
+        if rate is not None:
+            self.set_speech_rate(rate)
+        
+        volume = section.get_float("volume")
+        if volume is not None:
+            self.set_volume(volume)
+        
+        self.max_speech_queue = section.get_int("max_queue", self.max_speech_queue)
+        self.coalesce_chars = section.get_int("coalesce_chars", self.coalesce_chars)
+        self.barge_in = section.get_bool("barge_in", self.barge_in)
+        self.barge_in_margin_db = section.get_float("barge_in_margin_db", self.barge_in_margin_db)
     
     def _initialize_vosk(self):
         """Initialize Vosk speech recognition."""
@@ -100,6 +214,7 @@ class SpeechEngine:
             # Get available voices
             voices = self.tts_engine.getProperty('voices')
             self.available_voices = []
+            self._voice_ids = [voice.id for voice in voices]
             
             for i, voice in enumerate(voices):
                 self.available_voices.append({
@@ -152,13 +267,18 @@ class SpeechEngine:
             
             # Start audio stream
             try:
+                self._configure_capture_rate()
+                
+                # Keep the chunk duration independent of the capture rate
+                frames_per_buffer = int(self.chunk_size * self.capture_rate / self.sample_rate)
+                
                 self.audio_stream = self.pyaudio_instance.open(
                     format=pyaudio.paInt16,
                     channels=self.channels,
-                    rate=self.sample_rate,
+                    rate=self.capture_rate,
                     input=True,
                     input_device_index=self.device_index,
-                    frames_per_buffer=self.chunk_size,
+                    frames_per_buffer=frames_per_buffer,
                     stream_callback=self._audio_stream_callback
                 )
                 
@@ -174,6 +294,28 @@ class SpeechEngine:
                 self.logger.error(f"Failed to start audio stream: {e}")
                 self.is_listening = False
     
+    def _configure_capture_rate(self):
+        """Resolve the capture rate for the current device and set up resampling."""
+        setting = self.capture_rate_setting
+        
+        if setting == "native":
+            if self.device_index is None:
+                device_info = self.pyaudio_instance.get_default_input_device_info()
+            else:
+                device_info = self.pyaudio_instance.get_device_info_by_index(self.device_index)
+            self.capture_rate = int(device_info['defaultSampleRate'])
+        elif setting:
+            self.capture_rate = int(setting)
+        else:
+            self.capture_rate = self.sample_rate
+        
+        if self.capture_rate != self.sample_rate:
+            # Filter banks are cached per rate pair, so this is cheap on restarts
+            self.resampler = StreamingResampler(self.capture_rate, self.sample_rate)
+            self.logger.info(f"Capturing at {self.capture_rate} Hz, resampling to {self.sample_rate} Hz")
+        else:
+            self.resampler = None
+    
     def stop_listening(self):
         """Stop speech recognition."""
         with self._lock:
@@ -200,15 +342,9 @@ class SpeechEngine:
     def _audio_stream_callback(self, in_data, frame_count, time_info, status):
         """Audio stream callback."""
         try:
-            # Convert to numpy array
-            audio_data = np.frombuffer(in_data, dtype=np.int16).astype(np.float32) / 32768.0
-            
-            # Add to queue for processing
-            self._audio_queue.put(audio_data)
-            
-            # Call audio callback if set
-            if self.audio_callback:
-                self.audio_callback(audio_data)
+            # Hand the raw int16 bytes to the processing thread untouched;
+            # float conversion happens lazily there, off the PortAudio thread
+            self._audio_queue.put(in_data)
             
             return (None, pyaudio.paContinue)
             
@@ -222,29 +358,8 @@ class SpeechEngine:
             while self.is_listening:
                 try:
                     # Get audio data with timeout
-                    audio_data = self._audio_queue.get(timeout=0.1)
-                    
-                    # Convert to bytes for Vosk
-                    audio_bytes = (audio_data * 32768).astype(np.int16).tobytes()
-                    
-                    # Process with Vosk
-                    if self.recognizer.AcceptWaveform(audio_bytes):
-                        # Complete utterance
-                        result = json.loads(self.recognizer.Result())
-                        text = result.get('text', '').strip()
-                        
-                        if text and self.speech_callback:
-                            self.speech_callback(text)
-                    else:
-                        # Partial result
-                        partial = json.loads(self.recognizer.PartialResult())
-                        partial_text = partial.get('partial', '').strip()
-                        
-                        # Could emit partial results if needed
-                        pass
-                    
-                    # Update audio processor
-                    self.audio_processor.add_to_buffer(audio_data)
+                    pcm = self._audio_queue.get(timeout=0.1)
+                    self._process_chunk(pcm)
                     
                 except queue.Empty:
                     continue
@@ -254,35 +369,390 @@ class SpeechEngine:
         except Exception as e:
             self.logger.error(f"Audio processing thread error: {e}")
     
-    def speak(self, text: str, blocking: bool = True):
-        """Convert text to speech."""
+    def _process_chunk(self, pcm: bytes):
+        """Run one captured chunk through VAD, barge-in and recognition."""
+        # Bring native-rate captures to the recognizer's rate
+        if self.resampler:
+            pcm = self.resampler.process_pcm16(pcm)
+        
+        chunk = AudioChunk(pcm)
+        
+        # Float view is computed once and shared by all consumers
+        if self.audio_callback:
+            self.audio_callback(chunk.samples)
+        
+        # Update audio processor
+        self.audio_processor.add_to_buffer(chunk.samples)
+        
+        self.gate_stats["chunks_total"] += 1
+        
+        voiced = None
+        if self.vad_gating or self.barge_in:
+            voiced = self.audio_processor.detect_voice_activity(chunk.samples)
+        
+        # Barge-in: the user talking over the assistant cuts it off
+        if self.barge_in and self.is_speaking and self._is_barge_in(chunk, voiced):
+            self.cancel()
+        
+        if self.vad_gating:
+            self._gate_chunk(chunk, voiced)
+        else:
+            self._recognize_chunk(chunk)
+    
+    def _is_barge_in(self, chunk: AudioChunk, voiced: bool) -> bool:
+        """Whether input heard during playback is the user rather than echo.
+        
+        The mic also hears the assistant, so its echo level is estimated from
+        the mic while speaking: a peak follower that rises quickly and decays
+        slowly. Barge-in needs voiced input barge_in_margin_db above that
+        estimate, once it has seen ECHO_WARMUP_CHUNKS chunks of playback.
+        """
+        level = _level_db(chunk.samples)
+        echo = self._echo_db
+        
+        if (voiced and echo is not None and self._echo_chunks >= self.ECHO_WARMUP_CHUNKS
+                and level >= echo + self.barge_in_margin_db):
+            return True
+        
+        # Anything else heard while speaking counts as echo
+        if echo is None:
+            self._echo_db = level
+        else:
+            rate = self.ECHO_RISE if level > echo else self.ECHO_FALL
+            self._echo_db = echo + rate * (level - echo)
+        self._echo_chunks += 1
+        
+        return False
+    
+    def _gate_chunk(self, chunk: AudioChunk, voiced: bool):
+        """Decode a chunk only while voice activity is detected."""
+        if voiced:
+            if not self._gate_open:
+                # Speech onset: replay the pre-roll so word onsets aren't clipped
+                self._gate_open = True
+                self.gate_stats["chunks_skipped"] -= len(self._pre_roll)
+                while self._pre_roll:
+                    self._recognize_chunk(self._pre_roll.popleft())
+            
+            self._recognize_chunk(chunk)
+        else:
+            if self._gate_open:
+                # Speech ended: force out whatever the recognizer still holds
+                self._gate_open = False
+                self._finalize_utterance()
+            
+            self._pre_roll.append(chunk)
+            self.gate_stats["chunks_skipped"] += 1
+    
+    def _recognize_chunk(self, chunk: AudioChunk):
+        """Feed one chunk to Vosk and dispatch final or partial results."""
+        # Vosk consumes the int16 PCM directly
+        if self.recognizer.AcceptWaveform(chunk.pcm):
+            # Complete utterance
+            self._emit_result(self.recognizer.Result())
+        elif self.partial_callback:
+            # Partial result
+            partial = json.loads(self.recognizer.PartialResult())
+            partial_text = partial.get('partial', '').strip()
+            
+            # Only emit when the hypothesis actually changes
+            if partial_text and partial_text != self._last_partial:
+                self._last_partial = partial_text
+                self.partial_callback(partial_text)
+    
+    def _finalize_utterance(self):
+        """Flush the recognizer's pending utterance."""
+        self._emit_result(self.recognizer.FinalResult())
+    
+    def _emit_result(self, result_json: str):
+        """Dispatch a final recognition result."""
+        result = json.loads(result_json)
+        text = result.get('text', '').strip()
+        self._last_partial = ""
+        
+        if text and self.speech_callback:
+            self.speech_callback(text)
+    
+    def speak(self, text: str, blocking: bool = True, priority: int = PRIORITY_NORMAL):
+        """Convert text to speech.
+        
+        The utterance is handed to the TTS worker; when blocking, wait until it
+        has been spoken, dropped or cancelled.
+        """
         try:
             if not self.tts_engine:
                 self.logger.error("TTS engine not initialized")
                 return
             
-            self.is_speaking = True
+            done = self.queue_speech(text, priority)
             
-            if blocking:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-                self.is_speaking = False
-            else:
-                # Non-blocking speech
-                def speak_async():
-                    try:
-                        self.tts_engine.say(text)
-                        self.tts_engine.runAndWait()
-                    finally:
-                        self.is_speaking = False
+            if blocking and done:
+                done.wait()
+            
+        except Exception as e:
+            self.logger.error(f"TTS error: {e}")
+    
+    def queue_speech(self, text: str, priority: int = PRIORITY_NORMAL) -> Optional[threading.Event]:
+        """Queue text for the TTS worker.
+        
+        Utterances are spoken by priority, then in the order they were queued.
+        When the queue is full the least urgent utterance is dropped. Returns
+        an event that is set once the utterance is finished with.
+        """
+        if not text:
+            return None
+        
+        done = threading.Event()
+        
+        with self._speech_condition:
+            self._ensure_speech_worker()
+            
+            item = (priority, self._speech_seq, text, done, time.time())
+            self._speech_seq += 1
+            
+            if len(self._speech_heap) >= self.max_speech_queue:
+                worst = max(self._speech_heap)
+                self.tts_stats["dropped"] += 1
+                
+                if item > worst:
+                    self.logger.warning(f"Speech queue full, dropping: {text[:50]}...")
+                    done.set()
+                    return done
+                
+                self.logger.warning(f"Speech queue full, dropping: {worst[2][:50]}...")
+                self._speech_heap.remove(worst)
+                heapq.heapify(self._speech_heap)
+                worst[3].set()
+            
+            heapq.heappush(self._speech_heap, item)
+            self._speech_condition.notify_all()
+        
+        return done
+    
+    def register_phrases(self, phrases: Iterable[str], precache: bool = True):
+        """Register fixed phrases to be played from the phrase cache.
+        
+        With precache, phrases not yet on disk are rendered by the TTS worker
+        whenever it is idle; otherwise they are rendered on first use.
+        """
+        if not self.phrase_cache:
+            return
+        
+        phrases = [p.strip() for p in phrases if p and p.strip()]
+        self.phrase_cache.register(phrases)
+        
+        if precache and self.tts_engine:
+            with self._speech_condition:
+                self._pending_renders.extend(phrases)
+                self._ensure_speech_worker()
+                self._speech_condition.notify_all()
+    
+    def _ensure_speech_worker(self):
+        """Start the TTS worker if it is not running. Caller holds _speech_condition."""
+        if not self._speech_thread or not self._speech_thread.is_alive():
+            self._speech_stop = False
+            self._speech_thread = threading.Thread(target=self._speech_worker, daemon=True)
+            self._speech_thread.start()
+    
+    def wait_until_spoken(self, timeout: Optional[float] = None) -> bool:
+        """Block until the speech queue is empty and nothing is playing."""
+        with self._speech_condition:
+            return self._speech_condition.wait_for(
+                lambda: not self._speech_heap and not self._speech_busy, timeout
+            )
+    
+    def cancel(self) -> int:
+        """Interrupt current speech and drop everything queued (barge-in).
+        
+        Returns the number of queued utterances that were dropped.
+        """
+        with self._speech_condition:
+            dropped = self._speech_heap
+            self._speech_heap = []
+            self._speech_generation += 1
+            interrupted = self._speech_busy
+            self._speech_condition.notify_all()
+        
+        for item in dropped:
+            item[3].set()
+        
+        if interrupted and self.tts_engine:
+            try:
+                self.tts_engine.stop()
+            except Exception as e:
+                self.logger.debug(f"TTS stop failed: {e}")
+        
+        if dropped or interrupted:
+            self.tts_stats["cancelled"] += 1
+            self.logger.info(f"Speech cancelled ({len(dropped)} queued utterances dropped)")
+        
+        return len(dropped)
+    
+    def _speech_worker(self):
+        """Speak queued utterances one batch at a time."""
+        while True:
+            with self._speech_condition:
+                self._speech_condition.wait_for(
+                    lambda: (self._speech_heap or self._pending_renders
+                             or self._pending_settings or self._speech_stop)
+                )
+                if self._speech_stop:
+                    break
                 
-                threading.Thread(target=speak_async, daemon=True).start()
+                settings = self._pending_settings
+                self._pending_settings = {}
+                
+                if settings:
+                    batch = None
+                elif self._speech_heap:
+                    batch = self._take_speech_batch()
+                    generation = self._speech_generation
+                    self._speech_busy = True
+                else:
+                    batch = None
+                    phrase = self._pending_renders.popleft()
+            
+            if settings:
+                self._apply_engine_settings(settings)
+                continue
             
-            self.logger.info(f"Speaking: {text[:50]}...")
+            if batch is None:
+                # Idle: pre-render the next registered phrase
+                self._cached_audio(phrase)
+                continue
             
+            try:
+                self._queue_waits.append(time.time() - batch[0][4])
+                self._synthesize(" ".join(item[2] for item in batch), generation)
+            finally:
+                with self._speech_condition:
+                    self._speech_busy = False
+                    self._speech_condition.notify_all()
+                
+                for item in batch:
+                    item[3].set()
+    
+    def _apply_engine_settings(self, settings: dict):
+        """Set engine properties on the worker thread, which owns the engine."""
+        for name, value in settings.items():
+            try:
+                self.tts_engine.setProperty(name, value)
+                self.logger.info(f"TTS {name} set to: {value}")
+            except Exception as e:
+                self.logger.error(f"Failed to set TTS {name}: {e}")
+    
+    def _queue_engine_setting(self, name: str, value: Any):
+        """Hand a property change to the TTS worker.
+        
+        pyttsx3 isn't thread-safe and the worker may be inside runAndWait, so
+        changes are applied by the worker before it starts the next utterance.
+        """
+        with self._speech_condition:
+            self._pending_settings[name] = value
+            self._ensure_speech_worker()
+            self._speech_condition.notify_all()
+    
+    def _take_speech_batch(self) -> list:
+        """Pop the next utterance plus any short ones queued right behind it."""
+        batch = [heapq.heappop(self._speech_heap)]
+        length = len(batch[0][2])
+        
+        # Cached phrases are played on their own so they stay cache hits
+        if self._is_cached_phrase(batch[0][2]):
+            return batch
+        
+        while self._speech_heap and self._speech_heap[0][0] == batch[0][0]:
+            if self._is_cached_phrase(self._speech_heap[0][2]):
+                break
+            length += len(self._speech_heap[0][2]) + 1
+            if length > self.coalesce_chars:
+                break
+            batch.append(heapq.heappop(self._speech_heap))
+        
+        self.tts_stats["coalesced"] += len(batch) - 1
+        return batch
+    
+    def _synthesize(self, text: str, generation: int):
+        """Speak text on the worker thread unless it was cancelled meanwhile."""
+        if generation != self._speech_generation:
+            return
+        
+        self.logger.info(f"Speaking: {text[:50]}...")
+        started = time.time()
+        self.is_speaking = True
+        
+        try:
+            audio = self._cached_audio(text)
+            if not audio or not self._play_pcm(audio, generation):
+                self.tts_engine.say(text)
+                self.tts_engine.runAndWait()
         except Exception as e:
             self.logger.error(f"TTS error: {e}")
+        finally:
             self.is_speaking = False
+        
+        self._synthesis_times.append(time.time() - started)
+        self.tts_stats["utterances"] += 1
+    
+    def _is_cached_phrase(self, text: str) -> bool:
+        return self.phrase_cache is not None and self.phrase_cache.is_cacheable(text)
+    
+    def _cached_audio(self, text: str) -> Optional[CachedAudio]:
+        """Get pre-rendered audio for a registered phrase, rendering it if needed.
+        
+        Runs on the TTS worker, which owns the engine.
+        """
+        if not self._is_cached_phrase(text) or not self.tts_engine:
+            return None
+        
+        try:
+            key = PhraseCache.make_key(
+                text.strip(),
+                self.tts_engine.getProperty('voice'),
+                self.tts_engine.getProperty('rate'),
+                self.tts_engine.getProperty('volume')
+            )
+            audio = self.phrase_cache.get(key)
+            if audio is None:
+                audio = self.phrase_cache.render(self.tts_engine, text.strip(), key)
+            return audio
+        except Exception as e:
+            self.logger.debug(f"Phrase cache lookup failed: {e}")
+            return None
+    
+    def _play_pcm(self, audio: CachedAudio, generation: int) -> bool:
+        """Write cached PCM to the output device, stopping early if cancelled."""
+        if not self.pyaudio_instance:
+            return False
+        
+        pcm, rate, channels, width = audio
+        
+        try:
+            if self._output_stream is None or self._output_format != (rate, channels, width):
+                if self._output_stream:
+                    self._output_stream.close()
+                self._output_stream = self.pyaudio_instance.open(
+                    format=self.pyaudio_instance.get_format_from_width(width),
+                    channels=channels,
+                    rate=rate,
+                    output=True
+                )
+                self._output_format = (rate, channels, width)
+            
+            # Write in 100 ms blocks so cancel() takes effect quickly
+            block = max(1, rate // 10) * channels * width
+            for start in range(0, len(pcm), block):
+                if generation != self._speech_generation:
+                    break
+                self._output_stream.write(pcm[start:start + block])
+            
+            return True
+        
+        except Exception as e:
+            self.logger.warning(f"Cached phrase playback failed: {e}")
+            self._output_stream = None
+            self._output_format = None
+            return False
     
     def set_voice(self, voice_id: int) -> bool:
         """Set TTS voice."""
@@ -290,10 +760,9 @@ class SpeechEngine:
             if not self.tts_engine:
                 return False
             
-            voices = self.tts_engine.getProperty('voices')
-            if 0 <= voice_id < len(voices):
-                self.tts_engine.setProperty('voice', voices[voice_id].id)
-                self.logger.info(f"Voice changed to: {voices[voice_id].name}")
+            if 0 <= voice_id < len(self._voice_ids):
+                self._queue_engine_setting('voice', self._voice_ids[voice_id])
+                self.logger.info(f"Voice changing to: {self.available_voices[voice_id]['name']}")
                 return True
             else:
                 self.logger.error(f"Invalid voice ID: {voice_id}")
@@ -307,8 +776,7 @@ class SpeechEngine:
         """Set TTS speech rate."""
         try:
             if self.tts_engine:
-                self.tts_engine.setProperty('rate', rate)
-                self.logger.info(f"Speech rate set to: {rate}")
+                self._queue_engine_setting('rate', rate)
         except Exception as e:
             self.logger.error(f"Failed to set speech rate: {e}")
     
@@ -317,8 +785,7 @@ class SpeechEngine:
         try:
             if self.tts_engine:
                 volume = max(0.0, min(1.0, volume))
-                self.tts_engine.setProperty('volume', volume)
-                self.logger.info(f"Volume set to: {volume}")
+                self._queue_engine_setting('volume', volume)
         except Exception as e:
             self.logger.error(f"Failed to set volume: {e}")
     
@@ -326,6 +793,11 @@ class SpeechEngine:
         """Set callback for raw audio data."""
         self.audio_callback = callback
     
+    def set_partial_callback(self, callback: Callable[[str], None]):
+        """Set callback for partial (in-progress) recognition hypotheses."""
+        self.partial_callback = callback
+        self._last_partial = ""
+    
     def get_available_voices(self) -> list:
         """Get list of available TTS voices."""
         return self.available_voices.copy()
@@ -377,19 +849,45 @@ class SpeechEngine:
         return {
             "is_listening": self.is_listening,
             "is_speaking": self.is_speaking,
+            "speech_queue_depth": len(self._speech_heap),
+            "speech_queue_wait": float(np.mean(self._queue_waits)) if self._queue_waits else 0.0,
+            "synthesis_time": float(np.mean(self._synthesis_times)) if self._synthesis_times else 0.0,
+            "tts": dict(self.tts_stats),
+            "phrase_cache": self.phrase_cache.get_stats() if self.phrase_cache else None,
             "vosk_initialized": self.vosk_model is not None,
             "tts_initialized": self.tts_engine is not None,
             "audio_initialized": self.pyaudio_instance is not None,
             "current_device": self.device_index,
             "available_voices": len(self.available_voices),
             "sample_rate": self.sample_rate,
-            "chunk_size": self.chunk_size
+            "capture_rate": self.capture_rate,
+            "chunk_size": self.chunk_size,
+            "vad_gating": self.vad_gating,
+            "chunks_total": self.gate_stats["chunks_total"],
+            "chunks_skipped": self.gate_stats["chunks_skipped"],
+            "skip_ratio": (self.gate_stats["chunks_skipped"] / self.gate_stats["chunks_total"]
+                           if self.gate_stats["chunks_total"] else 0.0)
         }
     
     def cleanup(self):
         """Clean up resources."""
+        for unsubscribe in self._config_unsubscribers:
+            unsubscribe()
+        
         self.stop_listening()
         
+        self.cancel()
+        with self._speech_condition:
+            self._speech_stop = True
+            self._speech_condition.notify_all()
+        
+        if self._output_stream:
+            try:
+                self._output_stream.close()
+            except Exception:
+                pass
+            self._output_stream = None
+        
         if self.tts_engine:
             try:
                 self.tts_engine.stop()
@@ -407,3 +905,11 @@ class SpeechEngine:
     def __del__(self):
         """Cleanup when object is destroyed."""
         self.cleanup()
+
+
+def _level_db(samples: np.ndarray) -> float:
+    """RMS level of float samples in dBFS."""
+    if len(samples) == 0:
+        return -120.0
+    rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64)))
+    return 20.0 * np.log10(max(rms, 1e-6))
@@ -6,32 +6,47 @@ Handles local LLM processing with Ollama and LMStudio support.
 import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 import time
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional, Generator
 from datetime import datetime
 
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from  utils.config_loader import ConfigLoader, ConfigSection
+from  utils.lazy_import import lazy_import, is_available
 
-from  utils.config_loader import ConfigLoader
+# The ollama package is optional; the REST API is used when it is missing
+OLLAMA_AVAILABLE = is_available("ollama")
+ollama = lazy_import("ollama")
 
 
 class LLMBackend:
     """Local LLM backend with Ollama and LMStudio support."""
     
+    FALLBACK_RESPONSES = {
+        "greeting": "Hello! I'm having trouble connecting to my language model. How can I help you with basic tasks?",
+        "math": "I can help with basic calculations even without my language model.",
+        "time": "I can tell you the current time and date.",
+        "system": "I can provide system information.",
+        "default": "I'm sorry, I'm having trouble connecting to my language model right now. I can still help with basic tasks like math, time, and system information."
+    }
+    
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config_loader = ConfigLoader.shared(config_path)
+        self.config = self.config_loader.get_config()
         self.llm_config = self.config.get("llm", {})
         
         # Initialize logging
         self.logger = logging.getLogger(__name__)
         
-        # Thread safety
+        # Thread safety: _lock only guards history and backend state, never a
+        # generation; concurrent generations are bounded by a semaphore
         self._lock = threading.RLock()
+        self._reconnect_lock = threading.Lock()
+        self.max_concurrent_generations = max(1, self.llm_config.get("max_concurrent_generations", 2))
+        self._generation_slots = threading.BoundedSemaphore(self.max_concurrent_generations)
+        self._in_flight = 0
         
         # Backend configuration
         self.backend = self.llm_config.get("backend", "ollama")
@@ -39,6 +54,15 @@ class LLMBackend:
         self.lmstudio_url = self.llm_config.get("lmstudio_url", "http://localhost:1234")
         self.model = self.llm_config.get("model", "llama2:7b")
         
+        # HTTP connection pooling and timeouts (connect, read)
+        self.pool_size = self.llm_config.get("pool_size", 4)
+        self.connect_timeout = self.llm_config.get("connect_timeout", 3.05)
+        self.read_timeout = self.llm_config.get("read_timeout", 30)
+        self.probe_timeout = (self.connect_timeout, self.llm_config.get("probe_timeout", 5))
+        self.generation_timeout = (self.connect_timeout, self.read_timeout)
+        self.session = self._create_session()
+        self._ollama_client = None
+        
         # Generation parameters
         self.temperature = self.llm_config.get("temperature", 0.7)
         self.max_tokens = self.llm_config.get("max_tokens", 512)
@@ -48,6 +72,10 @@ class LLMBackend:
         self.conversation_history = []
         self.max_history_length = 10
         
+        # Model preloading (used for speculative warm-up)
+        self.warm_up_interval = self.llm_config.get("warm_up_interval", 60.0)
+        self._last_warm_up = 0.0
+        
         # Backend status
         self.backend_status = {
             "ollama": False,
@@ -57,6 +85,30 @@ class LLMBackend:
         
         # Initialize backend
         self._initialize_backend()
+        
+        # Re-tune generation parameters when the config file changes
+        self._unsubscribe_config = self.config_loader.subscribe("llm", self._apply_config)
+    
+    @property
+    def ollama_client(self):
+        """ollama.Client, created (and the package imported) on first use."""
+        if self._ollama_client is None and OLLAMA_AVAILABLE:
+            with self._lock:
+                if self._ollama_client is None:
+                    self._ollama_client = ollama.Client(host=self.ollama_url, timeout=self.read_timeout)
+        return self._ollama_client
+    
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with a connection pool per backend host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,  # Ollama and LMStudio hosts
+            pool_maxsize=self.pool_size,
+            max_retries=0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
     
     def _initialize_backend(self):
         """Initialize and test the LLM backend."""
@@ -79,14 +131,15 @@ class LLMBackend:
                 return False
             
             # Test connection
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=self.probe_timeout)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [model["name"] for model in models]
                 
                 if self.model in model_names:
-                    self.backend_status["ollama"] = True
-                    self.backend_status["active_backend"] = "ollama"
+                    with self._lock:
+                        self.backend_status["ollama"] = True
+                        self.backend_status["active_backend"] = "ollama"
                     self.logger.info(f"Ollama connected successfully with model: {self.model}")
                     return True
                 else:
@@ -106,10 +159,11 @@ class LLMBackend:
     def _test_lmstudio_connection(self) -> bool:
         """Test LMStudio connection."""
         try:
-            response = requests.get(f"{self.lmstudio_url}/v1/models", timeout=5)
+            response = self.session.get(f"{self.lmstudio_url}/v1/models", timeout=self.probe_timeout)
             if response.status_code == 200:
-                self.backend_status["lmstudio"] = True
-                self.backend_status["active_backend"] = "lmstudio"
+                with self._lock:
+                    self.backend_status["lmstudio"] = True
+                    self.backend_status["active_backend"] = "lmstudio"
                 self.logger.info("LMStudio connected successfully")
                 return True
             else:
@@ -129,15 +183,15 @@ class LLMBackend:
             
             if OLLAMA_AVAILABLE:
                 # Use ollama package if available
-                ollama.pull(model_name)
+                self.ollama_client.pull(model_name)
                 self.logger.info(f"Successfully pulled model: {model_name}")
                 return True
             else:
                 # Fallback to API call
-                response = requests.post(
+                response = self.session.post(
                     f"{self.ollama_url}/api/pull",
                     json={"name": model_name},
-                    timeout=300  # 5 minutes timeout for model download
+                    timeout=(self.connect_timeout, 300)  # 5 minutes for model download
                 )
                 
                 if response.status_code == 200:
@@ -152,44 +206,113 @@ class LLMBackend:
     def generate_response(self, prompt: str, context: str = None, 
                          system_prompt: str = None) -> str:
         """Generate response from the LLM."""
+        try:
+            # Prepare the full prompt
+            full_prompt = self._prepare_prompt(prompt, context, system_prompt)
+            
+            active_backend = self._get_active_backend()
+            if active_backend is None and self._try_reconnect():
+                active_backend = self._get_active_backend()
+            
+            # Generate response based on active backend
+            if active_backend in ("ollama", "lmstudio"):
+                with self._generation_slot():
+                    if active_backend == "ollama":
+                        response = self._generate_ollama_response(full_prompt)
+                    else:
+                        response = self._generate_lmstudio_response(full_prompt)
+            else:
+                response = self._fallback_response(prompt)
+            
+            # Store in conversation history
+            self._update_conversation_history(prompt, response)
+            
+            return response
+        
+        except Exception as e:
+            self.logger.error(f"Failed to generate response: {e}")
+            return self._fallback_response(prompt)
+    
+    def _get_active_backend(self) -> Optional[str]:
+        """Read the active backend under the state lock."""
         with self._lock:
+            return self.backend_status["active_backend"]
+    
+    @contextmanager
+    def _generation_slot(self):
+        """Hold one of the max_concurrent_generations slots."""
+        with self._generation_slots:
+            with self._lock:
+                self._in_flight += 1
             try:
-                # Prepare the full prompt
-                full_prompt = self._prepare_prompt(prompt, context, system_prompt)
-                
-                # Generate response based on active backend
-                if self.backend_status["active_backend"] == "ollama":
-                    response = self._generate_ollama_response(full_prompt)
-                elif self.backend_status["active_backend"] == "lmstudio":
-                    response = self._generate_lmstudio_response(full_prompt)
-                else:
-                    # Try to reconnect or fallback
-                    if self._try_reconnect():
-                        return self.generate_response(prompt, context, system_prompt)
-                    else:
-                        response = self._fallback_response(prompt)
-                
-                # Store in conversation history
-                self._update_conversation_history(prompt, response)
-                
-                return response
-                
-            except Exception as e:
-                self.logger.error(f"Failed to generate response: {e}")
-                return self._fallback_response(prompt)
+                yield
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+    
+    def warm_up(self) -> bool:
+        """Preload the active model so the next generation skips load latency.
+        
+        Throttled to one request per warm_up_interval; safe to call on every
+        partial recognition result.
+        """
+        # Check and claim the slot together so concurrent partials send one request
+        with self._lock:
+            now = time.time()
+            if now - self._last_warm_up < self.warm_up_interval:
+                return True
+            self._last_warm_up = now
+        
+        try:
+            active_backend = self._get_active_backend()
+            
+            if active_backend == "ollama":
+                # A generate request without a prompt only loads the model;
+                # it returns once loading finishes, which can take as long as a generation
+                self.session.post(
+                    f"{self.ollama_url}/api/generate",
+                    json={"model": self.model, "keep_alive": "5m"},
+                    timeout=self.generation_timeout
+                )
+            elif active_backend == "lmstudio":
+                self.session.get(f"{self.lmstudio_url}/v1/models", timeout=self.probe_timeout)
+            else:
+                return False
+            
+            return True
+        
+        except requests.exceptions.RequestException as e:
+            self.logger.debug(f"LLM warm-up failed: {e}")
+            return False
     
     def generate_streaming_response(self, prompt: str, context: str = None,
                                   system_prompt: str = None) -> Generator[str, None, None]:
-        """Generate streaming response from the LLM."""
+        """Generate streaming response from the LLM.
+        
+        The complete response is added to conversation history once the
+        stream is exhausted.
+        """
         try:
             full_prompt = self._prepare_prompt(prompt, context, system_prompt)
+            active_backend = self._get_active_backend()
             
-            if self.backend_status["active_backend"] == "ollama":
-                yield from self._generate_ollama_streaming(full_prompt)
-            elif self.backend_status["active_backend"] == "lmstudio":
-                yield from self._generate_lmstudio_streaming(full_prompt)
+            if active_backend == "ollama":
+                stream = self._generate_ollama_streaming(full_prompt)
+            elif active_backend == "lmstudio":
+                stream = self._generate_lmstudio_streaming(full_prompt)
             else:
                 yield self._fallback_response(prompt)
+                return
+            
+            tokens = []
+            with self._generation_slot():
+                for token in stream:
+                    tokens.append(token)
+                    yield token
+            
+            response = "".join(tokens).strip()
+            if response:
+                self._update_conversation_history(prompt, response)
                 
         except Exception as e:
             self.logger.error(f"Failed to generate streaming response: {e}")
@@ -211,9 +334,12 @@ class LLMBackend:
             parts.append(f"Context: {context}")
         
         # Add conversation history (last few exchanges)
-        if self.conversation_history:
+        with self._lock:
+            recent_history = self.conversation_history[-3:]  # Last 3 exchanges
+        
+        if recent_history:
             parts.append("Recent conversation:")
-            for exchange in self.conversation_history[-3:]:  # Last 3 exchanges
+            for exchange in recent_history:
                 parts.append(f"User: {exchange['user']}")
                 parts.append(f"Assistant: {exchange['assistant']}")
         
@@ -228,7 +354,7 @@ class LLMBackend:
         try:
             if OLLAMA_AVAILABLE:
                 # Use ollama package
-                response = ollama.generate(
+                response = self.ollama_client.generate(
                     model=self.model,
                     prompt=prompt,
                     options={
@@ -239,7 +365,7 @@ class LLMBackend:
                 return response["response"].strip()
             else:
                 # Use API directly
-                response = requests.post(
+                response = self.session.post(
                     f"{self.ollama_url}/api/generate",
                     json={
                         "model": self.model,
@@ -250,7 +376,7 @@ class LLMBackend:
                             "num_predict": self.max_tokens,
                         }
                     },
-                    timeout=30
+                    timeout=self.generation_timeout
                 )
                 
                 if response.status_code == 200:
@@ -265,7 +391,7 @@ class LLMBackend:
     def _generate_lmstudio_response(self, prompt: str) -> str:
         """Generate response using LMStudio."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.lmstudio_url}/v1/chat/completions",
                 json={
                     "messages": [{"role": "user", "content": prompt}],
@@ -273,7 +399,7 @@ class LLMBackend:
                     "max_tokens": self.max_tokens,
                     "stream": False
                 },
-                timeout=30
+                timeout=self.generation_timeout
             )
             
             if response.status_code == 200:
@@ -291,7 +417,7 @@ class LLMBackend:
         try:
             if OLLAMA_AVAILABLE:
                 # Use ollama package for streaming
-                stream = ollama.generate(
+                stream = self.ollama_client.generate(
                     model=self.model,
                     prompt=prompt,
                     stream=True,
@@ -306,7 +432,8 @@ class LLMBackend:
                         yield chunk["response"]
             else:
                 # Use API for streaming
-                response = requests.post(
+                # Context manager returns the connection to the pool when done
+                with self.session.post(
                     f"{self.ollama_url}/api/generate",
                     json={
                         "model": self.model,
@@ -318,17 +445,16 @@ class LLMBackend:
                         }
                     },
                     stream=True,
-                    timeout=30
-                )
-                
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            data = json.loads(line.decode('utf-8'))
-                            if "response" in data:
-                                yield data["response"]
-                        except json.JSONDecodeError:
-                            continue
+                    timeout=self.generation_timeout
+                ) as response:
+                    for line in response.iter_lines():
+                        if line:
+                            try:
+                                data = json.loads(line.decode('utf-8'))
+                                if "response" in data:
+                                    yield data["response"]
+                            except json.JSONDecodeError:
+                                continue
                             
         except Exception as e:
             self.logger.error(f"Ollama streaming failed: {e}")
@@ -337,7 +463,7 @@ class LLMBackend:
     def _generate_lmstudio_streaming(self, prompt: str) -> Generator[str, None, None]:
         """Generate streaming response using LMStudio."""
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.lmstudio_url}/v1/chat/completions",
                 json={
                     "messages": [{"role": "user", "content": prompt}],
@@ -346,21 +472,20 @@ class LLMBackend:
                     "stream": True
                 },
                 stream=True,
-                timeout=30
-            )
-            
-            for line in response.iter_lines():
-                if line:
-                    line_str = line.decode('utf-8')
-                    if line_str.startswith('data: '):
-                        try:
-                            data = json.loads(line_str[6:])
-                            if "choices" in data and data["choices"]:
-                                delta = data["choices"][0].get("delta", {})
-                                if "content" in delta:
-                                    yield delta["content"]
-                        except json.JSONDecodeError:
-                            continue
+                timeout=self.generation_timeout
+            ) as response:
+                for line in response.iter_lines():
+                    if line:
+                        line_str = line.decode('utf-8')
+                        if line_str.startswith('data: '):
+                            try:
+                                data = json.loads(line_str[6:])
+                                if "choices" in data and data["choices"]:
+                                    delta = data["choices"][0].get("delta", {})
+                                    if "content" in delta:
+                                        yield delta["content"]
+                            except json.JSONDecodeError:
+                                continue
                             
         except Exception as e:
             self.logger.error(f"LMStudio streaming failed: {e}")
@@ -368,40 +493,40 @@ class LLMBackend:
     
     def _update_conversation_history(self, user_input: str, assistant_response: str):
         """Update conversation history."""
-        self.conversation_history.append({
-            "user": user_input,
-            "assistant": assistant_response,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Keep only recent history
-        if len(self.conversation_history) > self.max_history_length:
-            self.conversation_history = self.conversation_history[-self.max_history_length:]
+        with self._lock:
+            self.conversation_history.append({
+                "user": user_input,
+                "assistant": assistant_response,
+                "timestamp": datetime.now().isoformat()
+            })
+            
+            # Keep only recent history
+            if len(self.conversation_history) > self.max_history_length:
+                self.conversation_history = self.conversation_history[-self.max_history_length:]
     
     def _try_reconnect(self) -> bool:
         """Try to reconnect to backends."""
-        self.logger.info("Attempting to reconnect to LLM backends...")
-        
-        # Try Ollama first
-        if self._test_ollama_connection():
-            return True
-        
-        # Try LMStudio
-        if self._test_lmstudio_connection():
-            return True
-        
-        self.logger.error("Failed to connect to any LLM backend")
-        return False
+        # Only one caller probes; the rest wait and reuse its outcome
+        with self._reconnect_lock:
+            if self._get_active_backend() is not None:
+                return True
+            
+            self.logger.info("Attempting to reconnect to LLM backends...")
+            
+            # Try Ollama first
+            if self._test_ollama_connection():
+                return True
+            
+            # Try LMStudio
+            if self._test_lmstudio_connection():
+                return True
+            
+            self.logger.error("Failed to connect to any LLM backend")
+            return False
     
     def _fallback_response(self, prompt: str) -> str:
         """Generate fallback response when LLM is unavailable."""
-        fallback_responses = {
-            "greeting": "Hello! I'm having trouble connecting to my language model. How can I help you with basic tasks?",
-            "math": "I can help with basic calculations even without my language model.",
-            "time": "I can tell you the current time and date.",
-            "system": "I can provide system information.",
-            "default": "I'm sorry, I'm having trouble connecting to my language model right now. I can still help with basic tasks like math, time, and system information."
-        }
+        fallback_responses = self.FALLBACK_RESPONSES
         
         prompt_lower = prompt.lower()
         
@@ -416,19 +541,23 @@ class LLMBackend:
         else:
             return fallback_responses["default"]
     
+    def get_fixed_phrases(self) -> List[str]:
+        """Every fallback response text, for pre-synthesizing speech."""
+        return list(self.FALLBACK_RESPONSES.values())
+    
     def get_available_models(self) -> List[str]:
         """Get list of available models."""
         models = []
         
         try:
             if self.backend_status["ollama"]:
-                response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+                response = self.session.get(f"{self.ollama_url}/api/tags", timeout=self.probe_timeout)
                 if response.status_code == 200:
                     ollama_models = response.json().get("models", [])
                     models.extend([model["name"] for model in ollama_models])
             
             if self.backend_status["lmstudio"]:
-                response = requests.get(f"{self.lmstudio_url}/v1/models", timeout=5)
+                response = self.session.get(f"{self.lmstudio_url}/v1/models", timeout=self.probe_timeout)
                 if response.status_code == 200:
                     lmstudio_models = response.json().get("data", [])
                     models.extend([model["id"] for model in lmstudio_models])
@@ -457,11 +586,18 @@ class LLMBackend:
     
     def get_backend_status(self) -> Dict[str, Any]:
         """Get current backend status."""
+        with self._lock:
+            backend_status = dict(self.backend_status)
+            history_length = len(self.conversation_history)
+            in_flight = self._in_flight
+        
         return {
-            "backend_status": self.backend_status,
+            "backend_status": backend_status,
             "current_model": self.model,
             "available_models": self.get_available_models(),
-            "conversation_history_length": len(self.conversation_history),
+            "conversation_history_length": history_length,
+            "in_flight_generations": in_flight,
+            "max_concurrent_generations": self.max_concurrent_generations,
             "configuration": {
                 "temperature": self.temperature,
                 "max_tokens": self.max_tokens,
@@ -469,9 +605,28 @@ class LLMBackend:
             }
         }
     
+    def _apply_config(self, section: ConfigSection):
+        """Apply generation parameters from a reloaded llm config section."""
+        self.llm_config = section.to_dict()
+        self.set_generation_parameters(
+            temperature=section.get_float("temperature"),
+            max_tokens=section.get_int("max_tokens")
+        )
+        self.context_window = section.get_int("context_window", self.context_window)
+    
+    def close(self):
+        """Close pooled HTTP connections."""
+        self._unsubscribe_config()
+        
+        try:
+            self.session.close()
+        except Exception as e:
+            self.logger.error(f"Failed to close LLM session: {e}")
+    
     def clear_conversation_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        with self._lock:
+            self.conversation_history = []
         self.logger.info("Conversation history cleared")
     
     def set_generation_parameters(self, temperature: float = None, 
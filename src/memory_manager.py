@@ -3,26 +3,84 @@ Advanced Memory Management System
 Handles long-term conversation memory with vector embeddings and context-aware retrieval.
 """
 
+import hashlib
 import json
 import logging
 import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
 from  utils.config_loader import ConfigLoader
+from  utils.lazy_import import lazy_import
+
+chromadb = lazy_import("chromadb")
+chromadb_config = lazy_import("chromadb.config")
+sentence_transformers = lazy_import("sentence_transformers")
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of embeddings keyed by a hash of normalized text."""
+    
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max(0, max_size)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(text: str) -> str:
+        """Case- and whitespace-insensitive key for a text."""
+        normalized = " ".join(text.split()).casefold()
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+    
+    def put(self, key: str, embedding: List[float]):
+        if self.max_size == 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
 
 
 class MemoryManager:
     """Advanced memory management with vector embeddings and semantic search."""
     
     def __init__(self, config_path: str = "configs/config.json"):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.memory_config = self.config.get("memory", {})
         
         # Initialize logging
@@ -31,10 +89,13 @@ class MemoryManager:
         # Thread safety
         self._lock = threading.RLock()
         
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(
-            self.memory_config.get("embedding_model", "all-MiniLM-L6-v2")
-        )
+        # Embedding model is loaded on first encode (see embedding_model)
+        self.embedding_model_name = self.memory_config.get("embedding_model", "all-MiniLM-L6-v2")
+        self._embedding_model = None
+        self._model_lock = threading.Lock()
+        
+        # Embeddings shared by every encode site (queries and writes)
+        self.embedding_cache = EmbeddingCache(self.memory_config.get("embedding_cache_size", 1024))
         
         # Initialize ChromaDB
         self._init_database()
@@ -43,9 +104,46 @@ class MemoryManager:
         self.stats = {
             "total_memories": 0,
             "conversations": 0,
-            "last_cleanup": datetime.now()
+            "last_cleanup": datetime.now(),
+            "batches_written": 0
         }
         
+        # Write-behind queue: embeddings and inserts happen off the request path
+        self.write_behind = self.memory_config.get("write_behind", True)
+        self.write_batch_size = self.memory_config.get("write_batch_size", 16)
+        self.write_flush_interval = self.memory_config.get("write_flush_interval", 2.0)
+        self.encode_batch_size = self.memory_config.get("encode_batch_size", 32)
+        self.max_write_attempts = self.memory_config.get("max_write_attempts", 3)
+        
+        self._pending_writes = []
+        self._pending_condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._writer_stop = threading.Event()
+        self._writer_thread = None
+        
+        if self.write_behind:
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+    
+    @property
+    def embedding_model(self):
+        """SentenceTransformer, loaded on first use.
+        
+        Reads, exports and stats never need it, so tools that only touch the
+        database skip loading it.
+        """
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = sentence_transformers.SentenceTransformer(
+                        self.embedding_model_name
+                    )
+        return self._embedding_model
+    
+    def preload(self):
+        """Load the embedding model now instead of on the first query."""
+        self.embedding_model
+    
     def _init_database(self):
         """Initialize ChromaDB vector database."""
         try:
@@ -55,7 +153,7 @@ class MemoryManager:
             # Configure ChromaDB
             self.chroma_client = chromadb.PersistentClient(
                 path=str(db_path.parent),
-                settings=Settings(
+                settings=chromadb_config.Settings(
                     anonymized_telemetry=False,
                     allow_reset=True
                 )
@@ -85,82 +183,230 @@ class MemoryManager:
     
     def store_conversation(self, user_input: str, assistant_response: str, 
                           context: Dict[str, Any] = None) -> str:
-        """Store a conversation exchange in memory."""
-        with self._lock:
+        """Store a conversation exchange in memory (queued for a batched write)."""
+        try:
+            conversation_id = f"conv_{datetime.now().isoformat()}_{hash(user_input) % 10000}"
+            
+            # Prepare conversation data
+            conversation_text = f"User: {user_input}\nAssistant: {assistant_response}"
+            
+            metadata = {
+                "timestamp": datetime.now().isoformat(),
+                "user_input": user_input,
+                "assistant_response": assistant_response,
+                "context": json.dumps(context or {}),
+                "type": "conversation"
+            }
+            
+            self._enqueue_write("conversations", conversation_id, conversation_text, metadata)
+            
+            self.logger.debug(f"Queued conversation: {conversation_id}")
+            return conversation_id
+        
+        except Exception as e:
+            self.logger.error(f"Failed to store conversation: {e}")
+            return None
+    
+    def store_preference(self, preference_type: str, preference_data: Dict[str, Any]) -> str:
+        """Store user preference or learned behavior (queued for a batched write)."""
+        try:
+            preference_id = f"pref_{preference_type}_{datetime.now().isoformat()}"
+            
+            # Create searchable text from preference data
+            preference_text = f"{preference_type}: {json.dumps(preference_data)}"
+            
+            metadata = {
+                "timestamp": datetime.now().isoformat(),
+                "preference_type": preference_type,
+                "data": json.dumps(preference_data),
+                "type": "preference"
+            }
+            
+            self._enqueue_write("preferences", preference_id, preference_text, metadata)
+            
+            self.logger.debug(f"Queued preference: {preference_id}")
+            return preference_id
+        
+        except Exception as e:
+            self.logger.error(f"Failed to store preference: {e}")
+            return None
+    
+    def _enqueue_write(self, collection: str, item_id: str, document: str,
+                       metadata: Dict[str, Any]):
+        """Queue a document for the next batched write."""
+        with self._pending_condition:
+            self._pending_writes.append({
+                "collection": collection,
+                "id": item_id,
+                "document": document,
+                "metadata": metadata
+            })
+            
+            if len(self._pending_writes) >= self.write_batch_size:
+                self._pending_condition.notify()
+        
+        # Without the background writer, write through immediately
+        if not self.write_behind:
+            self.flush()
+    
+    def _writer_loop(self):
+        """Background writer: flush on batch size or interval."""
+        while not self._writer_stop.is_set():
+            with self._pending_condition:
+                if len(self._pending_writes) < self.write_batch_size:
+                    self._pending_condition.wait(timeout=self.write_flush_interval)
+            
+            self.flush()
+            
+            # Give a failing database a moment before retrying requeued items
+            if self._has_retries():
+                self._writer_stop.wait(self.write_flush_interval)
+    
+    def flush(self) -> int:
+        """Write all queued documents now; returns the number written."""
+        with self._flush_lock:
+            with self._pending_condition:
+                batch, self._pending_writes = self._pending_writes, []
+            
+            if not batch:
+                return 0
+            
+            # The same id twice fails the whole add, so the last write of an id wins
+            batch = list({(item["collection"], item["id"]): item for item in batch}.values())
+            
             try:
-                conversation_id = f"conv_{datetime.now().isoformat()}_{hash(user_input) % 10000}"
-                
-                # Prepare conversation data
-                conversation_text = f"User: {user_input}\nAssistant: {assistant_response}"
+                # One forward pass for the whole batch (cache misses only)
+                embeddings = self._embed([item["document"] for item in batch])
+                self._write_items(batch, embeddings)
                 
-                metadata = {
-                    "timestamp": datetime.now().isoformat(),
-                    "user_input": user_input,
-                    "assistant_response": assistant_response,
-                    "context": json.dumps(context or {}),
-                    "type": "conversation"
-                }
-                
-                # Generate embedding
-                embedding = self.embedding_model.encode(conversation_text).tolist()
-                
-                # Store in ChromaDB
-                self.conversations_collection.add(
-                    embeddings=[embedding],
-                    documents=[conversation_text],
-                    metadatas=[metadata],
-                    ids=[conversation_id]
-                )
-                
-                self.stats["total_memories"] += 1
-                self.stats["conversations"] += 1
-                
-                self.logger.debug(f"Stored conversation: {conversation_id}")
-                return conversation_id
+                self.logger.debug(f"Flushed {len(batch)} memories")
+                return len(batch)
                 
             except Exception as e:
-                self.logger.error(f"Failed to store conversation: {e}")
-                return None
+                self.logger.warning(f"Batched write of {len(batch)} memories failed, writing one at a time: {e}")
+                return self._write_individually(batch)
     
-    def store_preference(self, preference_type: str, preference_data: Dict[str, Any]) -> str:
-        """Store user preference or learned behavior."""
+    def _write_items(self, items: List[Dict[str, Any]], embeddings: List[List[float]],
+                     upsert: bool = False):
+        """Insert queued items with their embeddings, one call per collection."""
+        grouped = {}
+        for item, embedding in zip(items, embeddings):
+            grouped.setdefault(item["collection"], []).append((item, embedding))
+        
         with self._lock:
-            try:
-                preference_id = f"pref_{preference_type}_{datetime.now().isoformat()}"
-                
-                # Create searchable text from preference data
-                preference_text = f"{preference_type}: {json.dumps(preference_data)}"
-                
-                metadata = {
-                    "timestamp": datetime.now().isoformat(),
-                    "preference_type": preference_type,
-                    "data": json.dumps(preference_data),
-                    "type": "preference"
-                }
-                
-                # Generate embedding
-                embedding = self.embedding_model.encode(preference_text).tolist()
-                
-                # Store in ChromaDB
-                self.preferences_collection.add(
-                    embeddings=[embedding],
-                    documents=[preference_text],
-                    metadatas=[metadata],
-                    ids=[preference_id]
+            for collection_name, entries in grouped.items():
+                collection = self._get_collection(collection_name)
+                # upsert makes a retry safe if part of a failed batch was written
+                write = collection.upsert if upsert else collection.add
+                write(
+                    embeddings=[embedding for _, embedding in entries],
+                    documents=[item["document"] for item, _ in entries],
+                    metadatas=[item["metadata"] for item, _ in entries],
+                    ids=[item["id"] for item, _ in entries]
                 )
-                
-                self.logger.debug(f"Stored preference: {preference_id}")
-                return preference_id
-                
+            
+            conversation_count = len(grouped.get("conversations", []))
+            self.stats["total_memories"] += conversation_count
+            self.stats["conversations"] += conversation_count
+            self.stats["batches_written"] += 1
+    
+    def _write_individually(self, batch: List[Dict[str, Any]]) -> int:
+        """Write items one by one after a failed batch.
+        
+        Items that still fail go back on the queue, and are only dropped
+        after max_write_attempts failed writes.
+        """
+        written = 0
+        retry = []
+        
+        for item in batch:
+            try:
+                self._write_items([item], self._embed([item["document"]]), upsert=True)
+                written += 1
             except Exception as e:
-                self.logger.error(f"Failed to store preference: {e}")
-                return None
+                item["attempts"] = item.get("attempts", 0) + 1
+                if item["attempts"] < self.max_write_attempts:
+                    retry.append(item)
+                else:
+                    self.logger.error(f"Dropping memory {item['id']} after {item['attempts']} failed writes: {e}")
+        
+        if retry:
+            with self._pending_condition:
+                self._pending_writes[:0] = retry
+            self.logger.warning(f"Requeued {len(retry)} memories for another write attempt")
+        
+        return written
+    
+    def _has_retries(self) -> bool:
+        with self._pending_condition:
+            return any("attempts" in item for item in self._pending_writes)
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, serving repeats from the LRU cache.
+        
+        Misses are de-duplicated and encoded in a single batched call.
+        """
+        keys = [EmbeddingCache.make_key(text) for text in texts]
+        embeddings = [self.embedding_cache.get(key) for key in keys]
+        
+        missing = {}
+        for index, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(keys[index], texts[index])
+        
+        if missing:
+            encoded = self.embedding_model.encode(
+                list(missing.values()),
+                batch_size=self.encode_batch_size
+            ).tolist()
+            
+            fresh = dict(zip(missing.keys(), encoded))
+            for key, embedding in fresh.items():
+                self.embedding_cache.put(key, embedding)
+            
+            embeddings = [
+                embedding if embedding is not None else fresh[key]
+                for key, embedding in zip(keys, embeddings)
+            ]
+        
+        return embeddings
+    
+    def _get_collection(self, name: str):
+        """Map a collection name to its ChromaDB collection."""
+        return {
+            "conversations": self.conversations_collection,
+            "preferences": self.preferences_collection,
+            "context": self.context_collection
+        }[name]
+    
+    def shutdown(self):
+        """Stop the background writer and flush anything still queued."""
+        self._writer_stop.set()
+        
+        with self._pending_condition:
+            self._pending_condition.notify_all()
+        
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=5.0)
+        
+        # Requeued items get their remaining attempts before exit
+        for _ in range(self.max_write_attempts):
+            self.flush()
+            with self._pending_condition:
+                if not self._pending_writes:
+                    break
     
     def retrieve_similar_conversations(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Retrieve conversations similar to the query."""
+        """Retrieve conversations similar to the query.
+        
+        Queued writes are flushed first, so an exchange stored just before
+        is already searchable.
+        """
         try:
+            self.flush()
+            
             # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            query_embedding = self._embed([query])[0]
             
             # Search similar conversations
             results = self.conversations_collection.query(
@@ -197,8 +443,10 @@ class MemoryManager:
             return []
     
     def retrieve_preferences(self, preference_type: str = None) -> List[Dict[str, Any]]:
-        """Retrieve user preferences, optionally filtered by type."""
+        """Retrieve user preferences, optionally filtered by type (flushing queued writes first)."""
         try:
+            self.flush()
+            
             # Query all preferences or filter by type
             if preference_type:
                 # Use metadata filtering
@@ -302,9 +550,15 @@ class MemoryManager:
             conv_count = self.conversations_collection.count()
             pref_count = self.preferences_collection.count()
             
+            with self._pending_condition:
+                pending_writes = len(self._pending_writes)
+            
             self.stats.update({
                 "total_conversations": conv_count,
                 "total_preferences": pref_count,
+                "pending_writes": pending_writes,
+                "embedding_cache": self.embedding_cache.get_stats(),
+                "embedding_model_loaded": self._embedding_model is not None,
                 "database_size": self._get_database_size()
             })
             
@@ -336,6 +590,8 @@ class MemoryManager:
     def export_memories(self, output_path: str) -> bool:
         """Export memories to JSON file for backup."""
         try:
+            self.flush()
+            
             # Get all conversations and preferences
             conversations = self.conversations_collection.get(include=["documents", "metadatas"])
             preferences = self.preferences_collection.get(include=["documents", "metadatas"])
@@ -369,6 +625,9 @@ class MemoryManager:
             self.logger.warning("Memory reset requires confirmation")
             return False
         
+        with self._pending_condition:
+            self._pending_writes = []
+        
         with self._lock:
             try:
                 # Delete all collections
@@ -383,7 +642,8 @@ class MemoryManager:
                 self.stats = {
                     "total_memories": 0,
                     "conversations": 0,
-                    "last_cleanup": datetime.now()
+                    "last_cleanup": datetime.now(),
+                    "batches_written": 0
                 }
                 
                 self.logger.info("Memory system reset successfully")
@@ -5,13 +5,19 @@ File operations plugin for safe file management.
 
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from utils.file_listing import DirectoryLister
 
 
 class FilePlugin:
     """File operations plugin with safety checks."""
     
+    # Lines of a file spoken back as its summary
+    SUMMARY_LINES = 5
+    
     def __init__(self, computer_controller=None):
         self.logger = logging.getLogger(__name__)
         self.computer_controller = computer_controller
@@ -81,17 +87,15 @@ class FilePlugin:
                     "response": f"Directory {directory} does not exist."
                 }
             
-            # List files
-            files = []
-            for item in directory.iterdir():
-                if item.is_file():
-                    files.append(item.name)
+            # List files (only the first page is sorted and built)
+            listing = DirectoryLister.shared().list_entries(str(directory), kind="file", limit=10)
+            files = [item["name"] for item in listing["items"]]
             
             if files:
-                file_list = ", ".join(files[:10])  # Show first 10 files
+                file_list = ", ".join(files)
                 response = f"Files in {directory.name}: {file_list}"
-                if len(files) > 10:
-                    response += f" and {len(files) - 10} more files"
+                if listing["total"] > len(files):
+                    response += f" and {listing['total'] - len(files)} more files"
             else:
                 response = f"No files found in {directory.name}"
             
@@ -99,6 +103,7 @@ class FilePlugin:
                 "success": True,
                 "response": response,
                 "files": files,
+                "file_count": listing["total"],
                 "directory": str(directory)
             }
             
@@ -130,12 +135,72 @@ class FilePlugin:
                 "response": "File reading requires computer use permissions."
             }
         
-        # This would use the computer controller for safe file reading
+        path = self._find_file(text)
+        if not path:
+            return {
+                "success": False,
+                "response": "Which file would you like me to read?"
+            }
+        
+        # Only the lines being summarized are read, however large the file is
+        text_lower = text.lower()
+        if re.search(r"\b(last|end|tail|latest)\b", text_lower):
+            result = self.computer_controller.read_file(str(path), tail_lines=self.SUMMARY_LINES)
+            where = "Last"
+        else:
+            result = self.computer_controller.read_file(str(path), head_lines=self.SUMMARY_LINES)
+            where = "First"
+        
+        if not result.get("success"):
+            return {
+                "success": False,
+                "response": f"I couldn't read {path.name}: {result.get('error', 'unknown error')}"
+            }
+        
+        size = self._format_size(result["file_size"])
+        if result["binary"]:
+            response = f"{path.name} is a binary file ({size}), so I can't read it out."
+        elif not result["content"].strip():
+            response = f"{path.name} is empty."
+        else:
+            lines = result["content"].strip().splitlines()
+            response = f"{path.name} ({size}). {where} lines: " + " / ".join(lines)
+        
         return {
-            "success": False,
-            "response": "File reading is not yet implemented in this plugin."
+            "success": True,
+            "response": response,
+            "path": result["path"],
+            "file_size": result["file_size"],
+            "binary": result["binary"],
+            "content": result["content"]
         }
     
+    def _find_file(self, text: str) -> Optional[Path]:
+        """Find the file a request refers to, looking in the safe directories."""
+        match = re.search(r"([\/~]?[\w\-\.\/]+\.\w+)", text)
+        if not match:
+            return None
+        
+        path = Path(match.group(1)).expanduser()
+        if path.is_absolute():
+            return path
+        
+        # Prefer a directory named in the request, then any safe directory, then cwd
+        text_lower = text.lower()
+        directories = sorted(self.safe_directories, key=lambda d: d.name.lower() not in text_lower)
+        for directory in directories + [Path.cwd()]:
+            if (directory / path).is_file():
+                return directory / path
+        
+        return Path.cwd() / path
+    
+    @staticmethod
+    def _format_size(size: int) -> str:
+        for unit in ("bytes", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+            size /= 1024
+    
     def _write_file(self, text: str) -> Dict[str, Any]:
         """Write to a file."""
         if not self.computer_controller:
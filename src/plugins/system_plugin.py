@@ -9,12 +9,17 @@ import psutil
 from datetime import datetime
 from typing import Dict, Any
 
+from utils.system_metrics import SystemMetricsSampler
+
 
 class SystemPlugin:
     """System information and monitoring plugin."""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        
+        # CPU usage is sampled in the background instead of blocking for a second
+        self.metrics = SystemMetricsSampler.shared()
     
     def can_handle(self, text: str) -> bool:
         """Check if this plugin can handle the given text."""
@@ -82,9 +87,10 @@ class SystemPlugin:
     def _get_cpu_info(self) -> Dict[str, Any]:
         """Get CPU usage information."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            cpu_freq = psutil.cpu_freq()
+            metrics = self.metrics.get_snapshot()
+            cpu_percent = metrics["cpu_percent"]
+            cpu_count = metrics["cpu_count"]
+            cpu_freq = metrics["cpu_freq"]
             
             response = (
                 f"CPU usage: {cpu_percent}% "
@@ -135,19 +141,11 @@ class SystemPlugin:
     def _get_process_info(self) -> Dict[str, Any]:
         """Get running process information."""
         try:
-            process_count = len(psutil.pids())
+            metrics = self.metrics.get_snapshot()
+            process_count = metrics["process_count"]
             
             # Get top 5 processes by CPU usage
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-                try:
-                    processes.append(proc.info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Sort by CPU usage
-            processes.sort(key=lambda x: x.get('cpu_percent', 0), reverse=True)
-            top_processes = processes[:5]
+            top_processes = self.metrics.processes.top(5)
             
             response = f"Running processes: {process_count}. "
             if top_processes:
@@ -216,12 +214,13 @@ class SystemPlugin:
             }
             
             # Resource usage
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
-            disk = psutil.disk_usage('/')
+            metrics = self.metrics.get_snapshot()
+            memory = metrics["memory"]
+            cpu_percent = metrics["cpu_percent"]
+            disk = metrics["disk"]
             
             # Boot time
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            boot_time = datetime.fromtimestamp(metrics["boot_time"])
             uptime = datetime.now() - boot_time
             
             response = (
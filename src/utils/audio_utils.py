@@ -5,31 +5,384 @@ Audio processing utilities.
 
 import numpy as np
 import logging
-from typing import Tuple, Optional
+from functools import lru_cache
+from math import gcd
+from typing import Tuple, Optional, Dict, Any
 import threading
 import time
 
 
+class AudioRingBuffer:
+    """Preallocated float32 ring buffer for streaming audio samples."""
+    
+    def __init__(self, capacity: int, dtype=np.float32):
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest data once full (O(1) per sample)."""
+        samples = np.asarray(samples, dtype=self._data.dtype).ravel()
+        count = len(samples)
+        if count == 0:
+            return
+        
+        # Only the newest `capacity` samples can survive the write
+        if count >= self.capacity:
+            self._data[:] = samples[-self.capacity:]
+            self._write_pos = 0
+            self._size = self.capacity
+            return
+        
+        first = min(count, self.capacity - self._write_pos)
+        self._data[self._write_pos:self._write_pos + first] = samples[:first]
+        if first < count:
+            self._data[:count - first] = samples[first:]
+        
+        self._write_pos = (self._write_pos + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+    
+    def read(self, num_samples: Optional[int] = None, copy: bool = True) -> np.ndarray:
+        """Return the most recent samples in chronological order.
+        
+        With copy=False a contiguous region is returned as a zero-copy view,
+        which is only valid until the next write. A region that wraps around
+        the end of the buffer is always assembled with a single copy.
+        """
+        if num_samples is None or num_samples > self._size:
+            num_samples = self._size
+        if num_samples <= 0:
+            return np.zeros(0, dtype=self._data.dtype)
+        
+        start = (self._write_pos - num_samples) % self.capacity
+        end = start + num_samples
+        
+        if end <= self.capacity:
+            region = self._data[start:end]
+            return region.copy() if copy else region
+        
+        return np.concatenate((self._data[start:], self._data[:end - self.capacity]))
+    
+    def clear(self):
+        """Drop all buffered samples without reallocating."""
+        self._write_pos = 0
+        self._size = 0
+
+
+class AudioChunk:
+    """Raw int16 PCM chunk with a lazily computed float32 view.
+    
+    The capture path hands the original bytes to the recognizer untouched;
+    the normalized float samples are only materialized (once) when a
+    consumer such as the visualizer or AudioProcessor asks for them.
+    """
+    
+    __slots__ = ("pcm", "_pcm16", "_samples")
+    
+    def __init__(self, pcm: bytes):
+        self.pcm = pcm
+        self._pcm16 = None
+        self._samples = None
+    
+    def __len__(self) -> int:
+        return len(self.pcm) // 2
+    
+    @property
+    def pcm16(self) -> np.ndarray:
+        """Zero-copy int16 view over the raw bytes."""
+        if self._pcm16 is None:
+            self._pcm16 = np.frombuffer(self.pcm, dtype=np.int16)
+        return self._pcm16
+    
+    @property
+    def samples(self) -> np.ndarray:
+        """Float32 samples in [-1, 1), converted on first access."""
+        if self._samples is None:
+            samples = self.pcm16.astype(np.float32)
+            samples *= 1.0 / 32768.0
+            self._samples = samples
+        return self._samples
+
+
+class VoiceActivityDetector:
+    """Frame-based energy VAD with an adaptive noise floor.
+    
+    Each chunk is split into fixed 10-30 ms frames whose energies are computed
+    in a single vectorized pass. Speech starts once a frame is onset_db above
+    the tracked noise floor and continues while frames stay offset_db above it
+    (hysteresis), plus a hangover counted in samples rather than wall-clock
+    time. Samples that don't fill a whole frame are carried to the next chunk.
+    """
+    
+    def __init__(self, sample_rate: int = 16000, frame_ms: float = 20,
+                 onset_db: float = 9.0, offset_db: float = 4.0,
+                 hangover_ms: float = 300, floor_rise: float = 0.02,
+                 floor_fall: float = 0.3, min_energy_db: float = -60.0):
+        frame_ms = min(max(frame_ms, 10), 30)
+        
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.onset_db = onset_db
+        self.offset_db = min(offset_db, onset_db)
+        self.hangover_frames = int(np.ceil(hangover_ms * sample_rate / 1000 / self.frame_length))
+        self.floor_rise = floor_rise
+        self.floor_fall = floor_fall
+        self.min_energy_db = min_energy_db
+        
+        self.reset()
+    
+    def reset(self):
+        """Forget the noise floor and any speech state."""
+        self.noise_floor_db = None
+        self._in_speech = False
+        self._hangover = 0
+        self._carry = np.zeros(0, dtype=np.float32)
+        self.frames_processed = 0
+        self.speech_frames = 0
+    
+    @property
+    def in_speech(self) -> bool:
+        """Speech state after the most recent frame."""
+        return self._in_speech
+    
+    def process(self, audio_data: np.ndarray) -> np.ndarray:
+        """Return one boolean speech decision per complete frame in the chunk."""
+        samples = np.asarray(audio_data)
+        if samples.dtype.kind in "iu":
+            samples = samples.astype(np.float32) * (1.0 / 32768.0)
+        elif samples.dtype != np.float32:
+            samples = samples.astype(np.float32)
+        
+        if len(self._carry):
+            samples = np.concatenate((self._carry, samples))
+        
+        frame_count = len(samples) // self.frame_length
+        used = frame_count * self.frame_length
+        self._carry = samples[used:].copy()
+        
+        if frame_count == 0:
+            return np.zeros(0, dtype=bool)
+        
+        # Per-frame mean power in dBFS, one pass over the chunk
+        frames = samples[:used].reshape(frame_count, self.frame_length)
+        energy = np.einsum("ij,ij->i", frames, frames) / self.frame_length
+        energy_db = 10.0 * np.log10(energy + 1e-10)
+        
+        # The hysteresis state machine is inherently sequential, but only
+        # runs over a handful of frames per chunk
+        decisions = np.empty(frame_count, dtype=bool)
+        floor = self.noise_floor_db
+        in_speech = self._in_speech
+        hangover = self._hangover
+        
+        for i, level in enumerate(energy_db.tolist()):
+            if floor is None:
+                floor = level
+            
+            above = level - floor
+            if in_speech:
+                if above >= self.offset_db:
+                    hangover = self.hangover_frames
+                elif hangover > 0:
+                    hangover -= 1
+                else:
+                    in_speech = False
+            elif above >= self.onset_db and level >= self.min_energy_db:
+                in_speech = True
+                hangover = self.hangover_frames
+            
+            # Floor drops quickly to quieter frames and creeps up slowly,
+            # much more slowly while speech is present
+            if level < floor:
+                floor += self.floor_fall * (level - floor)
+            else:
+                rise = self.floor_rise * 0.1 if in_speech else self.floor_rise
+                floor += rise * (level - floor)
+            
+            decisions[i] = in_speech
+        
+        self.noise_floor_db = floor
+        self._in_speech = in_speech
+        self._hangover = hangover
+        self.frames_processed += frame_count
+        self.speech_frames += int(np.count_nonzero(decisions))
+        
+        return decisions
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector state and counters."""
+        return {
+            "frame_length": self.frame_length,
+            "noise_floor_db": self.noise_floor_db,
+            "in_speech": self._in_speech,
+            "frames_processed": self.frames_processed,
+            "speech_frames": self.speech_frames
+        }
+
+
+class SyllableDetector:
+    """Streaming syllable detector that keeps envelope state across chunks.
+    
+    Uses a causal moving average of signal power as the envelope, an
+    exponentially averaged envelope mean for the peak threshold, and carries
+    the last accepted peak so the minimum spacing holds across chunk borders.
+    """
+    
+    def __init__(self, sample_rate: int = 16000, window: int = 100,
+                 min_distance_ms: float = 100, threshold_ratio: float = 1.5,
+                 mean_time_constant: float = 2.0):
+        self.sample_rate = sample_rate
+        self.window = window
+        self.min_distance = int(sample_rate * min_distance_ms / 1000)
+        self.threshold_ratio = threshold_ratio
+        self.mean_time_constant = mean_time_constant
+        
+        self.reset()
+    
+    def reset(self):
+        """Clear all carried state."""
+        self._power_tail = np.zeros(0)
+        self._envelope_tail = np.zeros(0)
+        self._mean_envelope = None
+        self._last_peak = None
+        self.samples_seen = 0
+        self.syllable_count = 0
+    
+    def process(self, audio_data: np.ndarray) -> np.ndarray:
+        """Return absolute sample positions of syllables found in this chunk."""
+        power = np.asarray(audio_data, dtype=np.float64) ** 2
+        count = len(power)
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        # Causal moving average over the carried tail plus this chunk
+        extended = np.concatenate((self._power_tail, power))
+        cumulative = np.concatenate(([0.0], np.cumsum(extended)))
+        ends = np.arange(len(self._power_tail) + 1, len(extended) + 1)
+        starts = np.maximum(ends - self.window, 0)
+        envelope = (cumulative[ends] - cumulative[starts]) / self.window
+        self._power_tail = extended[-(self.window - 1):]
+        
+        # Running envelope mean stands in for the whole-buffer mean
+        chunk_mean = float(np.mean(envelope))
+        if self._mean_envelope is None:
+            self._mean_envelope = chunk_mean
+        else:
+            alpha = 1.0 - np.exp(-count / (self.mean_time_constant * self.sample_rate))
+            self._mean_envelope += alpha * (chunk_mean - self._mean_envelope)
+        threshold = self._mean_envelope * self.threshold_ratio
+        
+        # Prepend the last envelope values so border samples can be peaks
+        tail_length = len(self._envelope_tail)
+        joined = np.concatenate((self._envelope_tail, envelope))
+        self._envelope_tail = joined[-2:]
+        peaks = _find_peaks(joined, threshold) + (self.samples_seen - tail_length)
+        self.samples_seen += count
+        
+        if self._last_peak is not None:
+            peaks = peaks[peaks > self._last_peak + self.min_distance]
+        
+        peaks = _enforce_min_distance(peaks, self.min_distance)
+        if len(peaks):
+            self._last_peak = int(peaks[-1])
+            self.syllable_count += len(peaks)
+        
+        return peaks
+
+
+
+class VoicedSyllableTracker:
+    """Syllable onsets counted only while voice activity is detected.
+    
+    Both detectors see every chunk so their state stays continuous, but
+    syllables found outside speech are dropped, so background noise
+    doesn't pulse the visualizers.
+    """
+    
+    def __init__(self, sample_rate: int = 16000, vad_config: Optional[Dict[str, Any]] = None):
+        self.vad = VoiceActivityDetector(sample_rate, **(vad_config or {}))
+        self.syllable_detector = SyllableDetector(sample_rate)
+        self.voice_active = False
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "VoicedSyllableTracker":
+        """Build from the full app config, using its audio sample rate and VAD settings."""
+        audio_config = config.get("audio", {})
+        return cls(audio_config.get("sample_rate", 16000), audio_config.get("vad"))
+    
+    def process(self, audio_data: np.ndarray) -> int:
+        """Number of voiced syllables in the chunk."""
+        self.voice_active = bool(self.vad.process(audio_data).any()) or self.vad.in_speech
+        syllables = self.syllable_detector.process(audio_data)
+        return len(syllables) if self.voice_active else 0
+
+def _moving_average(signal: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average via cumulative sums (matches np.convolve 'same')."""
+    count = len(signal)
+    cumulative = np.concatenate(([0.0], np.cumsum(signal)))
+    index = np.arange(count)
+    ends = np.minimum(index + (window - 1) // 2 + 1, count)
+    starts = np.maximum(index - window // 2, 0)
+    return (cumulative[ends] - cumulative[starts]) / window
+
+
+def _find_peaks(signal: np.ndarray, threshold: float) -> np.ndarray:
+    """Indices of strict local maxima above threshold (endpoints excluded)."""
+    if len(signal) < 3:
+        return np.zeros(0, dtype=np.int64)
+    
+    middle = signal[1:-1]
+    mask = (middle > signal[:-2]) & (middle > signal[2:]) & (middle > threshold)
+    return np.flatnonzero(mask) + 1
+
+
+def _enforce_min_distance(peaks: np.ndarray, min_distance: int) -> np.ndarray:
+    """Greedily keep peaks more than min_distance after the previously kept one.
+    
+    Each peak's successor is the first peak beyond its exclusion zone, so the
+    kept set is the successor chain starting at the first peak. The chain is
+    expanded by pointer doubling, giving O(log n) vectorized steps.
+    """
+    count = len(peaks)
+    if count <= 1:
+        return peaks
+    
+    # Index `count` is a sentinel that points to itself
+    successor = np.append(np.searchsorted(peaks, peaks + min_distance, side="right"), count)
+    
+    chain = np.zeros(1, dtype=np.int64)
+    jump = successor
+    while jump[0] != count:
+        chain = np.union1d(chain, jump[chain])
+        jump = jump[jump]
+    
+    return peaks[chain[chain < count]]
+
+
 class AudioProcessor:
     """Audio processing utilities for voice assistant."""
     
-    def __init__(self):
+    def __init__(self, sample_rate: int = 16000, chunk_size: int = 1024,
+                 vad_config: Optional[Dict[str, Any]] = None):
         self.logger = logging.getLogger(__name__)
         self._lock = threading.RLock()
         
         # Audio parameters
-        self.sample_rate = 16000
-        self.chunk_size = 1024
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
         self.channels = 1
         
         # Voice activity detection
-        self.energy_threshold = 300
-        self.silence_timeout = 3.0
+        self.vad = VoiceActivityDetector(sample_rate, **(vad_config or {}))
         self.last_speech_time = 0
         
         # Audio buffers
-        self.audio_buffer = []
-        self.max_buffer_size = 16000 * 10  # 10 seconds
+        self.max_buffer_size = sample_rate * 10  # 10 seconds
+        self.audio_buffer = AudioRingBuffer(self.max_buffer_size)
     
     def calculate_energy(self, audio_data: np.ndarray) -> float:
         """Calculate audio energy (RMS)."""
@@ -48,15 +401,14 @@ class AudioProcessor:
     def detect_voice_activity(self, audio_data: np.ndarray) -> bool:
         """Detect voice activity in audio data."""
         try:
-            energy = self.calculate_energy(audio_data)
+            decisions = self.vad.process(audio_data)
             
-            if energy > self.energy_threshold:
+            # Chunks shorter than a frame keep the current state
+            active = bool(decisions.any()) if len(decisions) else self.vad.in_speech
+            if active:
                 self.last_speech_time = time.time()
-                return True
             
-            # Check if we're still in speech based on timeout
-            time_since_speech = time.time() - self.last_speech_time
-            return time_since_speech < self.silence_timeout
+            return active
             
         except Exception as e:
             self.logger.error(f"Voice activity detection failed: {e}")
@@ -106,31 +458,16 @@ class AudioProcessor:
             if len(audio_data) == 0:
                 return 0
             
-            # Simple syllable detection based on energy peaks
-            energy = self.calculate_energy(audio_data)
-            
-            # Smooth the energy signal
-            smoothed = np.convolve(audio_data ** 2, np.ones(100) / 100, mode='same')
+            # Smooth the energy signal (centered 100-sample moving average)
+            smoothed = _moving_average(np.asarray(audio_data, dtype=np.float64) ** 2, 100)
             
             # Find peaks
-            peaks = []
             threshold = np.mean(smoothed) * 1.5
-            
-            for i in range(1, len(smoothed) - 1):
-                if (smoothed[i] > smoothed[i-1] and 
-                    smoothed[i] > smoothed[i+1] and 
-                    smoothed[i] > threshold):
-                    peaks.append(i)
+            peaks = _find_peaks(smoothed, threshold)
             
             # Filter peaks that are too close together
-            filtered_peaks = []
             min_distance = self.sample_rate // 10  # 100ms minimum
-            
-            for peak in peaks:
-                if not filtered_peaks or peak - filtered_peaks[-1] > min_distance:
-                    filtered_peaks.append(peak)
-            
-            return len(filtered_peaks)
+            return len(_enforce_min_distance(peaks, min_distance))
             
         except Exception as e:
             self.logger.error(f"Syllable detection failed: {e}")
@@ -140,13 +477,7 @@ class AudioProcessor:
         """Add audio data to buffer."""
         with self._lock:
             try:
-                self.audio_buffer.extend(audio_data.tolist())
-                
-                # Keep buffer size manageable
-                if len(self.audio_buffer) > self.max_buffer_size:
-                    excess = len(self.audio_buffer) - self.max_buffer_size
-                    self.audio_buffer = self.audio_buffer[excess:]
-                    
+                self.audio_buffer.write(audio_data)
             except Exception as e:
                 self.logger.error(f"Buffer update failed: {e}")
     
@@ -155,63 +486,159 @@ class AudioProcessor:
         with self._lock:
             try:
                 samples_needed = int(duration_seconds * self.sample_rate)
-                
-                if len(self.audio_buffer) >= samples_needed:
-                    return np.array(self.audio_buffer[-samples_needed:])
-                else:
-                    return np.array(self.audio_buffer)
+                return self.audio_buffer.read(samples_needed)
                     
             except Exception as e:
                 self.logger.error(f"Buffer retrieval failed: {e}")
-                return np.array([])
+                return np.zeros(0, dtype=np.float32)
     
     def clear_buffer(self):
         """Clear audio buffer."""
         with self._lock:
-            self.audio_buffer = []
+            self.audio_buffer.clear()
     
-    def set_energy_threshold(self, threshold: float):
-        """Set voice activity detection threshold."""
-        self.energy_threshold = max(0, threshold)
-        self.logger.info(f"Energy threshold set to: {self.energy_threshold}")
+    def set_vad_sensitivity(self, onset_db: float, offset_db: Optional[float] = None,
+                            hangover_ms: Optional[float] = None):
+        """Set how far above the noise floor (dB) speech must rise."""
+        self.vad.onset_db = max(0.0, onset_db)
+        if offset_db is not None:
+            self.vad.offset_db = min(max(0.0, offset_db), self.vad.onset_db)
+        if hangover_ms is not None:
+            self.vad.hangover_frames = int(np.ceil(
+                max(0.0, hangover_ms) * self.vad.sample_rate / 1000 / self.vad.frame_length
+            ))
+        self.logger.info(f"VAD onset set to: {self.vad.onset_db} dB")
     
     def get_audio_stats(self) -> dict:
         """Get audio processing statistics."""
         with self._lock:
-            buffer_duration = len(self.audio_buffer) / self.sample_rate if self.audio_buffer else 0
+            buffer_duration = len(self.audio_buffer) / self.sample_rate
             
             return {
                 "sample_rate": self.sample_rate,
                 "chunk_size": self.chunk_size,
                 "channels": self.channels,
-                "energy_threshold": self.energy_threshold,
+                "vad": self.vad.get_stats(),
                 "buffer_size": len(self.audio_buffer),
                 "buffer_duration": buffer_duration,
+                "buffer_capacity": self.audio_buffer.capacity,
                 "last_speech_time": self.last_speech_time
             }
 
 
+@lru_cache(maxsize=16)
+def _polyphase_filter_bank(up: int, down: int, taps_per_phase: int) -> np.ndarray:
+    """Design (once per rate ratio) the polyphase bank of a Kaiser-windowed sinc.
+    
+    Row p holds the taps applied for output phase p; the bank is shared
+    between resamplers, so it is returned read-only.
+    """
+    # Odd length keeps the group delay at a whole number of upsampled samples
+    length = up * taps_per_phase - 1
+    cutoff = 0.5 / max(up, down) * 0.95  # cycles per upsampled sample, a little below Nyquist
+    
+    n = np.arange(length) - (length - 1) / 2.0
+    prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.kaiser(length, 8.0)
+    prototype *= up / np.sum(prototype)  # unity DC gain after zero-stuffing
+    prototype = np.append(prototype, 0.0)
+    
+    bank = prototype.reshape(taps_per_phase, up).T.astype(np.float32)
+    bank.flags.writeable = False
+    return bank
+
+
+class StreamingResampler:
+    """Polyphase rational resampler that carries filter state across chunks.
+    
+    The filter bank for a (source_rate, target_rate) pair is designed once and
+    cached, so creating resamplers (e.g. on device changes) costs nothing
+    after the first. Output is delayed by about taps_per_phase / 2 input
+    samples unless compensate_delay is set, in which case the first
+    outputs are skipped so output time lines up with input time.
+    """
+    
+    def __init__(self, source_rate: int, target_rate: int, taps_per_phase: int = 32,
+                 compensate_delay: bool = False):
+        divisor = gcd(int(source_rate), int(target_rate))
+        self.source_rate = int(source_rate)
+        self.target_rate = int(target_rate)
+        self.up = self.target_rate // divisor
+        self.down = self.source_rate // divisor
+        self.taps_per_phase = taps_per_phase
+        self.compensate_delay = compensate_delay
+        self.bank = _polyphase_filter_bank(self.up, self.down, taps_per_phase)
+        self._tap_offsets = np.arange(taps_per_phase)
+        
+        # Group delay in upsampled samples
+        self._delay = (self.up * taps_per_phase - 2) // 2
+        
+        self.reset()
+    
+    def reset(self):
+        """Clear filter history and phase."""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        # Upsampled index of the next output, relative to the chunk start
+        self._next_time = self._delay if self.compensate_delay else 0
+    
+    @property
+    def delay(self) -> float:
+        """Filter group delay in output samples (0 when compensated)."""
+        return 0.0 if self.compensate_delay else self._delay / self.down
+    
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample one chunk; call repeatedly for a continuous stream."""
+        samples = np.asarray(samples, dtype=np.float32)
+        count = len(samples)
+        
+        if self.up == self.down:
+            return samples
+        
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        history_length = len(self._history)
+        buffer = np.concatenate((self._history, samples))
+        
+        # Every output whose newest input sample lies inside this chunk
+        span = count * self.up - self._next_time
+        output_count = max(0, -(-span // self.down))
+        times = self._next_time + self.down * np.arange(output_count)
+        
+        phases = times % self.up
+        newest = times // self.up + history_length
+        windows = buffer[newest[:, None] - self._tap_offsets[None, :]]
+        output = np.einsum("ij,ij->i", windows, self.bank[phases])
+        
+        self._next_time += self.down * output_count - count * self.up
+        self._history = buffer[-history_length:].copy() if history_length else self._history
+        
+        return output
+    
+    def process_pcm16(self, pcm: bytes) -> bytes:
+        """Resample raw int16 PCM bytes, returning int16 PCM bytes."""
+        resampled = self.process(np.frombuffer(pcm, dtype=np.int16))
+        return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16).tobytes()
+
+
 def convert_audio_format(audio_data: np.ndarray, 
                         source_rate: int, 
                         target_rate: int) -> np.ndarray:
-    """Convert audio sample rate."""
+    """Convert audio sample rate (one-shot, delay-compensated)."""
     try:
         if source_rate == target_rate:
             return audio_data
         
-        # Simple resampling (linear interpolation)
-        # For production, use scipy.signal.resample for better quality
-        ratio = target_rate / source_rate
-        new_length = int(len(audio_data) * ratio)
+        resampler = StreamingResampler(source_rate, target_rate, compensate_delay=True)
+        new_length = int(len(audio_data) * resampler.up / resampler.down)
         
         if new_length == 0:
             return np.array([])
         
-        # Linear interpolation
-        old_indices = np.linspace(0, len(audio_data) - 1, new_length)
-        new_audio = np.interp(old_indices, np.arange(len(audio_data)), audio_data)
+        # Flush the filter with trailing zeros so the tail is emitted
+        padding = np.zeros(resampler.taps_per_phase, dtype=np.float32)
+        resampled = np.concatenate((resampler.process(audio_data), resampler.process(padding)))
         
-        return new_audio
+        return resampled[:new_length]
         
     except Exception as e:
         logging.getLogger(__name__).error(f"Audio format conversion failed: {e}")
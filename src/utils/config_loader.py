@@ -1,29 +1,120 @@
-
 """
 Configuration loader utility.
 """
 
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
+
+
+class ConfigSection:
+    """Read-only, typed view of one configuration section."""
+    
+    def __init__(self, name: str, data: Optional[Dict[str, Any]]):
+        self.name = name
+        self._data = data if isinstance(data, dict) else {}
+        self.logger = logging.getLogger(__name__)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a raw value."""
+        return self._data.get(key, default)
+    
+    def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        return self._typed(key, default, self._to_int)
+    
+    def get_float(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        return self._typed(key, default, float)
+    
+    def get_str(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self._typed(key, default, str)
+    
+    def get_bool(self, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        return self._typed(key, default, self._to_bool)
+    
+    def get_section(self, key: str) -> "ConfigSection":
+        """Get a nested section, e.g. audio -> vad."""
+        return ConfigSection(f"{self.name}.{key}", self._data.get(key))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._data)
+    
+    def _typed(self, key: str, default: Any, cast: Callable[[Any], Any]) -> Any:
+        value = self._data.get(key)
+        if value is None:
+            return default
+        
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            self.logger.warning(f"Invalid value for {self.name}.{key}: {value!r}, using {default!r}")
+            return default
+    
+    @staticmethod
+    def _to_int(value: Any) -> int:
+        # int() would silently truncate 1.9 to 1
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        return int(value)
+    
+    @staticmethod
+    def _to_bool(value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in ("true", "yes", "on", "1"):
+            return True
+        if isinstance(value, str) and value.strip().lower() in ("false", "no", "off", "0"):
+            return False
+        raise ValueError(value)
 
 
 class ConfigLoader:
-    """Load and manage configuration files."""
+    """Load and manage configuration files.
+    
+    ConfigLoader.shared() returns one process-wide loader per file, so every
+    component built from the same path shares a single parse. A shared
+    loader can watch its file and notify section subscribers when it
+    changes, letting components re-tune in place.
+    """
+    
+    _shared: Dict[Path, "ConfigLoader"] = {}
+    _shared_lock = threading.Lock()
     
     def __init__(self, config_path: str):
         self.config_path = Path(config_path)
         self.config = {}
         self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._subscribers: Dict[str, List[Callable[[ConfigSection], None]]] = {}
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+        
         self._load_config()
     
+    @classmethod
+    def shared(cls, config_path: str) -> "ConfigLoader":
+        """Get the process-wide loader for a config file, parsing it on first use."""
+        key = Path(config_path).resolve()
+        
+        with cls._shared_lock:
+            loader = cls._shared.get(key)
+            if loader is None:
+                loader = cls._shared[key] = cls(config_path)
+            return loader
+    
     def _load_config(self):
         """Load configuration from file."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                self.config = self._read_config()
                 self.logger.info(f"Configuration loaded from {self.config_path}")
             else:
                 self.logger.warning(f"Configuration file not found: {self.config_path}")
@@ -32,6 +123,13 @@ class ConfigLoader:
             self.logger.error(f"Failed to load configuration: {e}")
             self.config = {}
     
+    def _read_config(self) -> Dict[str, Any]:
+        # Remember the version even if it fails to parse, so a broken file
+        # is reported once rather than on every watch poll
+        self._mtime = self.config_path.stat().st_mtime
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     def get_config(self) -> Dict[str, Any]:
         """Get the full configuration."""
         return self.config
@@ -40,6 +138,82 @@ class ConfigLoader:
         """Get a configuration value."""
         return self.config.get(key, default)
     
-    def reload(self):
-        """Reload configuration from file."""
-        self._load_config()
+    def section(self, name: str) -> ConfigSection:
+        """Get a typed view of a top-level section."""
+        return ConfigSection(name, self.config.get(name))
+    
+    def subscribe(self, section: str, callback: Callable[[ConfigSection], None]) -> Callable[[], None]:
+        """Call callback with the new section whenever a reload changes it.
+        
+        Returns a function that removes the subscription.
+        """
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+        
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(section, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        
+        return unsubscribe
+    
+    def reload(self) -> List[str]:
+        """Reload configuration from file and notify subscribers of changed sections.
+        
+        A file that fails to parse is ignored and the current configuration
+        kept. Returns the names of the sections that changed.
+        """
+        with self._lock:
+            try:
+                new_config = self._read_config()
+            except Exception as e:
+                self.logger.error(f"Failed to reload configuration, keeping current: {e}")
+                return []
+            
+            old_config = self.config
+            self.config = new_config
+            
+            changed = [name for name in set(old_config) | set(new_config)
+                       if old_config.get(name) != new_config.get(name)]
+            notify = [(name, list(self._subscribers.get(name, []))) for name in changed]
+        
+        if changed:
+            self.logger.info(f"Configuration reloaded, changed sections: {', '.join(sorted(changed))}")
+        
+        for name, callbacks in notify:
+            for callback in callbacks:
+                try:
+                    callback(self.section(name))
+                except Exception as e:
+                    self.logger.error(f"Config subscriber for '{name}' failed: {e}")
+        
+        return changed
+    
+    def start_watching(self, interval: float = 2.0):
+        """Poll the config file and reload it when it changes."""
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, args=(interval,), name="config-watch", daemon=True
+        )
+        self._watch_thread.start()
+    
+    def stop_watching(self):
+        """Stop polling the config file."""
+        self._watch_stop.set()
+        if self._watch_thread and self._watch_thread.is_alive():
+            self._watch_thread.join(timeout=1.0)
+        self._watch_thread = None
+    
+    def _watch_loop(self, interval: float):
+        while not self._watch_stop.wait(interval):
+            try:
+                mtime = self.config_path.stat().st_mtime
+            except OSError:
+                continue
+            
+            if mtime != self._mtime:
+                self.reload()
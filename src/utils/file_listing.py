@@ -0,0 +1,166 @@
+"""
+Directory listing with os.scandir, pagination and a per-directory cache.
+"""
+
+import fnmatch
+import heapq
+import logging
+import os
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# (name, is_dir, size, mtime, mode) for one directory entry
+RawEntry = Tuple[str, bool, int, float, int]
+
+SORT_KEYS = {
+    "name": lambda entry: entry[0].casefold(),
+    "size": lambda entry: (entry[2], entry[0].casefold()),
+    "modified": lambda entry: (entry[3], entry[0].casefold()),
+    "type": lambda entry: (not entry[1], entry[0].casefold())
+}
+
+
+class DirectoryLister:
+    """List directories from os.scandir, caching each scan until the directory changes.
+    
+    scandir hands back the entry type with the name, so each entry costs at
+    most one stat call instead of stat + is_dir + is_file. A scan, names and
+    stat results together, is reused while the directory's mtime is
+    unchanged, so a cache hit stats nothing but the directory. That covers
+    entries being added, removed or renamed; sizes and times of files
+    modified in place refresh on the next change to the directory itself.
+    """
+    
+    _shared: Optional["DirectoryLister"] = None
+    _shared_lock = threading.Lock()
+    
+    # A directory modified this recently may change again within the same
+    # mtime tick, so its scan isn't cached yet
+    RACY_SECONDS = 1.0
+    
+    def __init__(self, max_cached_dirs: int = 64):
+        self.max_cached_dirs = max(0, max_cached_dirs)
+        self.logger = logging.getLogger(__name__)
+        
+        self._cache: "OrderedDict[str, Tuple[int, List[RawEntry]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "scans": 0,
+            "cache_hits": 0
+        }
+    
+    @classmethod
+    def shared(cls) -> "DirectoryLister":
+        """Get the process-wide lister, so every caller shares one cache."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+    
+    def list_entries(self, directory: str, pattern: Optional[str] = None, kind: Optional[str] = None,
+                     sort: str = "name", reverse: bool = False, offset: int = 0,
+                     limit: Optional[int] = None, include_hidden: bool = True) -> Dict[str, Any]:
+        """List one page of a directory.
+        
+        pattern is a case-insensitive glob on entry names, kind restricts the
+        listing to "file" or "directory" entries, and sort is one of name,
+        size, modified or type (directories first). Returns the page of
+        items and the total number of matching entries.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        
+        directory = os.path.abspath(directory)
+        entries = self._scan(directory)
+        
+        if pattern:
+            matches = re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+            entries = [entry for entry in entries if matches(entry[0])]
+        if kind:
+            want_dir = kind == "directory"
+            entries = [entry for entry in entries if entry[1] == want_dir]
+        if not include_hidden:
+            entries = [entry for entry in entries if not entry[0].startswith(".")]
+        
+        offset = max(0, offset)
+        key = SORT_KEYS[sort]
+        
+        # A page near the top only needs a partial sort
+        if limit is not None and offset + limit < len(entries):
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            ordered = select(offset + limit, entries, key=key)
+        else:
+            ordered = sorted(entries, key=key, reverse=reverse)
+        
+        page = ordered[offset:] if limit is None else ordered[offset:offset + limit]
+        
+        return {
+            "items": [self._to_item(directory, entry) for entry in page],
+            "total": len(entries),
+            "offset": offset,
+            "limit": limit
+        }
+    
+    def invalidate(self, directory: Optional[str] = None):
+        """Drop the cached scan of a directory, or of every directory."""
+        with self._lock:
+            if directory is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(directory), None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "cached_dirs": len(self._cache)
+            }
+    
+    def _scan(self, directory: str) -> List[RawEntry]:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        
+        with self._lock:
+            cached = self._cache.get(directory)
+            if cached and cached[0] == mtime_ns:
+                self._cache.move_to_end(directory)
+                self.stats["cache_hits"] += 1
+                return cached[1]
+        
+        entries = []
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                try:
+                    info = entry.stat()
+                    entries.append((entry.name, stat.S_ISDIR(info.st_mode), info.st_size,
+                                    info.st_mtime, info.st_mode))
+                except OSError:
+                    # Skip items we can't access, such as broken symlinks
+                    continue
+        
+        with self._lock:
+            self.stats["scans"] += 1
+            
+            if self.max_cached_dirs and time.time() - mtime_ns / 1e9 > self.RACY_SECONDS:
+                self._cache[directory] = (mtime_ns, entries)
+                self._cache.move_to_end(directory)
+                while len(self._cache) > self.max_cached_dirs:
+                    self._cache.popitem(last=False)
+        
+        return entries
+    
+    @staticmethod
+    def _to_item(directory: str, entry: RawEntry) -> Dict[str, Any]:
+        name, is_dir, size, mtime, mode = entry
+        return {
+            "name": name,
+            "path": os.path.join(directory, name),
+            "type": "directory" if is_dir else "file",
+            "size": size if stat.S_ISREG(mode) else None,
+            "modified": datetime.fromtimestamp(mtime).isoformat(),
+            "permissions": oct(mode)[-3:]
+        }
@@ -0,0 +1,84 @@
+"""
+Deferred imports for heavy optional libraries.
+
+Modules wrapped with lazy_import() are only imported when one of their
+attributes is first used, so importing the assistant's components (or a
+tool that only needs part of one) does not pay for spaCy, ChromaDB,
+sentence-transformers, pygame, Vosk or PyAudio up front. Every deferred
+import is timed for get_import_report().
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+import types
+from typing import Any, Dict
+
+_registry: Dict[str, "LazyModule"] = {}
+_import_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_module = None
+        self._lazy_seconds = None
+    
+    def _load(self) -> types.ModuleType:
+        if self._lazy_module is None:
+            with _import_lock:
+                if self._lazy_module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    self._lazy_seconds = time.perf_counter() - started
+                    self._lazy_module = module
+        return self._lazy_module
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+    
+    def __dir__(self):
+        return dir(self._load())
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Get a deferred handle to a module; the import happens on first use."""
+    with _import_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
+
+
+def is_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def preload_module(name: str) -> float:
+    """Import a deferred module now; returns the seconds its import took."""
+    module = lazy_import(name)
+    module._load()
+    return module._lazy_seconds
+
+
+def get_import_report() -> Dict[str, Dict[str, Any]]:
+    """Load state and import time of every deferred module."""
+    with _import_lock:
+        return {
+            name: {
+                "loaded": module._lazy_module is not None,
+                "seconds": module._lazy_seconds
+            }
+            for name, module in sorted(_registry.items())
+        }
@@ -0,0 +1,76 @@
+"""
+Lightweight latency metrics.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+# Upper bounds of the latency buckets, in milliseconds
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram.
+    
+    Recording is O(buckets) and needs no per-sample storage, so it can sit
+    on hot paths; percentiles are estimated as the upper bound of the bucket
+    they fall in.
+    """
+    
+    def __init__(self, buckets_ms: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = sorted(buckets_ms)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, seconds: float):
+        """Add one sample."""
+        ms = seconds * 1000.0
+        index = next((i for i, bound in enumerate(self.bounds) if ms <= bound), len(self.bounds))
+        
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimated latency in milliseconds below which fraction of samples fall."""
+        with self._lock:
+            if self.count == 0:
+                return None
+            
+            target = fraction * self.count
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= target and count:
+                    return self.bounds[index] if index < len(self.bounds) else self.max_ms
+            
+            return self.max_ms
+    
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Sample count, mean/p50/p95/max in milliseconds and bucket counts."""
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        
+        with self._lock:
+            buckets = {f"<={bound:g}ms": count for bound, count in zip(self.bounds, self._counts)}
+            buckets[f">{self.bounds[-1]:g}ms"] = self._counts[-1]
+            
+            return {
+                "count": self.count,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "max_ms": self.max_ms,
+                "buckets": buckets
+            }
@@ -0,0 +1,172 @@
+"""
+Concurrent component startup with dependency ordering.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class StartupOrchestrator:
+    """Build components concurrently, each as soon as its dependencies are ready.
+    
+    Every component is built on its own thread, so a slow model load never
+    holds up an unrelated component. A failure is recorded and propagates
+    only to the components that depend on it.
+    """
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._started_at = None
+    
+    def add(self, name: str, factory: Callable[[], Any], depends_on: Iterable[str] = ()):
+        """Register a component factory and the components it needs first."""
+        if self._started_at is not None:
+            raise RuntimeError("Cannot add components after startup has begun")
+        
+        self._steps[name] = {
+            "factory": factory,
+            "depends_on": list(depends_on),
+            "future": Future(),
+            "callbacks": [],
+            "status": "pending",
+            "started": None,
+            "finished": None,
+            "error": None
+        }
+    
+    def on_ready(self, name: str, callback: Callable[[Any], None]):
+        """Call callback with the component once it is built.
+        
+        Callbacks registered before the component finishes run before any
+        dependent component starts; later ones run immediately.
+        """
+        step = self._steps[name]
+        
+        with self._lock:
+            if step["status"] in ("pending", "building"):
+                step["callbacks"].append(callback)
+                return
+            ready = step["status"] == "ready"
+        
+        if ready:
+            callback(step["future"].result())
+    
+    def start(self):
+        """Start building every registered component."""
+        self._validate()
+        self._started_at = time.time()
+        
+        for name in self._steps:
+            threading.Thread(
+                target=self._build, args=(name,), name=f"init-{name}", daemon=True
+            ).start()
+    
+    def wait(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Block until a component is built; raises if it failed."""
+        return self._steps[name]["future"].result(timeout)
+    
+    def get(self, name: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """Block until a component is built; None if it failed or timed out."""
+        try:
+            return self.wait(name, timeout)
+        except Exception:
+            return None
+    
+    def wait_all(self, timeout: Optional[float] = None) -> bool:
+        """Block until every component has finished, successfully or not."""
+        _, not_done = wait([step["future"] for step in self._steps.values()], timeout)
+        return not not_done
+    
+    def is_ready(self, name: str) -> bool:
+        return self._steps[name]["status"] == "ready"
+    
+    def get_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Per-component status, build time and time spent waiting on dependencies."""
+        timings = {}
+        
+        for name, step in self._steps.items():
+            started, finished = step["started"], step["finished"]
+            timings[name] = {
+                "status": step["status"],
+                "depends_on": step["depends_on"],
+                "waited": (started - self._started_at) if started and self._started_at else None,
+                "seconds": (finished - started) if started and finished else None,
+                "error": str(step["error"]) if step["error"] else None
+            }
+        
+        return timings
+    
+    def _validate(self):
+        """Reject unknown dependencies and dependency cycles."""
+        for name, step in self._steps.items():
+            for dependency in step["depends_on"]:
+                if dependency not in self._steps:
+                    raise ValueError(f"{name} depends on unknown component {dependency}")
+        
+        visiting, done = set(), set()
+        
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for dependency in self._steps[name]["depends_on"]:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+        
+        for name in self._steps:
+            visit(name)
+    
+    def _build(self, name: str):
+        step = self._steps[name]
+        
+        for dependency in step["depends_on"]:
+            try:
+                self._steps[dependency]["future"].result()
+            except Exception:
+                self._fail(name, RuntimeError(f"dependency {dependency} failed"))
+                return
+        
+        step["status"] = "building"
+        step["started"] = time.time()
+        
+        try:
+            component = step["factory"]()
+        except Exception as e:
+            self.logger.error(f"Failed to initialize {name}: {e}")
+            self._fail(name, e)
+            return
+        
+        step["finished"] = time.time()
+        
+        with self._lock:
+            step["status"] = "ready"
+            callbacks = step["callbacks"]
+            step["callbacks"] = []
+        
+        for callback in callbacks:
+            try:
+                callback(component)
+            except Exception as e:
+                self.logger.error(f"Ready callback for {name} failed: {e}")
+        
+        step["future"].set_result(component)
+        self.logger.info(f"{name} ready in {step['finished'] - step['started']:.2f}s")
+    
+    def _fail(self, name: str, error: Exception):
+        step = self._steps[name]
+        step["finished"] = time.time()
+        
+        with self._lock:
+            step["status"] = "failed"
+            step["error"] = error
+            step["callbacks"] = []
+        
+        step["future"].set_exception(error)
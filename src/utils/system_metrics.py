@@ -0,0 +1,249 @@
+"""
+Background sampling of system metrics.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+
+class ProcessTracker:
+    """Incrementally maintained per-process CPU and memory usage.
+    
+    psutil.Process objects are kept across refreshes, so cpu_percent is a
+    real delta since the previous refresh rather than 0.0 for a process
+    seen for the first time. Each refresh only creates objects for new
+    PIDs and drops dead ones. The usage table is published as a new dict,
+    so top() reads it without locking.
+    """
+    
+    def __init__(self):
+        self._processes: Dict[int, psutil.Process] = {}
+        self._names: Dict[int, str] = {}
+        self._usage: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.refreshed_at = None
+    
+    def refresh(self):
+        """Re-measure every tracked process, picking up new and dead PIDs."""
+        with self._lock:
+            pids = set(psutil.pids())
+            
+            for pid in set(self._processes) - pids:
+                self._forget(pid)
+            
+            new_pids = pids - set(self._processes)
+            for pid in new_pids:
+                self._track(pid)
+            
+            usage = {}
+            for pid, proc in list(self._processes.items()):
+                try:
+                    with proc.oneshot():
+                        # A process first seen in this refresh has no interval to measure yet
+                        cpu_percent = 0.0 if pid in new_pids else proc.cpu_percent(interval=None)
+                        memory_percent = proc.memory_percent()
+                except psutil.NoSuchProcess:
+                    self._forget(pid)
+                    continue
+                except psutil.AccessDenied:
+                    cpu_percent, memory_percent = 0.0, None
+                
+                usage[pid] = {
+                    "pid": pid,
+                    "name": self._names.get(pid),
+                    "cpu_percent": cpu_percent,
+                    "memory_percent": memory_percent
+                }
+            
+            self._usage = usage
+            self.refreshed_at = time.time()
+    
+    def top(self, n: int, key: str = "cpu_percent") -> List[Dict[str, Any]]:
+        """The n processes using the most CPU (or another usage key) at the last refresh."""
+        usage = self._usage
+        return [dict(info) for info in heapq.nlargest(n, usage.values(), key=lambda info: info[key] or 0.0)]
+    
+    def count(self) -> int:
+        """Number of processes seen at the last refresh."""
+        return len(self._usage)
+    
+    def _track(self, pid: int):
+        try:
+            proc = psutil.Process(pid)
+        except psutil.Error:
+            return
+        
+        try:
+            name = proc.name()
+        except psutil.NoSuchProcess:
+            return
+        except psutil.AccessDenied:
+            name = None
+        
+        try:
+            # Start the CPU clock for the next refresh
+            proc.cpu_percent(interval=None)
+        except psutil.NoSuchProcess:
+            return
+        except psutil.AccessDenied:
+            pass
+        
+        self._processes[pid] = proc
+        self._names[pid] = name
+    
+    def _forget(self, pid: int):
+        self._processes.pop(pid, None)
+        self._names.pop(pid, None)
+
+
+class SystemMetricsSampler:
+    """Refresh CPU, memory, disk, temperature and top-process metrics on a fixed cadence.
+    
+    psutil.cpu_percent(interval=1) blocks the caller for a full second;
+    sampling in the background with interval=None measures CPU over the
+    time between samples instead, so readers get an answer instantly.
+    Each sample is published as a new dict and never mutated, so
+    get_snapshot() is a plain attribute read with no locking.
+    """
+    
+    _shared: Optional["SystemMetricsSampler"] = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, interval: float = 2.0, top_n: int = 10):
+        self.interval = max(0.1, interval)
+        self.top_n = top_n
+        self.logger = logging.getLogger(__name__)
+        
+        self.processes = ProcessTracker()
+        
+        self._snapshot = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @classmethod
+    def shared(cls, interval: Optional[float] = None, top_n: Optional[int] = None) -> "SystemMetricsSampler":
+        """Get the process-wide sampler, starting it on first use.
+        
+        interval and top_n only apply when this call creates the sampler.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(interval or 2.0, top_n or 10)
+                cls._shared.start()
+            return cls._shared
+    
+    def start(self):
+        """Start the sampling thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="system-metrics", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+    
+    def get_snapshot(self, timeout: float = 1.0) -> Dict[str, Any]:
+        """Latest metrics sample, waiting up to timeout for the first one."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        
+        if self._ready.wait(timeout):
+            return self._snapshot
+        
+        # Sampler not running or stalled; measure once now
+        return self.sample()
+    
+    def sample(self) -> Dict[str, Any]:
+        """Take a sample now and publish it."""
+        snapshot = {
+            "timestamp": time.time(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "cpu_count": psutil.cpu_count(),
+            "cpu_freq": self._safe(psutil.cpu_freq),
+            "memory": psutil.virtual_memory(),
+            "swap": self._safe(psutil.swap_memory),
+            "disk": self._safe(psutil.disk_usage, "/"),
+            "partitions": self._sample_partitions(),
+            "temperatures": self._sample_temperatures(),
+            "boot_time": psutil.boot_time()
+        }
+        snapshot.update(self._sample_processes())
+        
+        self._snapshot = snapshot
+        self._ready.set()
+        
+        return snapshot
+    
+    def _sample_loop(self):
+        # cpu_percent(interval=None) measures since the previous call, so
+        # prime the counters and let a short window pass before the first sample
+        psutil.cpu_percent(interval=None)
+        self.processes.refresh()
+        
+        if self._stop.wait(min(self.interval, 0.5)):
+            return
+        
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"System metrics sample failed: {e}")
+            
+            if self._stop.wait(self.interval):
+                return
+    
+    def _sample_partitions(self) -> List[Dict[str, Any]]:
+        partitions = []
+        
+        for partition in self._safe(psutil.disk_partitions) or []:
+            try:
+                usage = psutil.disk_usage(partition.mountpoint)
+            except (PermissionError, OSError):
+                continue
+            
+            partitions.append({
+                "device": partition.device,
+                "mountpoint": partition.mountpoint,
+                "fstype": partition.fstype,
+                "total": usage.total,
+                "used": usage.used,
+                "free": usage.free,
+                "percentage": (usage.used / usage.total) * 100 if usage.total else 0.0
+            })
+        
+        return partitions
+    
+    def _sample_temperatures(self) -> Dict[str, Any]:
+        # Only some platforms expose sensors
+        if not hasattr(psutil, "sensors_temperatures"):
+            return {}
+        return self._safe(psutil.sensors_temperatures) or {}
+    
+    def _sample_processes(self) -> Dict[str, Any]:
+        """Process count and the top processes by CPU usage."""
+        self.processes.refresh()
+        
+        return {
+            "process_count": self.processes.count(),
+            "top_processes": self.processes.top(self.top_n)
+        }
+    
+    def _safe(self, func, *args) -> Any:
+        try:
+            return func(*args)
+        except Exception as e:
+            self.logger.debug(f"{func.__name__} unavailable: {e}")
+            return None
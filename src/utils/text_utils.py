@@ -0,0 +1,66 @@
+"""
+Text processing utilities.
+"""
+
+import re
+from typing import List, Optional
+
+
+class SentenceSegmenter:
+    """Split a stream of LLM tokens into speakable sentences or clauses.
+    
+    Tokens are accumulated until a sentence boundary appears past min_length
+    characters. If no sentence ends within max_length, the buffer is cut at
+    the last clause boundary (or whitespace) so speech never waits on a long
+    run-on sentence.
+    """
+    
+    SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+    CLAUSE_END = re.compile(r"[,;:—](?=\s)")
+    
+    def __init__(self, min_length: int = 20, max_length: int = 150):
+        self.min_length = min_length
+        self.max_length = max(max_length, min_length)
+        self._buffer = ""
+    
+    def feed(self, token: str) -> List[str]:
+        """Add a token; return any segments that are now complete."""
+        self._buffer += token
+        segments = []
+        
+        while True:
+            segment = self._next_segment()
+            if segment is None:
+                break
+            if segment:
+                segments.append(segment)
+        
+        return segments
+    
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream ends."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+    
+    def _next_segment(self) -> Optional[str]:
+        """Cut the next complete segment off the buffer, if there is one."""
+        for match in self.SENTENCE_END.finditer(self._buffer):
+            if match.end() >= self.min_length:
+                return self._cut(match.end())
+        
+        if len(self._buffer) < self.max_length:
+            return None
+        
+        window = self._buffer[:self.max_length]
+        clauses = [m.end() for m in self.CLAUSE_END.finditer(window) if m.end() >= self.min_length]
+        if clauses:
+            return self._cut(clauses[-1])
+        
+        space = window.rfind(" ", self.min_length)
+        return self._cut(space if space > 0 else self.max_length)
+    
+    def _cut(self, position: int) -> str:
+        segment = self._buffer[:position].strip()
+        self._buffer = self._buffer[position:].lstrip()
+        return segment
@@ -11,9 +11,10 @@ import signal
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import numpy as np
 from rich.console import Console
@@ -21,7 +22,8 @@ from rich.logging import RichHandler
 from rich.panel import Panel
 from rich.table import Table
 
-# Import voice assistant components
+# Import voice assistant components (heavy libraries inside them load lazily)
+_import_started = time.perf_counter()
 from core.speech_engine import SpeechEngine
 from core.nlp_processor import NLPProcessor
 from core.command_handler import CommandHandler
@@ -29,15 +31,27 @@ from memory_manager import MemoryManager
 from llm_backend import LLMBackend
 from computer_controller import ComputerController
 from audio_visualizer import AudioVisualizerManager
-from utils.config_loader import ConfigLoader
+from utils.config_loader import ConfigLoader, ConfigSection
+from utils.text_utils import SentenceSegmenter
+from utils.startup import StartupOrchestrator
+from utils.lazy_import import get_import_report, preload_module
+COMPONENT_IMPORT_SECONDS = time.perf_counter() - _import_started
+
+
+LLM_SYSTEM_PROMPT = "You are a helpful voice assistant. Provide concise, conversational responses."
+LLM_ERROR_RESPONSE = "I'm having trouble connecting to my language model. Let me try to help you with basic commands."
+WAKE_RESPONSE = "Yes, how can I help you?"
+ERROR_RESPONSE = "I'm sorry, I encountered an error processing your request."
 
 
 class VoiceAssistant:
     """Advanced voice assistant with real-time processing and local AI."""
     
-    def __init__(self, config_path: str = "configs/config.json"):
+    def __init__(self, config_path: str = "configs/config.json", enable_visualizer: bool = True):
         self.config_path = config_path
-        self.config = ConfigLoader(config_path).get_config()
+        self.config_loader = ConfigLoader.shared(config_path)
+        self.config = self.config_loader.get_config()
+        self.enable_visualizer = enable_visualizer
         
         # Initialize console for rich output
         self.console = Console()
@@ -59,7 +73,8 @@ class VoiceAssistant:
         self.is_running = False
         self.is_listening = False
         self.conversation_active = False
-        self.wake_word = self.config.get("audio", {}).get("wake_word", "assistant")
+        self.wake_word = self.config_loader.section("audio").get_str("wake_word", "assistant")
+        self.stream_responses = self.config_loader.section("tts").get_bool("stream_responses", True)
         
         # Statistics
         self.stats = {
@@ -67,19 +82,54 @@ class VoiceAssistant:
             "total_interactions": 0,
             "successful_interactions": 0,
             "errors": 0,
-            "uptime": 0
+            "uptime": 0,
+            "speculation_hits": 0,
+            "speculation_misses": 0
         }
         
         # Thread management
         self._shutdown_event = threading.Event()
         
+        # Final results are handled off the listen thread, so capture, VAD and
+        # barge-in keep running while a response streams; one worker keeps
+        # utterances in order
+        self._response_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="response"
+        )
+        
+        # Speculative work started from partial recognition results
+        self._speculation = None
+        self._speculation_lock = threading.Lock()
+        self._speculation_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="speculation"
+        )
+        # A cold model load can take as long as a generation, so warm-up gets
+        # its own worker instead of starving the speculation pool
+        self._warm_up_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="warm-up"
+        )
+        
         # Initialize components
+        self._startup = StartupOrchestrator()
         self._initialize_components()
         
+        # Pick up config file edits without a restart
+        self.config_loader.subscribe("audio", self._apply_audio_config)
+        self.config_loader.subscribe("tts", self._apply_tts_config)
+        general = self.config_loader.section("general")
+        if general.get_bool("hot_reload", True):
+            self.config_loader.start_watching(general.get_float("config_watch_interval", 2.0))
+        
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
+    def _apply_audio_config(self, section: ConfigSection):
+        self.wake_word = section.get_str("wake_word", self.wake_word)
+    
+    def _apply_tts_config(self, section: ConfigSection):
+        self.stream_responses = section.get_bool("stream_responses", self.stream_responses)
+    
     def _setup_logging(self):
         """Setup logging with rich formatting."""
         log_level = self.config.get("general", {}).get("log_level", "INFO")
@@ -96,47 +146,90 @@ class VoiceAssistant:
         )
     
     def _initialize_components(self):
-        """Initialize all voice assistant components."""
+        """Initialize all voice assistant components.
+        
+        Components are built concurrently. This returns as soon as the speech
+        engine is ready so wake-word listening can start; the rest finish in
+        the background and are awaited by whatever needs them first.
+        """
         try:
             self.console.print("[bold blue]Initializing Voice Assistant Components...[/bold blue]")
             
-            # Initialize NLP processor
-            self.console.print("• Loading NLP processor...")
-            self.nlp_processor = NLPProcessor(self.config_path)
-            
-            # Initialize command handler
-            self.console.print("• Loading command handler...")
-            self.command_handler = CommandHandler(self.config_path)
+            components = [
+                ("nlp_processor", "NLP processor", lambda: NLPProcessor(self.config_path), []),
+                ("command_handler", "command handler", self._create_command_handler, []),
+                ("memory_manager", "memory manager", self._create_memory_manager, []),
+                ("llm_backend", "LLM backend", lambda: LLMBackend(self.config_path), []),
+                ("computer_controller", "computer controller", lambda: ComputerController(self.config_path), []),
+                ("speech_engine", "speech engine", self._create_speech_engine, []),
+                # Pre-render the phrases spoken most often
+                ("phrase_cache", "phrase cache", self._register_phrases,
+                 ["speech_engine", "command_handler", "llm_backend"])
+            ]
             
-            # Initialize memory manager
-            self.console.print("• Loading memory manager...")
-            self.memory_manager = MemoryManager(self.config_path)
+            if self.enable_visualizer:
+                components.append(
+                    ("visualizer", "audio visualizer", lambda: AudioVisualizerManager(self.config_path), [])
+                )
             
-            # Initialize LLM backend
-            self.console.print("• Connecting to LLM backend...")
-            self.llm_backend = LLMBackend(self.config_path)
+            for name, label, factory, depends_on in components:
+                self._startup.add(name, factory, depends_on)
+                self._startup.on_ready(name, self._component_ready_handler(name, label))
             
-            # Initialize computer controller
-            self.console.print("• Setting up computer controller...")
-            self.computer_controller = ComputerController(self.config_path)
+            self._startup.start()
             
-            # Initialize audio visualizer
-            self.console.print("• Starting audio visualizer...")
-            self.visualizer = AudioVisualizerManager(self.config_path)
+            # Listening only needs the speech engine
+            self._startup.wait("speech_engine")
             
-            # Initialize speech engine (last, as it may start audio processing)
-            self.console.print("• Initializing speech engine...")
-            self.speech_engine = SpeechEngine(self.config_path)
-            
-            # Setup callbacks
-            self.speech_engine.set_audio_callback(self._audio_callback)
-            
-            self.console.print("[bold green]✓ All components initialized successfully![/bold green]")
+            self.console.print("[bold green]✓ Speech engine ready, remaining components loading in background[/bold green]")
             
         except Exception as e:
             self.logger.error(f"Component initialization failed: {e}")
             raise
     
+    def _create_memory_manager(self) -> MemoryManager:
+        memory_manager = MemoryManager(self.config_path)
+        
+        # Still in the background, so the first query doesn't pay for the model load
+        memory_manager.preload()
+        
+        return memory_manager
+    
+    def _create_command_handler(self) -> CommandHandler:
+        command_handler = CommandHandler(self.config_path)
+        command_handler.set_parse_callback(self._full_parse)
+        return command_handler
+    
+    def _create_speech_engine(self) -> SpeechEngine:
+        speech_engine = SpeechEngine(self.config_path)
+        
+        # Setup callbacks
+        speech_engine.set_audio_callback(self._audio_callback)
+        speech_engine.set_partial_callback(self._partial_callback)
+        
+        return speech_engine
+    
+    def _register_phrases(self) -> bool:
+        self.speech_engine.register_phrases(self._fixed_phrases())
+        return True
+    
+    def _component_ready_handler(self, name: str, label: str):
+        """Build the callback that publishes a finished component."""
+        def ready(component):
+            if hasattr(self, name):
+                setattr(self, name, component)
+            seconds = self._startup.get_timings()[name]["seconds"] or 0.0
+            self.console.print(f"• {label} ready ({seconds:.2f}s)")
+        return ready
+    
+    def _component(self, name: str) -> Optional[Any]:
+        """Get a component, waiting for it if it is still initializing."""
+        return self._startup.get(name)
+    
+    def wait_for_component(self, name: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """Block until a component is initialized; None if it failed."""
+        return self._startup.get(name, timeout)
+    
     def start(self):
         """Start the voice assistant."""
         try:
@@ -152,9 +245,9 @@ class VoiceAssistant:
                 border_style="green"
             ))
             
-            # Start visualizer
-            if self.visualizer:
-                self.visualizer.start()
+            # Start visualizer once it has loaded
+            if self.enable_visualizer:
+                self._startup.on_ready("visualizer", self._start_visualizer)
             
             # Start listening for wake word
             self._start_wake_word_detection()
@@ -169,6 +262,10 @@ class VoiceAssistant:
         finally:
             self.stop()
     
+    def _start_visualizer(self, visualizer: AudioVisualizerManager):
+        if self.is_running:
+            visualizer.start()
+    
     def stop(self):
         """Stop the voice assistant."""
         if not self.is_running:
@@ -176,6 +273,10 @@ class VoiceAssistant:
         
         self.is_running = False
         self._shutdown_event.set()
+        self.config_loader.stop_watching()
+        self._speculation_executor.shutdown(wait=False)
+        self._warm_up_executor.shutdown(wait=False)
+        self._response_executor.shutdown(wait=False)
         
         self.console.print("[yellow]Stopping voice assistant...[/yellow]")
         
@@ -187,6 +288,16 @@ class VoiceAssistant:
         if self.visualizer:
             self.visualizer.stop()
         
+        # Persist any memories still waiting in the write-behind queue
+        if self.memory_manager:
+            self.memory_manager.shutdown()
+        
+        if self.llm_backend:
+            self.llm_backend.close()
+        
+        if self.computer_controller:
+            self.computer_controller.close()
+        
         # Calculate uptime
         if self.stats["start_time"]:
             self.stats["uptime"] = (datetime.now() - self.stats["start_time"]).total_seconds()
@@ -215,7 +326,88 @@ class VoiceAssistant:
             self._start_conversation()
         elif self.conversation_active:
             # Process command during active conversation
-            self._process_speech(text)
+            self._response_executor.submit(self._process_speech, text)
+    
+    def _partial_callback(self, text: str):
+        """Start speculative work from a partial recognition hypothesis."""
+        if not self.is_running or not self.conversation_active:
+            return
+        
+        key = text.lower().strip()
+        
+        with self._speculation_lock:
+            if self._speculation and self._speculation["key"] == key:
+                return
+            
+            # Drop work for the superseded hypothesis if it hasn't started yet
+            self._cancel_speculation(self._speculation)
+            
+            speculation = {
+                "key": key,
+                "nlp": self._speculation_executor.submit(self._process_text, text),
+                "context": None
+            }
+            
+            # Ready is set before the component is published, so fetch it from
+            # the orchestrator rather than the attribute
+            if self._startup.is_ready("memory_manager"):
+                memory_manager = self._startup.get("memory_manager")
+                speculation["context"] = self._speculation_executor.submit(
+                    memory_manager.get_conversation_context, text, 2
+                )
+            
+            self._speculation = speculation
+        
+        # Make sure the model is loaded before the final result arrives
+        if self._startup.is_ready("llm_backend"):
+            self._warm_up_executor.submit(self._startup.get("llm_backend").warm_up)
+    
+    def _process_text(self, text: str) -> Dict[str, Any]:
+        # High-confidence commands skip the spaCy parse until something needs it
+        return self._component("nlp_processor").process_text_fast(text)
+    
+    def _full_parse(self, nlp_result: Dict[str, Any]) -> Dict[str, Any]:
+        return self._component("nlp_processor").ensure_parsed(nlp_result)
+    
+    def _cancel_speculation(self, speculation: Optional[Dict[str, Any]]):
+        """Cancel speculative work that has not started running yet."""
+        if not speculation:
+            return
+        
+        for name in ("nlp", "context"):
+            future = speculation.get(name)
+            if future:
+                future.cancel()
+    
+    def _take_speculation(self, text: str) -> Optional[Dict[str, Any]]:
+        """Claim speculative work if it was started for the final text."""
+        key = text.lower().strip()
+        
+        with self._speculation_lock:
+            speculation = self._speculation
+            self._speculation = None
+        
+        if not speculation:
+            return None
+        
+        if speculation["key"] != key:
+            self._cancel_speculation(speculation)
+            self.stats["speculation_misses"] += 1
+            return None
+        
+        self.stats["speculation_hits"] += 1
+        return speculation
+    
+    def _speculative_result(self, speculation: Optional[Dict[str, Any]], name: str) -> Any:
+        """Get a speculative result, or None if unavailable or failed."""
+        if not speculation or not speculation.get(name):
+            return None
+        
+        try:
+            return speculation[name].result()
+        except Exception as e:
+            self.logger.debug(f"Speculative {name} failed: {e}")
+            return None
     
     def _start_conversation(self):
         """Start an active conversation."""
@@ -229,7 +421,7 @@ class VoiceAssistant:
             self.visualizer.set_listening_state(True)
         
         # Acknowledge wake word
-        self.speech_engine.speak("Yes, how can I help you?", blocking=False)
+        self.speech_engine.speak(WAKE_RESPONSE, blocking=False)
         
         # Set timeout for conversation
         threading.Timer(30.0, self._end_conversation).start()
@@ -256,37 +448,51 @@ class VoiceAssistant:
             
             self.console.print(f"[bold cyan]User:[/bold cyan] {text}")
             
+            # Reuse work started from the partial hypothesis when it matches
+            speculation = self._take_speculation(text)
+            
             # Process with NLP
-            nlp_result = self.nlp_processor.process_text(text)
+            nlp_result = self._speculative_result(speculation, "nlp")
+            if nlp_result is None:
+                nlp_result = self._process_text(text)
             
             # Handle with command handler first
-            command_result = self.command_handler.handle_command(nlp_result)
+            command_result = self._component("command_handler").handle_command(nlp_result)
             
             # If command handler couldn't handle it, use LLM
+            spoken = False
             if not command_result.get("success", True) or command_result.get("use_llm", False):
-                response = self._generate_llm_response(text, nlp_result)
+                nlp_result = self._full_parse(nlp_result)
+                context = self._speculative_result(speculation, "context")
+                if self.stream_responses:
+                    response = self._stream_llm_response(text, nlp_result, context)
+                    spoken = True
+                else:
+                    response = self._generate_llm_response(text, nlp_result, context)
             else:
                 response = command_result.get("response", "I'm not sure how to help with that.")
             
             # Store in memory
-            if self.memory_manager:
+            memory_manager = self._component("memory_manager")
+            if memory_manager:
                 context = {
                     "nlp_result": nlp_result,
                     "command_result": command_result,
                     "timestamp": datetime.now().isoformat()
                 }
-                self.memory_manager.store_conversation(text, response, context)
+                memory_manager.store_conversation(text, response, context)
             
             # Speak response
             self.console.print(f"[bold green]Assistant:[/bold green] {response}")
             
-            if self.visualizer:
-                self.visualizer.set_speaking_state(True)
-            
-            self.speech_engine.speak(response, blocking=False)
-            
-            if self.visualizer:
-                self.visualizer.set_speaking_state(False)
+            if not spoken:
+                if self.visualizer:
+                    self.visualizer.set_speaking_state(True)
+                
+                self.speech_engine.speak(response, blocking=False)
+                
+                if self.visualizer:
+                    self.visualizer.set_speaking_state(False)
             
             self.stats["successful_interactions"] += 1
             
@@ -298,29 +504,87 @@ class VoiceAssistant:
             self.logger.error(f"Speech processing error: {e}")
             self.stats["errors"] += 1
             
-            error_response = "I'm sorry, I encountered an error processing your request."
-            self.speech_engine.speak(error_response, blocking=False)
+            self.speech_engine.speak(ERROR_RESPONSE, blocking=False)
     
-    def _generate_llm_response(self, text: str, nlp_result: Dict[str, Any]) -> str:
+    def _generate_llm_response(self, text: str, nlp_result: Dict[str, Any],
+                               context: Optional[str] = None) -> str:
         """Generate response using LLM backend."""
         try:
             # Get conversation context from memory
-            context = ""
-            if self.memory_manager:
-                context = self.memory_manager.get_conversation_context(text, max_context=2)
+            if context is None:
+                context = ""
+                memory_manager = self._component("memory_manager")
+                if memory_manager:
+                    context = memory_manager.get_conversation_context(text, max_context=2)
             
             # Generate response
-            response = self.llm_backend.generate_response(
+            response = self._component("llm_backend").generate_response(
                 prompt=text,
                 context=context,
-                system_prompt="You are a helpful voice assistant. Provide concise, conversational responses."
+                system_prompt=LLM_SYSTEM_PROMPT
             )
             
             return response
             
         except Exception as e:
             self.logger.error(f"LLM response generation failed: {e}")
-            return "I'm having trouble connecting to my language model. Let me try to help you with basic commands."
+            return LLM_ERROR_RESPONSE
+    
+    def _stream_llm_response(self, text: str, nlp_result: Dict[str, Any],
+                             context: Optional[str] = None) -> str:
+        """Generate an LLM response, speaking each sentence as soon as it is complete.
+        
+        Returns the full response text once generation has finished.
+        """
+        tts_config = self.config_loader.section("tts")
+        segmenter = SentenceSegmenter(
+            min_length=tts_config.get_int("min_segment_chars", 20),
+            max_length=tts_config.get_int("max_segment_chars", 150)
+        )
+        tokens = []
+        
+        try:
+            if context is None:
+                context = ""
+                memory_manager = self._component("memory_manager")
+                if memory_manager:
+                    context = memory_manager.get_conversation_context(text, max_context=2)
+            
+            if self.visualizer:
+                self.visualizer.set_speaking_state(True)
+            
+            for token in self._component("llm_backend").generate_streaming_response(
+                prompt=text,
+                context=context,
+                system_prompt=LLM_SYSTEM_PROMPT
+            ):
+                tokens.append(token)
+                for segment in segmenter.feed(token):
+                    self.speech_engine.queue_speech(segment)
+            
+            remainder = segmenter.flush()
+            if remainder:
+                self.speech_engine.queue_speech(remainder)
+            
+            return "".join(tokens).strip()
+        
+        except Exception as e:
+            self.logger.error(f"LLM response streaming failed: {e}")
+            if not tokens:
+                self.speech_engine.queue_speech(LLM_ERROR_RESPONSE)
+                return LLM_ERROR_RESPONSE
+            return "".join(tokens).strip()
+        
+        finally:
+            if self.visualizer:
+                self.visualizer.set_speaking_state(False)
+    
+    def _fixed_phrases(self) -> List[str]:
+        """Responses that are always spoken with the same wording."""
+        phrases = [WAKE_RESPONSE, ERROR_RESPONSE, LLM_ERROR_RESPONSE]
+        phrases.extend(self.command_handler.get_fixed_phrases())
+        phrases.extend(self.llm_backend.get_fixed_phrases())
+        return phrases
     
     def _audio_callback(self, audio_data: np.ndarray):
         """Handle raw audio data for visualization."""
@@ -371,6 +635,8 @@ class VoiceAssistant:
             "listening": self.is_listening,
             "conversation_active": self.conversation_active,
             "stats": self.stats.copy(),
+            "startup": self._startup.get_timings(),
+            "imports": get_import_report(),
             "components": {}
         }
         
@@ -398,6 +664,35 @@ class VoiceAssistant:
         return status
 
 
+def show_import_report(config: Dict[str, Any]):
+    """Import every deferred library and compare the timings to the import budget."""
+    budget = config.get("general", {}).get("import_budget_seconds", 1.0)
+    
+    table = Table(title=f"Import Times (budget {budget:.2f}s per module)")
+    table.add_column("Module", style="cyan")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Status")
+    
+    def add_row(name: str, seconds: Optional[float], error: str = None):
+        if error:
+            table.add_row(name, "-", f"[red]{error}[/red]")
+        elif seconds > budget:
+            table.add_row(name, f"{seconds:.3f}", "[red]over budget[/red]")
+        else:
+            table.add_row(name, f"{seconds:.3f}", "[green]ok[/green]")
+    
+    add_row("voice assistant components", COMPONENT_IMPORT_SECONDS)
+    
+    for name in get_import_report():
+        # Force the deferred import so its cost is measured
+        try:
+            add_row(name, preload_module(name))
+        except ImportError as e:
+            add_row(name, None, f"unavailable ({type(e).__name__})")
+    
+    Console().print(table)
+
+
 def main():
     """Main entry point for the voice assistant."""
     parser = argparse.ArgumentParser(description="Advanced Voice Assistant")
@@ -405,6 +700,8 @@ def main():
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     parser.add_argument("--no-visualizer", action="store_true", help="Disable audio visualizer")
     parser.add_argument("--safety-level", choices=["off", "safer", "god"], help="Computer use safety level")
+    parser.add_argument("--import-report", action="store_true",
+                        help="Time the deferred library imports against the import budget and exit")
     
     args = parser.parse_args()
     
@@ -420,16 +717,18 @@ def main():
             # Enable debug mode
             pass
         
-        if args.no_visualizer:
-            # Disable visualizer
-            pass
+        if args.import_report:
+            show_import_report(ConfigLoader(str(config_path)).get_config())
+            return
         
         # Create and start voice assistant
-        assistant = VoiceAssistant(str(config_path))
+        assistant = VoiceAssistant(str(config_path), enable_visualizer=not args.no_visualizer)
         
         # Override safety level if specified
-        if args.safety_level and assistant.computer_controller:
-            assistant.computer_controller.set_safety_level(args.safety_level)
+        if args.safety_level:
+            computer_controller = assistant.wait_for_component("computer_controller")
+            if computer_controller:
+                computer_controller.set_safety_level(args.safety_level)
         
         assistant.start()
         
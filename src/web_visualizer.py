@@ -18,6 +18,7 @@ import webbrowser
 import os
 
 from utils.config_loader import ConfigLoader
+from utils.audio_utils import VoicedSyllableTracker
 
 
 class WebVisualizerHandler(BaseHTTPRequestHandler):
@@ -85,7 +86,7 @@ class WebAudioVisualizer:
     """Web-based audio visualizer using HTML5 Canvas."""
     
     def __init__(self, config_path: str = "configs/config.json", port: int = 12000):
-        self.config = ConfigLoader(config_path).get_config()
+        self.config = ConfigLoader.shared(config_path).get_config()
         self.viz_config = self.config.get("visualization", {})
         self.port = port
         
@@ -105,6 +106,10 @@ class WebAudioVisualizer:
         self.current_volume = 0.0
         self.peak_volume = 0.0
         
+        # Syllable pulses, only while voice activity is detected
+        self.syllable_tracker = VoicedSyllableTracker.from_config(self.config)
+        self.voice_active = False
+        
         # Animation state
         self.is_speaking = False
         self.is_listening = False
@@ -196,13 +201,11 @@ class WebAudioVisualizer:
                 # Add to history
                 self.volume_history.append(self.current_volume)
                 
-                # Detect syllables (simple peak detection)
-                if len(self.volume_history) >= 3:
-                    recent_volumes = list(self.volume_history)[-3:]
-                    if (recent_volumes[1] > recent_volumes[0] and 
-                        recent_volumes[1] > recent_volumes[2] and
-                        recent_volumes[1] > 0.3):
-                        self.add_syllable_pulse(recent_volumes[1])
+                # Detect syllables on the live stream, chunk by chunk
+                syllables = self.syllable_tracker.process(audio_data)
+                self.voice_active = self.syllable_tracker.voice_active
+                for _ in range(syllables):
+                    self.add_syllable_pulse(max(self.current_volume, 0.3))
         
         except Exception as e:
             self.logger.error(f"Audio data update error: {e}")
@@ -259,6 +262,7 @@ class WebAudioVisualizer:
             'peak_volume': self.peak_volume,
             'is_speaking': self.is_speaking,
             'is_listening': self.is_listening,
+            'voice_active': self.voice_active,
             'active_pulses': active_pulses,
             'volume_history': list(self.volume_history)[-20:],  # Last 20 samples
             'config': {
@@ -551,6 +555,7 @@ class WebAudioVisualizer:
             "peak_volume": self.peak_volume,
             "is_speaking": self.is_speaking,
             "is_listening": self.is_listening,
+            "voice_active": self.voice_active,
             "active_pulses": len(self.syllable_pulses),
             "animation_phase": self.animation_phase
         }
@@ -0,0 +1,11 @@
+"""
+Shared test setup: modules import each other relative to src/.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = str(ROOT / "configs" / "config.json")
+
+sys.path.insert(0, str(ROOT / "src"))
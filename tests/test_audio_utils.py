@@ -0,0 +1,148 @@
+"""
+Tests for the streaming audio utilities.
+"""
+
+import numpy as np
+
+from utils.audio_utils import StreamingResampler, SyllableDetector, VoiceActivityDetector, VoicedSyllableTracker
+
+RATE = 16000
+
+
+def tone(db: float, samples: int = 1024, frequency: float = 220.0) -> np.ndarray:
+    """Float32 sine whose RMS level is db dBFS."""
+    amplitude = 10 ** (db / 20) * np.sqrt(2)
+    return (amplitude * np.sin(2 * np.pi * frequency * np.arange(samples) / RATE)).astype(np.float32)
+
+
+def syllables(count: int, db: float = -20.0) -> np.ndarray:
+    """80 ms tone bursts 200 ms apart, one per syllable."""
+    burst = np.hanning(int(0.08 * RATE))
+    envelope = np.tile(np.pad(burst, (0, int(0.2 * RATE) - len(burst))), count)
+    return (tone(db, len(envelope)) * envelope).astype(np.float32)
+
+
+class TestVoiceActivityDetector:
+    def test_speech_starts_above_onset(self):
+        vad = VoiceActivityDetector(RATE, onset_db=9.0, offset_db=4.0, hangover_ms=0)
+        vad.process(tone(-60, RATE))
+        
+        assert not vad.process(tone(-55)).any()
+        assert vad.process(tone(-40)).any()
+    
+    def test_hysteresis_holds_speech_between_offset_and_onset(self):
+        vad = VoiceActivityDetector(RATE, onset_db=9.0, offset_db=4.0, hangover_ms=0)
+        vad.process(tone(-60, RATE))
+        vad.process(tone(-40))
+        
+        # 6 dB above the floor: too quiet to start speech, loud enough to keep it
+        assert vad.process(tone(-54)).all()
+        assert not vad.process(tone(-60, 4096))[-1]
+    
+    def test_hangover_keeps_speech_briefly_after_it_stops(self):
+        vad = VoiceActivityDetector(RATE, frame_ms=20, hangover_ms=100)
+        vad.process(tone(-60, RATE))
+        vad.process(tone(-30))
+        
+        decisions = vad.process(tone(-60, 4800))
+        assert decisions[:5].all()
+        assert not decisions[-1]
+    
+    def test_partial_frames_carry_over(self):
+        vad = VoiceActivityDetector(RATE, frame_ms=20)
+        
+        assert len(vad.process(tone(-60, 200))) == 0
+        assert len(vad.process(tone(-60, 200))) == 1
+        assert vad.frames_processed == 1
+
+
+class TestVoicedSyllableTracker:
+    def test_counts_syllables_while_voiced(self):
+        tracker = VoicedSyllableTracker(RATE)
+        tracker.process(tone(-60, RATE))
+        
+        audio = syllables(5)
+        counted = sum(tracker.process(audio[start:start + 1024]) for start in range(0, len(audio), 1024))
+        
+        assert tracker.voice_active
+        assert 4 <= counted <= 5
+    
+    def test_ignores_syllables_in_background_noise(self):
+        tracker = VoicedSyllableTracker(RATE)
+        tracker.process(syllables(5, db=-60))
+        
+        audio = syllables(5, db=-60)
+        counted = sum(tracker.process(audio[start:start + 1024]) for start in range(0, len(audio), 1024))
+        
+        assert counted == 0
+
+
+class TestSyllableDetector:
+    def test_streaming_finds_the_same_syllables_as_one_pass(self):
+        audio = syllables(6)
+        
+        whole = SyllableDetector(RATE).process(audio)
+        
+        streaming = SyllableDetector(RATE)
+        chunked = np.concatenate([streaming.process(audio[start:start + 1024])
+                                  for start in range(0, len(audio), 1024)])
+        
+        # Thresholds adapt per chunk, so only which syllable each peak falls in must match
+        syllable_length = int(0.2 * RATE)
+        assert np.array_equal(chunked // syllable_length, whole // syllable_length)
+        assert streaming.syllable_count == len(whole) == 6
+    
+    def test_peaks_respect_min_distance_across_chunks(self):
+        detector = SyllableDetector(RATE, min_distance_ms=100)
+        audio = syllables(4)
+        peaks = np.concatenate([detector.process(audio[start:start + 512])
+                                for start in range(0, len(audio), 512)])
+        
+        assert (np.diff(peaks) > RATE // 10).all()
+
+
+class TestStreamingResampler:
+    def test_chunked_output_matches_one_pass(self):
+        signal = np.random.default_rng(0).standard_normal(4800).astype(np.float32)
+        
+        whole = StreamingResampler(48000, RATE).process(signal)
+        resampler = StreamingResampler(48000, RATE)
+        chunked = np.concatenate([resampler.process(signal[i:i + 333]) for i in range(0, len(signal), 333)])
+        
+        np.testing.assert_allclose(chunked, whole, atol=1e-5)
+    
+    def test_output_length_follows_rate_ratio(self):
+        resampler = StreamingResampler(44100, RATE)
+        output = np.concatenate([resampler.process(np.zeros(441, dtype=np.float32)) for _ in range(100)])
+        
+        assert abs(len(output) - 16000) <= 1
+    
+    def test_tone_keeps_its_frequency(self):
+        source_rate = 48000
+        signal = np.sin(2 * np.pi * 440.0 * np.arange(source_rate) / source_rate).astype(np.float32)
+        
+        output = StreamingResampler(source_rate, RATE, compensate_delay=True).process(signal)
+        spectrum = np.abs(np.fft.rfft(output[1000:-1000] * np.hanning(len(output) - 2000)))
+        peak = np.argmax(spectrum) * RATE / (len(output) - 2000)
+        
+        assert abs(peak - 440.0) < 2.0
+    
+    def test_reset_restarts_the_stream(self):
+        signal = tone(-20.0, 2048)
+        resampler = StreamingResampler(RATE, 8000)
+        first = resampler.process(signal)
+        
+        resampler.reset()
+        
+        np.testing.assert_array_equal(resampler.process(signal), first)
+    
+    def test_delay_is_zero_when_compensated(self):
+        assert StreamingResampler(48000, RATE).delay > 0
+        assert StreamingResampler(48000, RATE, compensate_delay=True).delay == 0.0
+    
+    def test_process_pcm16_round_trips_bytes(self):
+        pcm = (tone(-20.0, 960) * 32767).astype(np.int16).tobytes()
+        
+        output = StreamingResampler(48000, RATE).process_pcm16(pcm)
+        
+        assert len(output) == 2 * 320
@@ -0,0 +1,63 @@
+"""
+Tests for typed config sections and ConfigLoader reloads.
+"""
+
+import json
+import logging
+
+import pytest
+
+from utils.config_loader import ConfigLoader, ConfigSection
+
+
+@pytest.fixture
+def section():
+    return ConfigSection("tts", {
+        "rate": 180,
+        "whole_float": 2.0,
+        "fraction": 1.9,
+        "numeric_text": "42",
+        "flag": True,
+        "volume": "0.5",
+        "enabled": "yes",
+        "nested": {"depth": 3}
+    })
+
+
+class TestConfigSection:
+    def test_get_int_accepts_whole_numbers(self, section):
+        assert section.get_int("rate") == 180
+        assert section.get_int("whole_float") == 2
+        assert section.get_int("numeric_text") == 42
+    
+    @pytest.mark.parametrize("key", ["fraction", "flag", "volume"])
+    def test_get_int_rejects_values_it_would_truncate(self, section, key, caplog):
+        with caplog.at_level(logging.WARNING):
+            assert section.get_int(key, 7) == 7
+        assert f"tts.{key}" in caplog.text
+    
+    def test_get_float_and_bool_coerce(self, section):
+        assert section.get_float("volume") == 0.5
+        assert section.get_bool("enabled") is True
+        assert section.get_bool("missing", False) is False
+    
+    def test_nested_section(self, section):
+        nested = section.get_section("nested")
+        
+        assert nested.name == "tts.nested"
+        assert nested.get_int("depth") == 3
+        assert section.get_section("missing").to_dict() == {}
+
+
+def test_reload_notifies_subscribers(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"tts": {"rate": 180}}))
+    loader = ConfigLoader(str(path))
+    
+    received = []
+    loader.subscribe("tts", lambda section: received.append(section.get_int("rate")))
+    
+    path.write_text(json.dumps({"tts": {"rate": 200}}))
+    loader.reload()
+    
+    assert received[-1] == 200
@@ -0,0 +1,106 @@
+"""
+Tests for DirectoryLister pagination, filters and the scan cache.
+"""
+
+import os
+import time
+
+import pytest
+
+from utils import file_listing
+from utils.file_listing import DirectoryLister
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for i in range(25):
+        (tmp_path / f"file{i:02d}.txt").write_text("x" * i)
+    (tmp_path / "notes.md").write_text("notes")
+    (tmp_path / ".hidden").write_text("")
+    (tmp_path / "sub").mkdir()
+    
+    # Old enough that the scan is cacheable
+    stamp = time.time() - 60
+    os.utime(tmp_path, (stamp, stamp))
+    return tmp_path
+
+
+def names(listing):
+    return [item["name"] for item in listing["items"]]
+
+
+class TestPagination:
+    def test_page_matches_full_sort(self, directory):
+        lister = DirectoryLister()
+        full = names(lister.list_entries(str(directory)))
+        
+        page = lister.list_entries(str(directory), offset=5, limit=10)
+        
+        assert names(page) == full[5:15]
+        assert page["total"] == len(full) == 28
+    
+    @pytest.mark.parametrize("sort", ["name", "size", "modified", "type"])
+    def test_partial_sort_matches_full_sort(self, directory, sort):
+        lister = DirectoryLister()
+        for reverse in (False, True):
+            full = names(lister.list_entries(str(directory), sort=sort, reverse=reverse))
+            page = names(lister.list_entries(str(directory), sort=sort, reverse=reverse, limit=7))
+            assert page == full[:7]
+    
+    def test_offset_past_the_end_is_empty(self, directory):
+        listing = DirectoryLister().list_entries(str(directory), offset=100, limit=10)
+        
+        assert listing["items"] == []
+        assert listing["total"] == 28
+    
+    def test_unknown_sort_key_is_rejected(self, directory):
+        with pytest.raises(ValueError):
+            DirectoryLister().list_entries(str(directory), sort="owner")
+
+
+class TestFilters:
+    def test_pattern_is_case_insensitive_glob(self, directory):
+        listing = DirectoryLister().list_entries(str(directory), pattern="FILE0*.TXT")
+        
+        assert names(listing) == [f"file{i:02d}.txt" for i in range(10)]
+    
+    def test_kind_and_hidden(self, directory):
+        lister = DirectoryLister()
+        
+        assert names(lister.list_entries(str(directory), kind="directory")) == ["sub"]
+        assert ".hidden" not in names(lister.list_entries(str(directory), include_hidden=False))
+        assert lister.list_entries(str(directory), kind="file")["total"] == 27
+
+
+class TestCache:
+    def test_cache_hit_reuses_names_and_stat_results(self, directory, monkeypatch):
+        lister = DirectoryLister()
+        first = lister.list_entries(str(directory), sort="size")
+        
+        def no_scan(path):
+            raise AssertionError("directory was rescanned")
+        
+        monkeypatch.setattr(file_listing.os, "scandir", no_scan)
+        second = lister.list_entries(str(directory), sort="size")
+        
+        assert second == first
+        assert lister.get_stats()["cache_hits"] == 1
+    
+    def test_directory_change_invalidates_scan(self, directory):
+        lister = DirectoryLister()
+        lister.list_entries(str(directory))
+        
+        (directory / "new.txt").write_text("new")
+        
+        assert "new.txt" in names(lister.list_entries(str(directory)))
+        assert lister.get_stats()["scans"] == 2
+    
+    def test_cache_is_bounded(self, tmp_path):
+        lister = DirectoryLister(max_cached_dirs=2)
+        stamp = time.time() - 60
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            os.utime(tmp_path / name, (stamp, stamp))
+            lister.list_entries(str(tmp_path / name))
+        
+        assert lister.get_stats()["cached_dirs"] == 2
@@ -0,0 +1,32 @@
+"""
+Tests for LLMBackend warm-up throttling.
+"""
+
+import threading
+import time
+from unittest import mock
+
+from conftest import CONFIG_PATH
+from llm_backend import LLMBackend
+
+
+def test_concurrent_warm_ups_send_one_request():
+    backend = LLMBackend(CONFIG_PATH)
+    backend.backend_status["active_backend"] = "ollama"
+    backend.session = mock.Mock()
+    backend.session.post.side_effect = lambda *args, **kwargs: time.sleep(0.05)
+    
+    start = threading.Barrier(8)
+    
+    def warm_up():
+        start.wait()
+        backend.warm_up()
+    
+    threads = [threading.Thread(target=warm_up) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert backend.session.post.call_count == 1
+    assert backend.session.post.call_args.kwargs["timeout"] == backend.generation_timeout
@@ -0,0 +1,135 @@
+"""
+Tests for MemoryManager's write-behind queue and EmbeddingCache.
+"""
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import memory_manager
+from conftest import CONFIG_PATH
+from memory_manager import EmbeddingCache, MemoryManager
+
+
+class FakeCollection:
+    """In-memory stand-in for a ChromaDB collection."""
+    
+    def __init__(self):
+        self.items = {}
+        self.add_calls = 0
+    
+    def add(self, embeddings, documents, metadatas, ids):
+        self.add_calls += 1
+        if len(set(ids)) != len(ids) or any(item_id in self.items for item_id in ids):
+            raise ValueError("Duplicate id")
+        self.upsert(embeddings, documents, metadatas, ids)
+    
+    def upsert(self, embeddings, documents, metadatas, ids):
+        for item_id, document, metadata in zip(ids, documents, metadatas):
+            self.items[item_id] = (document, metadata)
+    
+    def query(self, query_embeddings, n_results, include):
+        entries = list(self.items.values())[:n_results]
+        return {
+            "documents": [[document for document, _ in entries]],
+            "metadatas": [[metadata for _, metadata in entries]],
+            "distances": [[0.0] * len(entries)]
+        }
+    
+    def count(self):
+        return len(self.items)
+
+
+class FakeModel:
+    def encode(self, texts, batch_size=32):
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    collections = {}
+    client = mock.Mock()
+    client.get_or_create_collection.side_effect = lambda name, metadata: collections.setdefault(name, FakeCollection())
+    
+    # ChromaDB and the embedding model are replaced, not imported
+    monkeypatch.setattr(memory_manager, "chromadb", mock.Mock(PersistentClient=mock.Mock(return_value=client)))
+    monkeypatch.setattr(memory_manager, "chromadb_config", mock.Mock())
+    manager = MemoryManager(CONFIG_PATH)
+    manager._embedding_model = FakeModel()
+    yield manager
+    manager.shutdown()
+
+
+class TestWriteBehind:
+    def test_duplicate_ids_in_a_batch_keep_the_last_write(self, manager):
+        manager._enqueue_write("conversations", "a", "first", {"n": 1})
+        manager._enqueue_write("conversations", "a", "second", {"n": 2})
+        manager._enqueue_write("conversations", "b", "other", {"n": 3})
+        
+        assert manager.flush() == 2
+        
+        collection = manager.conversations_collection
+        assert collection.add_calls == 1
+        assert collection.items["a"] == ("second", {"n": 2})
+    
+    def test_stored_conversation_is_readable_immediately(self, manager):
+        manager.store_conversation("what's the weather", "Sunny")
+        
+        context = manager.get_conversation_context("weather")
+        
+        assert "User: what's the weather" in context
+        assert "Assistant: Sunny" in context
+    
+    def test_failed_item_is_dropped_after_max_attempts(self, manager):
+        collection = manager.conversations_collection
+        collection.add = mock.Mock(side_effect=ValueError("down"))
+        real_upsert = collection.upsert
+        
+        def upsert(embeddings, documents, metadatas, ids):
+            if "bad" in ids:
+                raise ValueError("rejected")
+            real_upsert(embeddings, documents, metadatas, ids)
+        
+        collection.upsert = upsert
+        manager._enqueue_write("conversations", "good", "fine", {})
+        manager._enqueue_write("conversations", "bad", "broken", {})
+        
+        for _ in range(manager.max_write_attempts):
+            manager.flush()
+        
+        assert "good" in collection.items
+        assert "bad" not in collection.items
+        assert manager._pending_writes == []
+
+
+class TestEmbeddingCache:
+    def test_keys_ignore_case_and_whitespace(self):
+        assert EmbeddingCache.make_key("Hello  World ") == EmbeddingCache.make_key("hello world")
+        assert EmbeddingCache.make_key("hello") != EmbeddingCache.make_key("world")
+    
+    def test_evicts_least_recently_used(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        cache.get("a")
+        cache.put("c", [3.0])
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+    
+    def test_counts_hits_and_misses(self):
+        cache = EmbeddingCache()
+        cache.put("a", [1.0])
+        cache.get("a")
+        cache.get("missing")
+        
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    
+    def test_zero_size_stores_nothing(self):
+        cache = EmbeddingCache(max_size=0)
+        cache.put("a", [1.0])
+        
+        assert cache.get("a") is None
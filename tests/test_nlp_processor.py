@@ -0,0 +1,105 @@
+"""
+Tests for the single-pass intent and entity matchers.
+
+Both must give the same answers as running every pattern on its own.
+"""
+
+import re
+
+import pytest
+
+from conftest import CONFIG_PATH
+from core.nlp_processor import IntentMatcher, NLPProcessor
+
+CORPUS = [
+    "hey assistant",
+    "hello how are you",
+    "what time is it",
+    "what's the date today",
+    "calculate 25 * 4",
+    "what is the square root of 144",
+    "what's 15 percent of 80",
+    "open the file report.txt in documents",
+    "create a new folder on the desktop",
+    "delete ~/downloads/old_notes.txt",
+    "show me cpu usage and memory status",
+    "how's the weather today",
+    "is it going to rain tomorrow",
+    "tell me a joke please",
+    "can you explain how black holes form",
+    "what can you do",
+    "open firefox",
+    "I really like this song, it is great",
+    "thanks, that was helpful",
+    "goodbye",
+    "see you later",
+    "could you please stop the music",
+    "remind me what we talked about yesterday",
+    "add 3.5 and two",
+    "open report2.txt in documents",
+    "",
+]
+
+
+def per_pattern_scores(intent_patterns, text):
+    text_lower = text.lower()
+    scores = {}
+    for intent, patterns in intent_patterns.items():
+        hits = sum(1 for pattern in patterns if re.search(pattern, text_lower))
+        if hits:
+            scores[intent] = hits / len(patterns)
+    return scores
+
+
+def per_pattern_entities(entity_patterns, text):
+    entities = {}
+    for entity_type, patterns in entity_patterns.items():
+        entities[entity_type] = []
+        for pattern in patterns:
+            entities[entity_type].extend(re.findall(pattern, text, re.IGNORECASE))
+    return entities
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return NLPProcessor(CONFIG_PATH)
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_intent_scores_match_per_pattern_search(nlp, text):
+    assert dict(nlp.classify_intents(text)) == per_pattern_scores(nlp.intent_patterns, text)
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_entities_match_per_pattern_findall(nlp, text):
+    expected = per_pattern_entities(nlp.entity_patterns, text)
+    extracted = nlp._extract_custom_entities(text)
+    
+    assert sorted(extracted) == sorted(expected)
+    for entity_type, values in expected.items():
+        assert sorted(extracted[entity_type]) == sorted(set(values))
+
+
+class TestIntentMatcher:
+    def test_overlapping_keywords_all_count(self):
+        matcher = IntentMatcher({
+            "short": [r"\b(cat)"],
+            "long": [r"\b(category)"]
+        })
+        
+        assert dict(matcher.match("category")) == {"short": 1.0, "long": 1.0}
+    
+    def test_anchored_pattern_only_matches_at_start(self):
+        matcher = IntentMatcher({"greeting": [r"^(hi|hello)"]})
+        
+        assert matcher.match("hello there") == [("greeting", 1.0)]
+        assert matcher.match("say hello") == []
+    
+    def test_scores_are_fraction_of_patterns_best_first(self):
+        matcher = IntentMatcher({
+            "math": [r"\b(add|plus)\b", r"\d+\s*\+\s*\d+"],
+            "command": [r"\b(add)\b"]
+        })
+        
+        assert matcher.match("add 2 + 2") == [("math", 1.0), ("command", 1.0)]
+        assert matcher.match("plus") == [("math", 0.5)]
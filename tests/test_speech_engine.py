@@ -0,0 +1,74 @@
+"""
+Tests for SpeechEngine barge-in.
+"""
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from conftest import CONFIG_PATH
+from core.speech_engine import SpeechEngine
+
+CHUNK = 1024
+
+
+def tone(db: float, index: int = 0) -> bytes:
+    """Int16 PCM sine chunk whose RMS level is db dBFS."""
+    t = np.arange(CHUNK) + index * CHUNK
+    amplitude = 10 ** (db / 20) * np.sqrt(2)
+    return (amplitude * np.sin(2 * np.pi * 220 * t / 16000) * 32767).astype(np.int16).tobytes()
+
+
+@pytest.fixture
+def engine():
+    engine = SpeechEngine(CONFIG_PATH)
+    engine.recognizer = mock.Mock()
+    engine.recognizer.AcceptWaveform.return_value = False
+    engine.resampler = None
+    engine.partial_callback = None
+    engine.vad_gating = False
+    engine.barge_in = True
+    engine.barge_in_margin_db = 10.0
+    engine.cancel = mock.Mock()
+    
+    # Learn a quiet noise floor before anything is spoken
+    for i in range(20):
+        engine._process_chunk(tone(-60, i))
+    
+    yield engine
+    engine.cleanup()
+
+
+def test_echo_alone_does_not_barge_in(engine):
+    engine.is_speaking = True
+    # Syllables and the gaps between them
+    for i in range(30):
+        engine._process_chunk(tone(-30 if i % 3 else -45, i))
+    
+    engine.cancel.assert_not_called()
+
+
+def test_user_louder_than_echo_barges_in(engine):
+    engine.is_speaking = True
+    for i in range(SpeechEngine.ECHO_WARMUP_CHUNKS + 5):
+        engine._process_chunk(tone(-30, i))
+    engine.cancel.assert_not_called()
+    
+    engine._process_chunk(tone(-12))
+    engine.cancel.assert_called_once()
+
+
+def test_no_barge_in_before_echo_is_measured(engine):
+    engine.is_speaking = True
+    engine._process_chunk(tone(-12))
+    
+    engine.cancel.assert_not_called()
+
+
+def test_no_barge_in_while_silent(engine):
+    engine.is_speaking = False
+    for i in range(10):
+        engine._process_chunk(tone(-12, i))
+    
+    engine.cancel.assert_not_called()
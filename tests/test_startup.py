@@ -0,0 +1,107 @@
+"""
+Tests for dependency-ordered concurrent startup.
+"""
+
+import threading
+
+import pytest
+
+from utils.startup import StartupOrchestrator
+
+
+def test_components_build_after_their_dependencies():
+    order = []
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("config", lambda: order.append("config") or "cfg")
+    orchestrator.add("engine", lambda: order.append("engine") or "eng", depends_on=["config"])
+    orchestrator.add("assistant", lambda: order.append("assistant") or "app", depends_on=["engine", "config"])
+    
+    orchestrator.start()
+    
+    assert orchestrator.wait("assistant", timeout=5) == "app"
+    assert order == ["config", "engine", "assistant"]
+    assert orchestrator.get_timings()["assistant"]["status"] == "ready"
+
+
+def test_independent_components_build_concurrently():
+    both_started = threading.Barrier(2, timeout=5)
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", lambda: both_started.wait())
+    orchestrator.add("b", lambda: both_started.wait())
+    
+    orchestrator.start()
+    
+    assert orchestrator.wait_all(timeout=5)
+    assert orchestrator.is_ready("a") and orchestrator.is_ready("b")
+
+
+def test_failure_propagates_only_to_dependents():
+    def broken():
+        raise OSError("no model")
+    
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("model", broken)
+    orchestrator.add("recognizer", lambda: "rec", depends_on=["model"])
+    orchestrator.add("memory", lambda: "mem")
+    
+    orchestrator.start()
+    assert orchestrator.wait_all(timeout=5)
+    
+    with pytest.raises(OSError):
+        orchestrator.wait("model")
+    assert orchestrator.get("recognizer") is None
+    assert orchestrator.get("memory") == "mem"
+    
+    timings = orchestrator.get_timings()
+    assert timings["model"]["error"] == "no model"
+    assert timings["recognizer"]["status"] == "failed"
+
+
+def test_unknown_dependency_is_rejected():
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("engine", lambda: None, depends_on=["missing"])
+    
+    with pytest.raises(ValueError):
+        orchestrator.start()
+
+
+def test_dependency_cycle_is_rejected():
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", lambda: None, depends_on=["b"])
+    orchestrator.add("b", lambda: None, depends_on=["a"])
+    
+    with pytest.raises(ValueError):
+        orchestrator.start()
+
+
+def test_cannot_add_after_start():
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", lambda: None)
+    orchestrator.start()
+    
+    with pytest.raises(RuntimeError):
+        orchestrator.add("b", lambda: None)
+
+
+def test_ready_callbacks_run_before_dependents_start():
+    assigned = {}
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("engine", lambda: "eng")
+    orchestrator.add("assistant", lambda: assigned.get("engine"), depends_on=["engine"])
+    orchestrator.on_ready("engine", lambda component: assigned.update(engine=component))
+    
+    orchestrator.start()
+    
+    assert orchestrator.wait("assistant", timeout=5) == "eng"
+
+
+def test_late_ready_callback_runs_immediately():
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("engine", lambda: "eng")
+    orchestrator.start()
+    orchestrator.wait("engine", timeout=5)
+    
+    received = []
+    orchestrator.on_ready("engine", received.append)
+    
+    assert received == ["eng"]